@@ -0,0 +1,108 @@
+# backend/benchmarks/bench_performance_import.py
+"""
+Benchmark for bulk performance-record import.
+
+Run from the backend folder:
+    python -m benchmarks.bench_performance_import --rows 100000
+    python -m benchmarks.bench_performance_import --rows 100000 --mongo
+
+Without --mongo only streaming parse + validation is timed. With --mongo the
+full import (insert_many batches) runs against a scratch collection in the
+database configured by MONGODB_URI / DB_NAME, which is dropped afterwards.
+"""
+import argparse
+import asyncio
+import io
+import json
+import random
+import time
+from datetime import datetime
+
+from starlette.datastructures import UploadFile
+
+from models.performance_model import PerformanceThreshold
+from utils.performance_import import RowParser, build_record, iter_upload_lines
+
+CATEGORIES = {
+    "academic": ["subject", "exam", "activity"],
+    "non_academic": ["club_participation", "attendance", "engagement"],
+}
+CSV_HEADER = "student_id,type,category,subcategory,score,semester,year,created_at"
+
+
+def generate_rows(count: int, fmt: str, students: int = 5000, seed: int = 42) -> bytes:
+    rng = random.Random(seed)
+    lines = [CSV_HEADER] if fmt == "csv" else []
+    for i in range(count):
+        record_type = rng.choice(["academic", "academic", "non_academic"])
+        row = {
+            "student_id": f"{rng.randrange(students):024x}",
+            "type": record_type,
+            "category": rng.choice(CATEGORIES[record_type]),
+            "subcategory": f"Item {i % 50}",
+            "score": round(rng.uniform(20, 100), 1),
+            "semester": rng.choice(["Fall 2024", "Spring 2025"]),
+            "year": "2024",
+            "created_at": datetime(2024, rng.randint(1, 12), rng.randint(1, 28)).isoformat(),
+        }
+        if fmt == "csv":
+            lines.append(",".join(str(v) for v in row.values()))
+        else:
+            lines.append(json.dumps(row))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+async def bench_parse(data: bytes, fmt: str):
+    thresholds = PerformanceThreshold()
+    now = datetime.utcnow()
+    parser = RowParser(fmt)
+    valid = 0
+    start = time.perf_counter()
+    async for line in iter_upload_lines(UploadFile(file=io.BytesIO(data))):
+        row = parser.parse(line)
+        if row is not None:
+            build_record(row, thresholds, now)
+            valid += 1
+    elapsed = time.perf_counter() - start
+    print(f"[{fmt}] parse+validate: {valid} rows in {elapsed:.2f}s ({valid / elapsed:,.0f} rows/s)")
+
+
+async def bench_import(data: bytes, fmt: str, batch_size: int):
+    from config.db import db
+    from utils.performance_import import import_performance_records
+
+    collection = "performance_records_bench"
+    await db[collection].drop()
+    start = time.perf_counter()
+    summary = await import_performance_records(
+        iter_upload_lines(UploadFile(file=io.BytesIO(data))),
+        fmt,
+        batch_size=batch_size,
+        collection=collection,
+        schedule_analytics=False,
+    )
+    elapsed = time.perf_counter() - start
+    print(f"[{fmt}] full import: {summary['inserted']} rows, {summary['students_affected']} students "
+          f"in {elapsed:.2f}s ({summary['inserted'] / elapsed:,.0f} rows/s)")
+    await db[collection].drop()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--format", choices=["csv", "ndjson", "both"], default="both")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--mongo", action="store_true", help="also time inserts against MongoDB")
+    args = parser.parse_args()
+
+    formats = ["csv", "ndjson"] if args.format == "both" else [args.format]
+    for fmt in formats:
+        data = generate_rows(args.rows, fmt)
+        print(f"[{fmt}] generated {len(data) / 1e6:.1f} MB")
+        await bench_parse(data, fmt)
+        if args.mongo:
+            await bench_import(data, fmt, args.batch_size)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+# backend/benchmarks/bench_performance_storage.py
+"""
+Benchmark standard vs time-series storage for performance_records.
+
+Run from the backend folder (needs MongoDB 7.0+, MONGODB_URI / DB_NAME):
+    python -m benchmarks.bench_performance_storage --records 200000 --students 5000
+
+Loads the same generated records into one scratch collection per mode, then
+reports storage/index size and times the per-student range query used by
+get_student_records and the cohort $group used by /api/performance/cohorts.
+Scratch collections are dropped afterwards.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from config.db import db
+from utils.cohort_analytics import _bucket_pipeline
+from utils.performance_storage import STORAGE_MODES, collection_stats, create_performance_collection
+
+CATEGORIES = {
+    "academic": ["subject", "exam", "activity"],
+    "non_academic": ["club_participation", "attendance", "engagement"],
+}
+
+
+def generate_records(count: int, students: int, seed: int = 42):
+    rng = random.Random(seed)
+    start = datetime.utcnow() - timedelta(days=730)
+    records = []
+    for _ in range(count):
+        record_type = rng.choice(["academic", "academic", "non_academic"])
+        score = round(rng.uniform(20, 100), 1)
+        records.append({
+            "student_id": f"{rng.randrange(students):024x}",
+            "type": record_type,
+            "category": rng.choice(CATEGORIES[record_type]),
+            "subcategory": "Benchmark",
+            "score": score,
+            "max_score": 100,
+            "semester": rng.choice(["Fall 2024", "Spring 2025"]),
+            "year": "2024",
+            "calculated_level": "high" if score >= 80 else "medium" if score >= 60 else "low",
+            "created_at": start + timedelta(minutes=rng.randrange(730 * 24 * 60)),
+        })
+    # Arrival order: roughly chronological, like real traffic
+    records.sort(key=lambda r: r["created_at"])
+    return records
+
+
+async def load(name: str, mode: str, records, batch_size: int = 5000) -> float:
+    await db[name].drop()
+    await create_performance_collection(name, mode)
+    start = time.perf_counter()
+    for i in range(0, len(records), batch_size):
+        # insert_many adds _id in place, so hand each mode its own copies
+        await db[name].insert_many([dict(r) for r in records[i:i + batch_size]], ordered=False)
+    return time.perf_counter() - start
+
+
+async def time_range_queries(name: str, student_ids, days: int) -> list:
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    timings = []
+    for student_id in student_ids:
+        start = time.perf_counter()
+        await db[name].find({"student_id": student_id, "created_at": {"$gte": cutoff}}).sort("created_at", 1).to_list(None)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+async def time_cohort_query(name: str) -> float:
+    start = time.perf_counter()
+    await db[name].aggregate(_bucket_pipeline("category", None), allowDiskUse=True).to_list(None)
+    return (time.perf_counter() - start) * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=200_000)
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+
+    records = generate_records(args.records, args.students)
+    rng = random.Random(7)
+    student_ids = [f"{rng.randrange(args.students):024x}" for _ in range(args.queries)]
+
+    for mode in STORAGE_MODES:
+        name = f"performance_records_bench_{mode}"
+        try:
+            load_s = await load(name, mode, records)
+            stats = await collection_stats(name)
+            # Warm the cache once so both modes are compared hot
+            await time_range_queries(name, student_ids[:20], args.days)
+            timings = await time_range_queries(name, student_ids, args.days)
+            cohort_ms = await time_cohort_query(name)
+
+            timings.sort()
+            print(f"[{mode}] load {len(records)} records: {load_s:.1f}s ({len(records) / load_s:,.0f}/s)")
+            print(f"[{mode}] storage {stats['storage_bytes'] / 1e6:.1f} MB, "
+                  f"indexes {stats['index_bytes'] / 1e6:.1f} MB, data {stats['size_bytes'] / 1e6:.1f} MB")
+            print(f"[{mode}] {args.days}d range query: median {statistics.median(timings):.2f} ms, "
+                  f"p95 {timings[int(len(timings) * 0.95) - 1]:.2f} ms")
+            print(f"[{mode}] cohort $group: {cohort_ms:.0f} ms")
+        finally:
+            await db[name].drop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
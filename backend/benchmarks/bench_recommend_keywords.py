@@ -0,0 +1,94 @@
+# backend/benchmarks/bench_recommend_keywords.py
+"""
+Benchmark chatbot club/event recommendations: the previous substring loop
+(every keyword against every item) vs the inverted keyword index with
+heapq.nlargest.
+
+Run from the backend folder (no database needed):
+    python -m benchmarks.bench_recommend_keywords --items 5000 --keywords 50
+"""
+import argparse
+import random
+import statistics
+import time
+
+from utils.search_index import KeywordIndex, recommendation_club_text
+
+WORDS = [
+    "robotics", "coding", "music", "dance", "drama", "chess", "quiz", "literary", "photography", "design",
+    "finance", "startup", "ai", "data", "cyber", "cloud", "green", "sports", "cricket", "football",
+    "debate", "film", "art", "space", "math", "physics", "bio", "chem", "gaming", "hiking",
+    "python", "java", "web", "mobile", "electronics", "drones", "poetry", "yoga", "theatre", "volunteering",
+]
+FILLER = ["club", "students", "weekly", "sessions", "projects", "members", "learn", "build", "share", "campus"]
+
+
+def generate_clubs(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    clubs = []
+    for i in range(count):
+        topic = rng.sample(WORDS, 3)
+        description = " ".join(rng.choice(topic + FILLER) for _ in range(rng.randint(20, 60)))
+        clubs.append({"name": f"{topic[0].title()} Club {i}", "description": description})
+    return clubs
+
+
+def generate_keywords(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    keywords = set()
+    while len(keywords) < count:
+        keywords.add(" ".join(rng.sample(WORDS, rng.choice([1, 1, 1, 2]))))
+    return sorted(keywords)
+
+
+def legacy_recommend(keywords, clubs) -> list:
+    """The previous recommend_clubs: substring test per keyword per club, full sort."""
+    scored_clubs = []
+    for club in clubs:
+        score = 0
+        description = club.get("description", "").lower()
+        name = club.get("name", "").lower()
+        for keyword in keywords:
+            if keyword in description or keyword in name:
+                score += 1
+        if score > 0:
+            scored_clubs.append((club, score))
+    scored_clubs.sort(key=lambda x: x[1], reverse=True)
+    return [club for club, score in scored_clubs[:3]]
+
+
+def time_calls(func, rounds: int) -> list:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings
+
+
+def report(label: str, timings: list):
+    print(f"{label}: median {statistics.median(timings):,.2f} ms, p95 {timings[int(len(timings) * 0.95) - 1]:,.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--keywords", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    clubs = generate_clubs(args.items)
+    keywords = generate_keywords(args.keywords)
+
+    start = time.perf_counter()
+    index = KeywordIndex(clubs, recommendation_club_text)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"inverted index over {len(clubs):,} items: {len(index.postings):,} tokens, built in {build_ms:.0f} ms")
+
+    report("inverted index", time_calls(lambda: index.top_k(keywords, 3), args.rounds))
+    report("substring loop", time_calls(lambda: legacy_recommend(keywords, clubs), max(1, args.rounds // 5)))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,20 @@ from fastapi import FastAPI
 from config.db import db
 from passlib.context import CryptContext
 from datetime import datetime
+import os
+from utils.scheduler import scheduler
+from utils.http_client import http_clients
+from utils.job_queue import job_queue, ensure_job_indexes
+from utils.notification_utils import check_and_notify_low_performance, cleanup_old_notifications
+from utils.percentile_ranks import rank_index
+from utils.ai_utils import precompute_predictions, ensure_ai_indexes
+from utils.performance_utils import ensure_analytics_indexes
+from utils.performance_rollups import ensure_rollup_indexes
+from utils.performance_storage import ensure_performance_collection
+from utils.llm_cache import ensure_llm_cache_indexes
+from utils.chat_context import chat_context
+from utils.name_lookup import ensure_name_key_indexes
+from utils.chat_log import chat_log_writer, archive_old_chat_logs, ensure_chat_log_indexes
 
 # Password context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -27,8 +41,79 @@ async def test_connection():
     except Exception:
         return
 
+def register_scheduled_jobs():
+    """Register periodic background jobs (times are UTC)."""
+    scheduler.add_job(
+        "check_low_performance",
+        check_and_notify_low_performance,
+        cron=os.getenv("LOW_PERFORMANCE_CHECK_CRON", "0 2 * * *"),
+        jitter=120,
+        misfire_grace_time=3600,
+    )
+    scheduler.add_job(
+        "cleanup_old_notifications",
+        cleanup_old_notifications,
+        cron=os.getenv("NOTIFICATION_CLEANUP_CRON", "30 3 * * *"),
+        jitter=120,
+        misfire_grace_time=3600,
+    )
+    scheduler.add_job(
+        "precompute_ai_predictions",
+        precompute_predictions,
+        cron=os.getenv("AI_PREDICTION_CRON", "0 4 * * *"),
+        jitter=120,
+        misfire_grace_time=3600,
+    )
+    scheduler.add_job(
+        "archive_chat_logs",
+        archive_old_chat_logs,
+        cron=os.getenv("CHAT_LOG_ARCHIVE_CRON", "0 3 * * *"),
+        jitter=120,
+        misfire_grace_time=3600,
+    )
+    # Per-process in-memory index, so every worker rebuilds its own copy
+    scheduler.add_job(
+        "rebuild_rank_index",
+        rank_index.rebuild,
+        interval=int(os.getenv("RANK_INDEX_REFRESH_SECONDS", 600)),
+        jitter=30,
+        exclusive=False,
+    )
+    # Refresh ahead of the TTL so chat requests don't pay for the rebuild
+    scheduler.add_job(
+        "refresh_chat_context",
+        chat_context.refresh,
+        interval=int(os.getenv("CHAT_CONTEXT_REFRESH_SECONDS", 240)),
+        jitter=30,
+        exclusive=False,
+    )
+
 def register_startup_events(app: FastAPI):
     @app.on_event("startup")
     async def startup_tasks():
         await test_connection()
         await create_default_admin()
+        await ensure_job_indexes()
+        await ensure_performance_collection()
+        await ensure_analytics_indexes()
+        await ensure_rollup_indexes()
+        await ensure_ai_indexes()
+        await ensure_llm_cache_indexes()
+        await ensure_name_key_indexes()
+        await ensure_chat_log_indexes()
+        chat_log_writer.start()
+        # Warm the chatbot context so the first message doesn't load it
+        await chat_context.refresh()
+        if os.getenv("JOB_WORKERS_ENABLED", "true").lower() == "true":
+            job_queue.start(concurrency=int(os.getenv("JOB_WORKERS", 2)))
+        if os.getenv("SCHEDULER_ENABLED", "true").lower() == "true":
+            register_scheduled_jobs()
+            scheduler.start()
+
+    @app.on_event("shutdown")
+    async def shutdown_tasks():
+        await scheduler.shutdown()
+        await job_queue.shutdown()
+        # Write out buffered chat logs before the process exits
+        await chat_log_writer.shutdown()
+        await http_clients.aclose()
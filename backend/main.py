@@ -18,6 +18,7 @@ from config.startup import register_startup_events  # Import startup tasks
 from routes.blog_routes import router as blog_router
 from routes.event_scraper_routes import router as event_scraper_router
 from routes.performance_routes import router as performance_router
+from routes.job_routes import router as job_router
 
 app = FastAPI(title="CampusBuzz API", version="0.1")
 
@@ -53,6 +54,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # keyset pagination cursor
 )
 
 # --- Static files for uploads ---
@@ -69,6 +71,7 @@ app.include_router(admin_routes.router, prefix="/api")  # Admin routes under /ap
 app.include_router(chatbot_router.router)  # Chatbot routes
 app.include_router(event_scraper_router)
 app.include_router(performance_router)
+app.include_router(job_router)
 
 # --- Root endpoint --
 @app.get("/")
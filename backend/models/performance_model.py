@@ -45,6 +45,7 @@ class PerformanceRecordOut(PerformanceRecordIn):
 class PerformanceAnalytics(BaseModel):
     student_id: str
     student_name: Optional[str] = None  # Added for display purposes
+    department: Optional[str] = None
     overall_average: float
     academic_average: float
     non_academic_average: float
@@ -53,6 +54,54 @@ class PerformanceAnalytics(BaseModel):
     category_averages: Dict[str, float]
     trend: str  # "improving", "declining", "stable"
     last_updated: datetime
+    percentile: Optional[float] = None  # Share of the cohort scoring below this student
+    percentile_cohort: Optional[str] = None
+
+class StudentRank(BaseModel):
+    student_id: str
+    overall_average: float
+    rank: int
+    percentile: float
+    cohort: str
+    cohort_size: int
+
+class HistogramBucket(BaseModel):
+    start: int
+    end: int
+    count: int
+
+class CohortStats(BaseModel):
+    cohort: str
+    count: int
+    mean: float
+    median: float
+    p10: float
+    p90: float
+    std: float
+    min: float
+    max: float
+    histogram: List[HistogramBucket]
+    level_counts: Dict[str, int]
+
+class CohortAnalytics(BaseModel):
+    group_by: str
+    type: Optional[PerformanceType] = None
+    basis: str  # "record_score" or "student_average"
+    cohorts: List[CohortStats]
+    generated_at: datetime
+
+class TimeSeriesPoint(BaseModel):
+    month: str  # "YYYY-MM"
+    count: int
+    average: float
+    min: float
+    max: float
+
+class PerformanceTimeSeries(BaseModel):
+    student_id: str
+    type: Optional[PerformanceType] = None
+    category: Optional[str] = None
+    points: List[TimeSeriesPoint]
 
 class NotificationType(str, Enum):
     LOW_PERFORMANCE = "low_performance"
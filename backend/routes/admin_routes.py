@@ -5,7 +5,12 @@ from bson import ObjectId
 from middleware.auth_middleware import require_role
 from datetime import datetime
 from models.teacher_model import TeacherIn, TeacherOut
-from routes.club_routes import serialize_club, list_teachers_by_club, get_club_teachers_route
+from routes.club_routes import serialize_club, list_teachers_by_club, get_club_teachers_route, enhancement_cache
+from utils.scheduler import scheduler, get_lease_status
+from utils.llm_client import llm_client
+from utils.chat_context import chat_context
+from utils.search_index import club_index, event_index
+from utils.chat_answers import chat_answer_cache
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -42,6 +47,7 @@ async def approve_club(club_id: str):
     )
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Club not found")
+    await chat_context.invalidate()
     return {"message": "✅ Club approved successfully"}
 
 @router.delete("/clubs/{club_id}")
@@ -51,6 +57,7 @@ async def delete_club(club_id: str):
     result = await db.clubs.delete_one({"_id": ObjectId(club_id)})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Club not found")
+    await chat_context.invalidate()
     return {"message": "❌ Club deleted"}
 
 # --------------------------
@@ -85,6 +92,7 @@ async def approve_event(event_id: str):
     )
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Event not found")
+    await chat_context.invalidate()
     return {"message": "✅ Event approved successfully"}
 
 @router.delete("/events/{event_id}")
@@ -94,6 +102,7 @@ async def delete_event(event_id: str):
     result = await db.events.delete_one({"_id": ObjectId(event_id)})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Event not found")
+    await chat_context.invalidate()
     return {"message": "❌ Event deleted"}
 
 # --------------------------
@@ -113,6 +122,7 @@ async def add_teacher_route(teacher: TeacherIn):
         raise HTTPException(status_code=400, detail="Invalid club ID format")
 
     result = await db["teachers"].insert_one(teacher_data)
+    await chat_context.invalidate()
     teacher_data["id"] = str(result.inserted_id)
     teacher_data["club_id"] = str(teacher_data["club_id"])
     return teacher_data
@@ -160,6 +170,7 @@ async def update_teacher(teacher_id: str, teacher_data: dict):
             {"_id": ObjectId(teacher_id)},
             {"$set": update_fields}
         )
+        await chat_context.invalidate()
 
     return {"status": "ok", "message": "teacher updated successfully"}
 
@@ -170,6 +181,7 @@ async def delete_teacher(teacher_id: str):
     result = await db.teachers.delete_one({"_id": ObjectId(teacher_id)})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Teacher not found")
+    await chat_context.invalidate()
     return {"message": "Teacher deleted successfully"}
 
 # --------------------------
@@ -205,4 +217,32 @@ async def mark_participant_checkin(event_id: str, participant_id: str):
     )
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Participant not found")
-    return {"message": "✅ Participant checked-in successfully"}
\ No newline at end of file
+    return {"message": "✅ Participant checked-in successfully"}
+# --------------------------
+# Background Scheduler
+# --------------------------
+@router.get("/scheduler/jobs", dependencies=[Depends(require_role(["admin"]))])
+async def get_scheduler_jobs():
+    """Local job metrics for this worker plus the cluster-wide lease state."""
+    return {
+        "jobs": scheduler.get_metrics(),
+        "leases": await get_lease_status(),
+    }
+
+@router.post("/scheduler/jobs/{job_name}/run", dependencies=[Depends(require_role(["admin"]))])
+async def run_scheduler_job(job_name: str):
+    if job_name not in scheduler.jobs:
+        raise HTTPException(status_code=404, detail="Job not found")
+    ran = await scheduler.run_job_now(job_name)
+    return {"job": job_name, "ran": ran}
+
+@router.get("/llm/status", dependencies=[Depends(require_role(["admin"]))])
+async def get_llm_status():
+    """Provider, circuit breaker state, call counters and LLM cache metrics for this worker."""
+    return {
+        **llm_client.get_status(),
+        "caches": [enhancement_cache.get_metrics()],
+        "chat_answers": chat_answer_cache.get_metrics(),
+        "chat_context": chat_context.get_status(),
+        "chat_search_index": {"clubs": club_index.get_metrics(), "events": event_index.get_metrics()},
+    }
@@ -1,22 +1,50 @@
 # routes/chatbot_routes.py
 from fastapi import APIRouter, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from config.db import db
-from openai import AsyncOpenAI
+import heapq
 import os
+import time
 from datetime import datetime
 from utils.id_util import normalize_id
+from utils.llm_client import get_openai_client
+from utils.chat_context import chat_context, ContextSnapshot
+from utils.entity_matcher import build_entity_matcher
+from utils.name_lookup import find_by_name
+from utils.chat_answers import chat_answer_cache, normalize_question
+from utils.chat_intents import get_intent_classifier
+from utils.chat_log import chat_log_writer
+from utils.llm_cache import content_hash
+from utils.search_index import KeywordIndex, build_keyword_indexes, build_search_indexes, take_within_budget
 import json
 import re
 from bson import ObjectId
 
 router = APIRouter(prefix="/api/chatbot", tags=["chatbot"])
 
+# Refreshed with every context snapshot so club/event writes are picked up
+# (the search index only re-vectorizes items that changed)
+chat_context.register_derived("entity_matcher", build_entity_matcher)
+chat_context.register_derived("search_index", build_search_indexes)
+chat_context.register_derived("keyword_index", build_keyword_indexes)
+
 # 🔑 OpenAI API setup (using OpenRouter)
-client = AsyncOpenAI(
-    api_key=os.getenv("OPENAI_API_KEY"),
-    base_url="https://openrouter.ai/api/v1"
-)
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+CHAT_MODEL = "openai/gpt-3.5-turbo"
+
+# Recommendation prompts carry only the top-k relevant items, capped at a token budget
+RECOMMEND_CANDIDATES = int(os.getenv("CHAT_RECOMMEND_CANDIDATES", 15))
+RECOMMEND_PROMPT_TOKENS = int(os.getenv("CHAT_RECOMMEND_PROMPT_TOKENS", 1200))
+PROMPT_DESCRIPTION_CHARS = 240
+PROMPT_PROFILE_FIELDS = ("department", "year", "skills", "interests", "achievements", "description")
+PROMPT_CLUB_FIELDS = ("name", "description", "faculty_incharge")
+PROMPT_EVENT_FIELDS = ("title", "description", "date", "venue", "clubName", "tags")
+
+def get_chat_client():
+    """OpenRouter client on the shared outbound HTTP pool."""
+    return get_openai_client(os.getenv("OPENAI_API_KEY"), OPENROUTER_BASE_URL)
 
 # ----------------- Models -----------------
 class ChatRequest(BaseModel):
@@ -33,20 +61,6 @@ class ChatResponse(BaseModel):
     recommended_events: list | None = None
 
 # ----------------- Helpers -----------------
-async def fetch_context_from_db() -> dict:
-    """Fetch structured university data for responses."""
-    clubs = await db.clubs.find({}, {"_id": 0, "name": 1, "description": 1, "faculty_incharge": 1, "members_count": 1}).to_list(10)
-    # Remove image_base64 if present
-    for club in clubs:
-        club.pop("image_base64", None)
-
-    return {
-        "clubs": clubs,
-        "events": await db.events.find({}, {"_id": 0, "title": 1, "date": 1, "venue": 1, "clubName": 1}).to_list(10),
-        "teachers": await db.teachers.find({}, {"_id": 0, "name": 1, "department": 1, "email": 1, "phone": 1}).to_list(10),
-        "students": await db.users.find({"role": "student"}, {"_id": 0, "name": 1, "roll_no": 1, "year": 1, "email": 1}).to_list(10),
-    }
-
 async def fetch_user_profile(user_id: str) -> dict | None:
     """Fetch user profile data for recommendations."""
     profile = await db.student_profiles.find_one({"_id": normalize_id(user_id)})
@@ -55,19 +69,6 @@ async def fetch_user_profile(user_id: str) -> dict | None:
         return serialize_mongo_doc(profile)
     return None
 
-async def fetch_all_clubs_and_events() -> dict:
-    """Fetch all clubs and events for recommendations."""
-    clubs = await db.clubs.find({}, {"_id": 0, "name": 1, "description": 1, "faculty_incharge": 1, "members_count": 1}).to_list(100)
-    for club in clubs:
-        club.pop("image_base64", None)
-
-    events = await db.events.find({}, {"_id": 0, "title": 1, "description": 1, "date": 1, "venue": 1, "clubName": 1, "tags": 1}).to_list(100)
-
-    return {
-        "clubs": clubs,
-        "events": events
-    }
-
 def serialize_mongo_doc(doc: dict) -> dict:
     """Convert MongoDB document to JSON-serializable dict."""
     if not doc:
@@ -90,10 +91,11 @@ def serialize_mongo_doc(doc: dict) -> dict:
 
 async def fetch_club_details(club_name: str) -> dict | None:
     """Fetch detailed club data by name."""
-    club = await db.clubs.find_one({"name": {"$regex": club_name, "$options": "i"}})
+    club = await find_by_name("clubs", club_name)
     if club:
-        # Remove image_base64 if present
+        # Remove image_base64 and the club login hash if present
         club.pop("image_base64", None)
+        club.pop("password", None)
         # Fetch associated teachers
         teachers = await db.teachers.find({"club_id": club["_id"]}, {"_id": 0}).to_list(10)
         club_details = serialize_mongo_doc(club)
@@ -103,7 +105,7 @@ async def fetch_club_details(club_name: str) -> dict | None:
 
 async def fetch_event_details(event_title: str) -> dict | None:
     """Fetch detailed event data by title and associated club."""
-    event = await db.events.find_one({"title": {"$regex": event_title, "$options": "i"}})
+    event = await find_by_name("events", event_title)
     if event:
         event_details = serialize_mongo_doc(event)
         # Fetch associated club if clubId exists
@@ -111,31 +113,15 @@ async def fetch_event_details(event_title: str) -> dict | None:
             club = await db.clubs.find_one({"_id": normalize_id(event["clubId"])}, {"_id": 0})
             if club:
                 club.pop("image_base64", None)
+                club.pop("password", None)
             event_details["associated_club"] = serialize_mongo_doc(club)
         return event_details
     return None
 
-def detect_specific_query(question: str, context: dict, query_type: str) -> str | None:
-    """Detect if question mentions a specific club or event."""
-    items = context.get(query_type + "s", [])
-    question_lower = question.lower()
-
-    # Check for exact matches first
-    for item in items:
-        name = item.get("name" if query_type == "club" else "title", "")
-        if name and name.lower() in question_lower:
-            return name
-
-    # Check for partial matches (e.g., "IWX" in "IWX club")
-    for item in items:
-        name = item.get("name" if query_type == "club" else "title", "")
-        if name:
-            name_parts = name.lower().split()
-            for part in name_parts:
-                if len(part) > 2 and part in question_lower:  # Only match parts longer than 2 chars
-                    return name
-
-    return None
+def detect_specific_query(question: str, snapshot: ContextSnapshot, query_type: str) -> str | None:
+    """Detect if question mentions a specific club or event (by full name or a distinctive word of it)."""
+    matcher = snapshot.derived("entity_matcher", build_entity_matcher)
+    return matcher.find(question, query_type)
 
 def detect_recommendation_query(question: str) -> str | None:
     """Detect if the question is asking for recommendations (club or event)."""
@@ -157,12 +143,17 @@ def detect_recommendation_query(question: str) -> str | None:
 
 async def fetch_user_history(user_id: str, limit: int = 5) -> list:
     """Fetch last N messages of a user to check context and relevance."""
-    logs = await db.chat_logs.find({"user_id": normalize_id(user_id)}).sort("timestamp", -1).limit(limit).to_list(limit)
+    user_id = normalize_id(user_id)
+    # Entries still waiting in the write-behind buffer are the newest ones
+    logs = chat_log_writer.pending_for(user_id)[:limit]
+    if len(logs) < limit:
+        remaining = limit - len(logs)
+        logs += await db.chat_logs.find({"user_id": user_id}).sort("timestamp", -1).limit(remaining).to_list(remaining)
     return [{"question": log["question"], "response": log["response"]} for log in logs]
 
 async def log_chat(user_id: str, question: str, response_json: dict) -> None:
-    """Store chat logs in MongoDB."""
-    await db.chat_logs.insert_one({
+    """Queue a chat log for the next batched write to MongoDB."""
+    chat_log_writer.log({
         "user_id": normalize_id(user_id),
         "question": question,
         "response": response_json,
@@ -187,162 +178,260 @@ def clean_message(message: str) -> str:
         pass
     return message.strip()
 
-def recommend_clubs(user_profile: dict, clubs: list) -> list:
-    """Recommend clubs based on user profile similarity."""
-    if not user_profile or not clubs:
-        return []
-
-    # Extract keywords from user profile
+def profile_keywords(user_profile: dict) -> set:
+    """Skills, interests and achievements of a profile."""
     keywords = set()
-    if user_profile.get("skills"):
-        keywords.update([skill.lower() for skill in user_profile["skills"]])
-    if user_profile.get("interests"):
-        keywords.update([interest.lower() for interest in user_profile["interests"]])
-    if user_profile.get("achievements"):
-        keywords.update([ach.lower() for ach in user_profile["achievements"]])
-
-    # Score clubs based on keyword matches
-    scored_clubs = []
-    for club in clubs:
-        score = 0
-        description = club.get("description", "").lower()
-        name = club.get("name", "").lower()
-        for keyword in keywords:
-            if keyword in description or keyword in name:
-                score += 1
-        if score > 0:
-            scored_clubs.append((club, score))
-
-    # Sort by score descending and return top matches
-    scored_clubs.sort(key=lambda x: x[1], reverse=True)
-    return [club for club, score in scored_clubs[:3]]  # Top 3
-
-def recommend_events(user_profile: dict, events: list) -> list:
-    """Recommend events based on user profile similarity."""
-    if not user_profile or not events:
+    for field in ("skills", "interests", "achievements"):
+        keywords.update(str(value).lower() for value in user_profile.get(field) or [])
+    return keywords
+
+def recommend_clubs(user_profile: dict, index: KeywordIndex) -> list:
+    """Top 3 clubs whose name or description matches the most profile keywords."""
+    if not user_profile:
         return []
+    return index.top_k(profile_keywords(user_profile), 3)
 
-    # Extract keywords from user profile
-    keywords = set()
-    if user_profile.get("skills"):
-        keywords.update([skill.lower() for skill in user_profile["skills"]])
-    if user_profile.get("interests"):
-        keywords.update([interest.lower() for interest in user_profile["interests"]])
-    if user_profile.get("achievements"):
-        keywords.update([ach.lower() for ach in user_profile["achievements"]])
-
-    # Score events based on keyword matches in title, description, tags
-    scored_events = []
-    for event in events:
-        score = 0
-        title = event.get("title", "").lower()
-        description = event.get("description", "").lower()
-        tags = event.get("tags", [])
-        if tags:
-            tags_str = " ".join(tags).lower()
+def recommend_events(user_profile: dict, index: KeywordIndex) -> list:
+    """Top 3 events whose title, description or tags match the most profile keywords."""
+    if not user_profile:
+        return []
+    return index.top_k(profile_keywords(user_profile), 3)
+
+def format_event_date(value) -> str:
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    if isinstance(value, datetime):
+        return value.strftime("%a %d %b %Y, %I:%M %p")
+    return "a date to be announced"
+
+async def answer_locally(question: str, snapshot: ContextSnapshot) -> dict | None:
+    """Templated answer for structured questions; None means the LLM should answer."""
+    matcher = snapshot.derived("entity_matcher", build_entity_matcher)
+    result = get_intent_classifier().classify(question, matcher)
+
+    if result.intent == "upcoming_events":
+        now = datetime.utcnow()
+        upcoming = heapq.nsmallest(
+            5,
+            (e for e in snapshot.events if isinstance(e.get("date"), datetime) and e["date"] >= now),
+            key=lambda e: e["date"],
+        )
+        if not upcoming:
+            return {"message": "There are no upcoming events scheduled right now.", "events": {}}
+        lines = [f"{e['title']} on {format_event_date(e['date'])} at {e.get('venue') or 'a venue to be announced'}" for e in upcoming]
+        return {"message": "Upcoming events: " + "; ".join(lines) + ".", "events": {e["title"]: [e] for e in upcoming}}
+
+    if result.intent == "list_clubs":
+        names = [c["name"] for c in snapshot.clubs if c.get("name")]
+        if not names:
+            return {"message": "There are no clubs listed yet.", "clubs": {}}
+        shown = ", ".join(names[:10])
+        more = f" and {len(names) - 10} more" if len(names) > 10 else ""
+        return {
+            "message": f"There are {len(names)} clubs: {shown}{more}.",
+            "clubs": {c["name"]: [c] for c in snapshot.clubs[:5] if c.get("name")},
+        }
+
+    if result.intent == "club_teachers":
+        club = await fetch_club_details(result.slots["club"])
+        if not club:
+            return None
+        teachers = [t["name"] + (f" ({t['email']})" if t.get("email") else "") for t in club["teachers"] if t.get("name")]
+        if not teachers and club.get("faculty_incharge"):
+            teachers = [str(club["faculty_incharge"])]
+        if teachers:
+            message = f"{club['name']} is guided by {', '.join(teachers)}."
         else:
-            tags_str = ""
-        for keyword in keywords:
-            if keyword in title or keyword in description or keyword in tags_str:
-                score += 1
-        if score > 0:
-            scored_events.append((event, score))
+            message = f"No faculty member is listed for {club['name']} yet."
+        return {"message": message, "clubs": {club["name"]: [club]}}
+
+    if result.intent in ("event_when", "event_where"):
+        event = await fetch_event_details(result.slots["event"])
+        if not event:
+            return None
+        when = format_event_date(event.get("date"))
+        venue = event.get("venue") or "a venue to be announced"
+        if result.intent == "event_when":
+            message = f"{event['title']} is on {when} at {venue}."
+        else:
+            message = f"{event['title']} takes place at {venue} on {when}."
+        return {"message": message, "events": {event["title"]: [event]}}
 
-    # Sort by score descending and return top matches
-    scored_events.sort(key=lambda x: x[1], reverse=True)
-    return [event for event, score in scored_events[:3]]  # Top 3
+    return None
 
 # ----------------- Chatbot Route -----------------
+class ChatPlan:
+    """What a chat message needs before the LLM call: context, detected entities and the prompt."""
+
+    def __init__(self, snapshot: ContextSnapshot):
+        self.snapshot = snapshot
+        self.local_answer: dict | None = None
+        self.specific_club = None
+        self.specific_event = None
+        self.recommendation_type = None
+        self.detailed_club = None
+        self.detailed_event = None
+        self.user_profile = None
+        self.route = "general"
+        self.subject = None
+        self.instructions = ""
+        self.reply_hint = "answer"
+
+    @property
+    def cache_key(self) -> str:
+        return chat_answer_cache.key(self.route, self.subject, self.snapshot.version)
+
+    def prompt(self, stream: bool = False) -> str:
+        # Streamed replies go to the user token by token, so they must be plain text rather than JSON
+        if stream:
+            return f"{self.instructions}. Respond with the answer only, in plain text."
+        return f"""{self.instructions}. Respond in JSON: {{"message": "{self.reply_hint}"}}"""
+
+def prompt_item(kind: str, item: dict) -> dict:
+    """The fields of a club/event worth spending prompt tokens on."""
+    fields = PROMPT_CLUB_FIELDS if kind == "club" else PROMPT_EVENT_FIELDS
+    compact = {field: item[field] for field in fields if item.get(field)}
+    if isinstance(compact.get("description"), str):
+        compact["description"] = compact["description"][:PROMPT_DESCRIPTION_CHARS]
+    return jsonable_encoder(compact)
+
+def select_recommendation_candidates(question: str, profile: dict, plan: ChatPlan) -> list:
+    """Items most relevant to the question and profile, within the prompt token budget."""
+    kind = plan.recommendation_type
+    index = plan.snapshot.derived("search_index", build_search_indexes)[kind]
+    query = " ".join([question] + [
+        " ".join(map(str, value)) if isinstance(value, list) else str(value) for value in profile.values()
+    ])
+    ranked = [item for _, item in index.search(query, RECOMMEND_CANDIDATES)]
+    if not ranked:
+        # Nothing overlaps the profile; let the LLM pick from the first items
+        ranked = plan.snapshot.clubs if kind == "club" else plan.snapshot.events
+    return take_within_budget(
+        (prompt_item(kind, item) for item in ranked[:RECOMMEND_CANDIDATES]), RECOMMEND_PROMPT_TOKENS
+    )
+
+async def plan_chat(request: ChatRequest) -> ChatPlan:
+    # 1. Fetch structured context
+    plan = ChatPlan(await chat_context.get())
+
+    # 2. Detect specific club or event queries
+    plan.specific_club = detect_specific_query(request.question, plan.snapshot, "club")
+    plan.specific_event = detect_specific_query(request.question, plan.snapshot, "event")
+
+    # 3. Detect recommendation queries
+    plan.recommendation_type = detect_recommendation_query(request.question)
+
+    # 4. Answer structured questions straight from the data, without the LLM
+    if not plan.recommendation_type:
+        plan.local_answer = await answer_locally(request.question, plan.snapshot)
+        if plan.local_answer:
+            return plan
+
+    # 5. Fetch detailed data if specific query detected (only for specific queries)
+    if plan.specific_club:
+        plan.detailed_club = await fetch_club_details(plan.specific_club)
+    elif plan.specific_event:
+        plan.detailed_event = await fetch_event_details(plan.specific_event)
+    elif plan.recommendation_type:
+        # For recommendations, fetch user profile (clubs/events come from the snapshot indexes)
+        plan.user_profile = await fetch_user_profile(request.user_id)
+    # For general queries, don't fetch detailed data to save tokens
+
+    # 6. Build ultra-minimal prompt to guarantee token limits (no history to save tokens)
+    if plan.detailed_club:
+        # For club queries - minimal prompt
+        plan.route, plan.subject = "club", plan.detailed_club.get("name")
+        plan.instructions = f"You are a university chatbot. Provide details about this club: {json.dumps(plan.detailed_club)}"
+    elif plan.detailed_event:
+        # For event queries - minimal prompt
+        plan.route, plan.subject = "event", plan.detailed_event.get("title")
+        plan.instructions = f"You are a university chatbot. Provide details about this event: {json.dumps(plan.detailed_event)}"
+    elif plan.recommendation_type and plan.user_profile:
+        # For recommendations - send profile and the most relevant items to OpenAI for personalized response
+        profile = {field: plan.user_profile[field] for field in PROMPT_PROFILE_FIELDS if plan.user_profile.get(field)}
+        candidates = select_recommendation_candidates(request.question, profile, plan)
+        plan.route = f"recommend_{plan.recommendation_type}"
+        plan.subject = (content_hash(profile), normalize_question(request.question))
+        plan.instructions = (
+            f"You are a university chatbot. Based on this user profile: {json.dumps(profile)}, "
+            f"recommend the top 2-3 most suitable {plan.recommendation_type}s from this list: "
+            f"{json.dumps(candidates)}. Make it personalized and human-like"
+        )
+        plan.reply_hint = "personalized recommendation"
+    else:
+        # For general queries - ultra minimal
+        plan.route, plan.subject = "general", normalize_question(request.question)
+        plan.instructions = f"You are a university chatbot. Answer: {request.question}"
+    return plan
+
+def build_structured_fields(question: str, plan: ChatPlan) -> dict:
+    """Events, clubs, teachers, students and recommendations that accompany the message."""
+    fields = {}
+    context = plan.snapshot.context
+
+    # Only include structured data if specifically requested or for specific queries
+    q_lower = question.lower()
+    if plan.specific_event:
+        fields["events"] = {plan.detailed_event["title"]: [plan.detailed_event]} if plan.detailed_event else {}
+    elif any(keyword in q_lower for keyword in ["event", "events"]):
+        fields["events"] = {e["title"]: [e] for e in context["events"][:5]}  # Limit to 5
+
+    if plan.specific_club:
+        fields["clubs"] = {plan.detailed_club["name"]: [plan.detailed_club]} if plan.detailed_club else {}
+    elif any(keyword in q_lower for keyword in ["club", "clubs", "society"]):
+        fields["clubs"] = {c["name"]: [c] for c in context["clubs"][:5]}  # Limit to 5
+
+    if any(keyword in q_lower for keyword in ["teacher", "teachers", "faculty", "professor"]):
+        fields["teachers"] = {t["name"]: [t] for t in context["teachers"][:5]}  # Limit to 5
+
+    if any(keyword in q_lower for keyword in ["student", "students", "roll", "year"]):
+        fields["students"] = {s["name"]: [s] for s in context["students"][:5]}  # Limit to 5
+
+    # Add recommended clubs/events if recommendation query
+    if plan.recommendation_type and plan.user_profile:
+        indexes = plan.snapshot.derived("keyword_index", build_keyword_indexes)
+        if plan.recommendation_type == "club":
+            recommended_clubs = recommend_clubs(plan.user_profile, indexes["club"])
+            if recommended_clubs:
+                fields["recommended_clubs"] = recommended_clubs
+        elif plan.recommendation_type == "event":
+            recommended_events = recommend_events(plan.user_profile, indexes["event"])
+            if recommended_events:
+                fields["recommended_events"] = recommended_events
+    return fields
+
 @router.post("/query", response_model=ChatResponse)
 async def query_chatbot(request: ChatRequest):
     try:
-        # 1. Fetch structured context
-        context = await fetch_context_from_db()
-
-        # 2. Detect specific club or event queries
-        specific_club = detect_specific_query(request.question, context, "club")
-        specific_event = detect_specific_query(request.question, context, "event")
-
-        # 3. Detect recommendation queries
-        recommendation_type = detect_recommendation_query(request.question)
-
-        # 4. Fetch detailed data if specific query detected (only for specific queries)
-        detailed_club = None
-        detailed_event = None
-        user_profile = None
-        all_data = None
-
-        if specific_club:
-            detailed_club = await fetch_club_details(specific_club)
-        elif specific_event:
-            detailed_event = await fetch_event_details(specific_event)
-        elif recommendation_type:
-            # For recommendations, fetch user profile and all clubs/events
-            user_profile = await fetch_user_profile(request.user_id)
-            all_data = await fetch_all_clubs_and_events()
-        else:
-            # For general queries, don't fetch detailed data to save tokens
-            pass
-
-        # 5. No history to save tokens
-        history_str = ""
-
-        # 6. Build ultra-minimal prompt to guarantee token limits
-        if detailed_club:
-            # For club queries - minimal prompt
-            prompt = f"""You are a university chatbot. Provide details about this club: {json.dumps(detailed_club)}. Respond in JSON: {{"message": "answer"}}"""
-        elif detailed_event:
-            # For event queries - minimal prompt
-            prompt = f"""You are a university chatbot. Provide details about this event: {json.dumps(detailed_event)}. Respond in JSON: {{"message": "answer"}}"""
-        elif recommendation_type and user_profile and all_data:
-            # For recommendations - send profile to OpenAI for personalized response
-            data_to_recommend = all_data[recommendation_type + "s"]
-            prompt = f"""You are a university chatbot. Based on this user profile: {json.dumps(user_profile)}, recommend the top 2-3 most suitable {recommendation_type}s from this list: {json.dumps(data_to_recommend)}. Make it personalized and human-like. Respond in JSON: {{"message": "personalized recommendation"}}"""
-        else:
-            # For general queries - ultra minimal
-            prompt = f"""You are a university chatbot. Answer: {request.question}. Respond in JSON: {{"message": "answer"}}"""
-
-        # 7. Call OpenAI via OpenRouter
-        response = await client.chat.completions.create(
-            model="openai/gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}]
-        )
-
-        # 8. Extract and clean message
-        raw_message = extract_openai_text(response) or "Sorry, I couldn't find an answer."
-        message = clean_message(raw_message)
+        plan = await plan_chat(request)
+        if plan.local_answer:
+            chat_answer_cache.record_local_answer()
+            await log_chat(request.user_id, request.question, plan.local_answer)
+            return plan.local_answer
+
+        # 7. Reuse a cached answer for the same question and data, else call OpenAI via OpenRouter
+        cache_key = plan.cache_key
+        message = await chat_answer_cache.get(cache_key)
+        if message is None:
+            started = time.perf_counter()
+            response = await get_chat_client().chat.completions.create(
+                model=CHAT_MODEL,
+                messages=[{"role": "user", "content": plan.prompt()}]
+            )
+            usage = getattr(response, "usage", None)
+            chat_answer_cache.record_call(time.perf_counter() - started, getattr(usage, "total_tokens", 0) or 0)
+
+            # 8. Extract and clean message
+            raw_message = extract_openai_text(response)
+            message = clean_message(raw_message or "Sorry, I couldn't find an answer.")
+            if raw_message:
+                await chat_answer_cache.set(cache_key, message)
 
         # 9. Build structured response
-        response_json = {"message": message}
-
-        # Only include structured data if specifically requested or for specific queries
-        q_lower = request.question.lower()
-        if specific_event:
-            response_json["events"] = {detailed_event["title"]: [detailed_event]} if detailed_event else {}
-        elif any(keyword in q_lower for keyword in ["event", "events"]):
-            response_json["events"] = {e["title"]: [e] for e in context["events"][:5]}  # Limit to 5
-
-        if specific_club:
-            response_json["clubs"] = {detailed_club["name"]: [detailed_club]} if detailed_club else {}
-        elif any(keyword in q_lower for keyword in ["club", "clubs", "society"]):
-            response_json["clubs"] = {c["name"]: [c] for c in context["clubs"][:5]}  # Limit to 5
-
-        if any(keyword in q_lower for keyword in ["teacher", "teachers", "faculty", "professor"]):
-            response_json["teachers"] = {t["name"]: [t] for t in context["teachers"][:5]}  # Limit to 5
-
-        if any(keyword in q_lower for keyword in ["student", "students", "roll", "year"]):
-            response_json["students"] = {s["name"]: [s] for s in context["students"][:5]}  # Limit to 5
-
-        # Add recommended clubs/events if recommendation query
-        if recommendation_type and user_profile and all_data:
-            if recommendation_type == "club":
-                recommended_clubs = recommend_clubs(user_profile, all_data["clubs"])
-                if recommended_clubs:
-                    response_json["recommended_clubs"] = recommended_clubs
-            elif recommendation_type == "event":
-                recommended_events = recommend_events(user_profile, all_data["events"])
-                if recommended_events:
-                    response_json["recommended_events"] = recommended_events
+        response_json = {"message": message, **build_structured_fields(request.question, plan)}
 
         # 10. Log chat
         await log_chat(request.user_id, request.question, response_json)
@@ -352,6 +441,76 @@ async def query_chatbot(request: ChatRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Chatbot error: {str(e)}")
 
+def sse_event(event: str, data) -> str:
+    """One Server-Sent Events frame with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+async def stream_chat_events(request: ChatRequest, plan: ChatPlan):
+    """
+    Yield `token` frames as the answer is generated, then one `done` frame
+    with the full message and the structured fields. Cached and local
+    answers arrive as a single token frame.
+    """
+    try:
+        if plan.local_answer:
+            chat_answer_cache.record_local_answer()
+            response_json = plan.local_answer
+            yield sse_event("token", {"text": response_json["message"]})
+        else:
+            cache_key = plan.cache_key
+            message = await chat_answer_cache.get(cache_key)
+            if message is not None:
+                yield sse_event("token", {"text": message})
+            else:
+                started = time.perf_counter()
+                stream = await get_chat_client().chat.completions.create(
+                    model=CHAT_MODEL,
+                    messages=[{"role": "user", "content": plan.prompt(stream=True)}],
+                    stream=True,
+                    stream_options={"include_usage": True},
+                )
+                parts = []
+                tokens = 0
+                async for chunk in stream:
+                    # The usage chunk comes last and has no choices
+                    if getattr(chunk, "usage", None):
+                        tokens = chunk.usage.total_tokens or 0
+                    if not chunk.choices:
+                        continue
+                    text = chunk.choices[0].delta.content
+                    if text:
+                        parts.append(text)
+                        yield sse_event("token", {"text": text})
+                chat_answer_cache.record_call(time.perf_counter() - started, tokens)
+
+                raw_message = "".join(parts).strip()
+                message = clean_message(raw_message or "Sorry, I couldn't find an answer.")
+                if raw_message:
+                    await chat_answer_cache.set(cache_key, message)
+            response_json = {"message": message, **build_structured_fields(request.question, plan)}
+
+        yield sse_event("done", response_json)
+    except Exception as e:
+        # Headers are already sent, so report the failure in-band
+        yield sse_event("error", {"detail": f"Chatbot error: {str(e)}"})
+        return
+
+    await log_chat(request.user_id, request.question, response_json)
+
+@router.post("/query/stream")
+async def query_chatbot_stream(request: ChatRequest):
+    """Same answer as /query, streamed as Server-Sent Events."""
+    try:
+        plan = await plan_chat(request)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Chatbot error: {str(e)}")
+    return StreamingResponse(
+        stream_chat_events(request, plan),
+        media_type="text/event-stream",
+        # Stop proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 # Backward compatibility alias
 @router.post("/ask", response_model=ChatResponse)
 async def ask_chatbot(request: ChatRequest):
@@ -7,6 +7,7 @@ from passlib.context import CryptContext
 from bson.errors import InvalidId
 import json
 import base64
+import logging
 from models.club_model import (
     ClubIn,
     ClubOut,
@@ -19,13 +20,18 @@ from middleware.auth_middleware import require_role, get_current_user
 from config.db import db
 from utils.mongo_utils import sanitize_doc
 from utils.id_util import normalize_id
+from utils.job_queue import job_queue
+from utils.llm_client import gemini_generate
+from utils.llm_cache import LLMCache, normalize_text
+from utils.chat_context import chat_context
+from utils.name_lookup import with_name_key
 from pymongo.errors import PyMongoError
 import os
-import httpx
 from dotenv import load_dotenv
 from fastapi.encoders import jsonable_encoder
 
 router = APIRouter(prefix="/api/clubs", tags=["clubs"])
+logger = logging.getLogger(__name__)
 
 # ----------------- Collections & Password -----------------
 COLLECTION = "clubs"
@@ -39,6 +45,15 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
+# Bump when the prompt below changes so old cached enhancements aren't reused
+ENHANCEMENT_PROMPT_VERSION = "v1"
+ENHANCEMENT_MODEL = "gemini-2.5-flash-lite"
+enhancement_cache = LLMCache(
+    "club_enhancement",
+    ttl_seconds=int(os.getenv("ENHANCEMENT_CACHE_TTL_SECONDS", 30 * 24 * 3600)),
+    max_entries=int(os.getenv("ENHANCEMENT_CACHE_MAX_ENTRIES", 5000)),
+)
+
 # ----------------- Helpers -----------------
 def validate_object_id(id_str: str) -> ObjectId:
     """Ensure the given string is a valid MongoDB ObjectId."""
@@ -79,7 +94,8 @@ async def create_club(club_in: ClubIn, created_by: str):
         "created_at": datetime.utcnow(),
         "approved": False,
     })
-    result = await db[COLLECTION].insert_one(club_data)
+    result = await db[COLLECTION].insert_one(with_name_key(COLLECTION, club_data))
+    await chat_context.invalidate()
     new_club = await db[COLLECTION].find_one({"_id": result.inserted_id})
     return serialize_club(new_club)
 
@@ -89,6 +105,7 @@ async def approve_club(club_id: str):
     if not club:
         raise HTTPException(status_code=404, detail="Club not found")
     await db[COLLECTION].update_one({"_id": oid}, {"$set": {"approved": True}})
+    await chat_context.invalidate()
     updated_club = await db[COLLECTION].find_one({"_id": oid})
     return serialize_club(updated_club)
 
@@ -98,6 +115,7 @@ async def reject_club(club_id: str):
     if not club:
         raise HTTPException(status_code=404, detail="Club not found")
     await db[COLLECTION].update_one({"_id": oid}, {"$set": {"approved": False}})
+    await chat_context.invalidate()
     updated_club = await db[COLLECTION].find_one({"_id": oid})
     return serialize_club(updated_club)
 
@@ -130,25 +148,30 @@ async def leave_club(club_id: str, user_id: str):
     return serialize_club(updated_club)
 
 # Gemini API helper - FIXED VERSION
-async def enhance_with_gemini(description: str, purpose: str):
+def _original_enhancement(description: str, purpose: str):
+    return {
+        "enhanced_description": description,
+        "enhanced_purpose": purpose,
+        "type": "General"
+    }
+
+
+async def request_gemini_enhancement(description: str, purpose: str):
     """
     Enhance club description and purpose using Gemini and classify club type.
-    Returns enhanced data without storing anything in database.
+    Raises on HTTP or parse errors so callers can retry; returns the original
+    text only when there is nothing to enhance or no API key is configured.
+    Successful results are cached by a hash of the normalized inputs.
     """
-    if not description or not purpose:
-        return {
-            "enhanced_description": description,
-            "enhanced_purpose": purpose,
-            "type": "General"
-        }
-    
-    if not GEMINI_API_KEY:
-        # If no API key, return original data
-        return {
-            "enhanced_description": description,
-            "enhanced_purpose": purpose,
-            "type": "General"
-        }
+    if not description or not purpose or not GEMINI_API_KEY:
+        return _original_enhancement(description, purpose)
+
+    cache_key = enhancement_cache.make_key(
+        ENHANCEMENT_PROMPT_VERSION, ENHANCEMENT_MODEL, normalize_text(description), normalize_text(purpose)
+    )
+    cached = await enhancement_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
     # --- Gemini enhancement ---
     prompt = f"""
@@ -165,55 +188,36 @@ async def enhance_with_gemini(description: str, purpose: str):
     Make the enhancement professional and suitable for a university club.
     """
 
-    model = "gemini-2.5-flash-lite"
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
-    headers = {"Content-Type": "application/json"}
-    payload = {"contents": [{"parts": [{"text": prompt}]}]}
+    text_response = await gemini_generate(prompt, GEMINI_API_KEY, ENHANCEMENT_MODEL, timeout=30.0)
 
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{url}?key={GEMINI_API_KEY}", 
-                headers=headers, 
-                json=payload,
-                timeout=30.0
-            )
-
-        if response.status_code != 200:
-            
-            return {
-                "enhanced_description": description,
-                "enhanced_purpose": purpose,
-                "type": "General"
-            }
+    # Clean the response - remove markdown code blocks if present
+    text_response = text_response.strip()
+    if text_response.startswith("```json"):
+        text_response = text_response[7:]
+    if text_response.endswith("```"):
+        text_response = text_response[:-3]
+    text_response = text_response.strip()
 
-        data = response.json()
-        text_response = data["candidates"][0]["content"]["parts"][0]["text"]
-        
-        # Clean the response - remove markdown code blocks if present
-        text_response = text_response.strip()
-        if text_response.startswith("```json"):
-            text_response = text_response[7:]
-        if text_response.endswith("```"):
-            text_response = text_response[:-3]
-        text_response = text_response.strip()
-        
-        enhanced = json.loads(text_response)
-        
-        # Validate the enhanced data has required fields
-        if not all(key in enhanced for key in ["enhanced_description", "enhanced_purpose", "type"]):
-            raise ValueError("Missing required fields in Gemini response")
-            
-        return enhanced
-        
+    enhanced = json.loads(text_response)
+
+    # Validate the enhanced data has required fields
+    if not all(key in enhanced for key in ["enhanced_description", "enhanced_purpose", "type"]):
+        raise ValueError("Missing required fields in Gemini response")
+
+    await enhancement_cache.set(cache_key, enhanced)
+    return enhanced
+
+
+async def enhance_with_gemini(description: str, purpose: str):
+    """
+    Same as request_gemini_enhancement, but returns the original data if Gemini fails.
+    Returns enhanced data without storing anything in database.
+    """
+    try:
+        return await request_gemini_enhancement(description, purpose)
     except Exception as e:
-        
-        # Return original data if Gemini fails
-        return {
-            "enhanced_description": description,
-            "enhanced_purpose": purpose,
-            "type": "General"
-        }
+        logger.warning(f"Gemini enhancement failed, keeping original text: {e}")
+        return _original_enhancement(description, purpose)
     
 # ----------------- Applications -----------------
 async def apply_join_club(application: JoinClubApplication, user_id: str):
@@ -227,7 +231,7 @@ async def apply_join_club(application: JoinClubApplication, user_id: str):
 async def apply_create_club(application, user_id: str):
     """
     Enhanced version of apply_create_club:
-    - Uses Gemini for enhancement.
+    - Queues Gemini enhancement as a background job.
     - Fetches leader/subleader details.
     - Validates leader/subleader existence.
     - Handles image_base64 field.
@@ -245,17 +249,10 @@ async def apply_create_club(application, user_id: str):
     if not subleader:
         raise HTTPException(status_code=404, detail=f"Subleader with USN {app_data.get('subleader_USN_id')} not found")
 
-    # ✅ 2. Enhance with Gemini
-    enhancement = await enhance_with_gemini(
-        description=app_data.get("description", ""),
-        purpose=app_data.get("purpose", "")
-    )
-
-    # ✅ 3. Merge enhanced data and leader/subleader info
+    # ✅ 2. Store original text; Gemini enhancement runs in the background
     app_data.update({
-        "description": enhancement.get("enhanced_description", app_data.get("description")),
-        "purpose": enhancement.get("enhanced_purpose", app_data.get("purpose")),
-        "type": enhancement.get("type", "General"),
+        "type": "General",
+        "enhancement_status": "pending",
         "leader_data": leader,
         "subleader_data": subleader,
         "applied_at": datetime.utcnow(),
@@ -263,10 +260,17 @@ async def apply_create_club(application, user_id: str):
         "image_base64": app_data.get("image_base64", "")  # Store image_base64 from application
     })
 
-    # ✅ 4. Insert into collection
+    # ✅ 3. Insert into collection
     result = await db["club_create_applications"].insert_one(app_data)
     inserted_app = await db["club_create_applications"].find_one({"_id": result.inserted_id})
 
+    # ✅ 4. Queue enhancement (updates description, purpose and type when done)
+    inserted_app["enhancement_job_id"] = await job_queue.enqueue(
+        "club.enhance_application",
+        {"application_id": str(result.inserted_id)},
+        owner_id=str(user_id)
+    )
+
     # ✅ 5. Format final response
     inserted_app["id"] = str(inserted_app["_id"])
     inserted_app["user_id"] = str(inserted_app["user_id"])
@@ -276,6 +280,41 @@ async def apply_create_club(application, user_id: str):
     
     return response_data
 
+async def enhancement_failed(payload: dict, error: str):
+    """Dead-letter hook: keep the original text and flag the application as not enhanced."""
+    await db[COLLECTION_CREATE].update_one(
+        {"_id": normalize_id(payload["application_id"])},
+        {"$set": {"enhancement_status": "failed", "enhancement_error": error}}
+    )
+
+
+@job_queue.task("club.enhance_application", max_attempts=3, visibility_timeout=90, on_dead=enhancement_failed)
+async def enhance_application_job(payload: dict):
+    """
+    Background job: enhance a club creation application with Gemini.
+    Gemini errors propagate so the queue retries; after the last attempt
+    enhancement_failed marks the application instead.
+    """
+    app_id = normalize_id(payload["application_id"])
+    app = await db[COLLECTION_CREATE].find_one({"_id": app_id}, {"description": 1, "purpose": 1})
+    if not app:
+        return {"skipped": "application no longer exists"}
+
+    enhancement = await request_gemini_enhancement(
+        description=app.get("description", ""),
+        purpose=app.get("purpose", "")
+    )
+    await db[COLLECTION_CREATE].update_one(
+        {"_id": app_id},
+        {"$set": {
+            "description": enhancement.get("enhanced_description", app.get("description")),
+            "purpose": enhancement.get("enhanced_purpose", app.get("purpose")),
+            "type": enhancement.get("type", "General"),
+            "enhancement_status": "completed",
+        }}
+    )
+    return {"type": enhancement.get("type", "General")}
+
 async def list_pending_club_applications():
     apps = []
     async for doc in db[COLLECTION_CREATE].find({}):
@@ -364,8 +403,9 @@ async def approve_club_application(application_id: str, admin_id: str):
     }
 
     # Insert into clubs collection
-    result_club = await db[COLLECTION].insert_one(club_doc)
+    result_club = await db[COLLECTION].insert_one(with_name_key(COLLECTION, club_doc))
     club_id = result_club.inserted_id
+    await chat_context.invalidate()
 
     # Remove the original application
     await db[COLLECTION_CREATE].delete_one({"_id": normalize_id(application_id)})
@@ -390,6 +430,7 @@ async def add_teacher(teacher: dict):
 
     teacher["club_id"] = normalize_id(teacher["club_id"])
     result = await db[COLLECTION_TEACHERS].insert_one(teacher)
+    await chat_context.invalidate()
     teacher["id"] = str(result.inserted_id)
     teacher["club_id"] = str(teacher["club_id"])
     return teacher
@@ -710,8 +751,9 @@ async def approve_application(app_id: str, user=Depends(require_role(["admin"]))
         }
         print(f"DEBUG: Prepared club document: {club_doc}")
 
-        result_club = await db[COLLECTION].insert_one(club_doc)
+        result_club = await db[COLLECTION].insert_one(with_name_key(COLLECTION, club_doc))
         club_id = result_club.inserted_id
+        await chat_context.invalidate()
         print(f"DEBUG: Inserted club into DB with id={club_id}")
 
         # Remove original application
@@ -9,6 +9,8 @@ import qrcode, io, base64
 from config.db import db
 from models.event_model import EventIn, EventOut, RegistrationOut
 from middleware.auth_middleware import require_role, get_current_user
+from utils.chat_context import chat_context
+from utils.name_lookup import with_name_key
 
 router = APIRouter(prefix="/api/events", tags=["events"])
 
@@ -87,7 +89,8 @@ async def create_event_route(event_in: EventIn):
     if event_data.get("clubId"):
         event_data["clubId"] = ObjectId(event_data["clubId"])
 
-    result = await db[COLLECTION_EVENTS].insert_one(event_data)
+    result = await db[COLLECTION_EVENTS].insert_one(with_name_key(COLLECTION_EVENTS, event_data))
+    await chat_context.invalidate()
     new_event = await db[COLLECTION_EVENTS].find_one({"_id": result.inserted_id})
     
     return {
@@ -123,7 +126,8 @@ async def update_event_route(event_id: str, event_in: EventIn, user=Depends(requ
     if update_data.get("clubId"):
         update_data["clubId"] = ObjectId(update_data["clubId"])
     
-    await db[COLLECTION_EVENTS].update_one({"_id": ObjectId(event_id)}, {"$set": update_data})
+    await db[COLLECTION_EVENTS].update_one({"_id": ObjectId(event_id)}, {"$set": with_name_key(COLLECTION_EVENTS, update_data)})
+    await chat_context.invalidate()
     updated_event = await db[COLLECTION_EVENTS].find_one({"_id": ObjectId(event_id)})
     
     return {
@@ -147,6 +151,7 @@ async def delete_event(event_id: str):
     result = await db[COLLECTION_EVENTS].delete_one({"_id": ObjectId(event_id)})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Event not found")
+    await chat_context.invalidate()
     return {"message": "Event deleted successfully"}
 
 # Event Registration
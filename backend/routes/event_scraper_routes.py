@@ -1,6 +1,5 @@
 # backend/routes/event_scraper_routes.py
 import asyncio
-import aiohttp
 from fastapi import APIRouter, HTTPException, Query
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
@@ -17,6 +16,7 @@ import urllib3
 from PIL import Image
 import io
 import base64
+from utils.http_client import http_clients
 
 # Disable SSL warnings for better scraping
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -30,28 +30,25 @@ logger = logging.getLogger(__name__)
 class ProfessionalEventScraper:
     def __init__(self):
         self.ua = UserAgent()
-        self.session = None
+        self.headers = None
         self.image_cache = {}
         
     async def __aenter__(self):
-        timeout = aiohttp.ClientTimeout(total=60)
-        self.session = aiohttp.ClientSession(
-            timeout=timeout, 
-            headers=self.get_headers(),
-            connector=aiohttp.TCPConnector(verify_ssl=False)
-        )
+        # Connections come from the shared scraper pool; only the headers are per scrape
+        self.headers = self.get_headers()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        self.image_cache.clear()
+
+    async def fetch(self, url: str):
+        return await http_clients.request("GET", url, profile="scraper", headers=self.headers or self.get_headers())
 
     def get_headers(self):
         return {
             'User-Agent': self.ua.random,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         }
@@ -62,20 +59,20 @@ class ProfessionalEventScraper:
             if url in self.image_cache:
                 return self.image_cache[url]
                 
-            async with self.session.get(url, ssl=False) as response:
-                if response.status == 200:
-                    image_data = await response.read()
-                    
-                    # Validate it's actually an image
-                    try:
-                        image = Image.open(io.BytesIO(image_data))
-                        # Convert to base64
-                        base64_image = base64.b64encode(image_data).decode('utf-8')
-                        self.image_cache[url] = base64_image
-                        return base64_image
-                    except Exception as e:
-                        logger.warning(f"Invalid image at {url}: {e}")
-                        return None
+            response = await self.fetch(url)
+            if response.status_code == 200:
+                image_data = response.content
+                
+                # Validate it's actually an image
+                try:
+                    image = Image.open(io.BytesIO(image_data))
+                    # Convert to base64
+                    base64_image = base64.b64encode(image_data).decode('utf-8')
+                    self.image_cache[url] = base64_image
+                    return base64_image
+                except Exception as e:
+                    logger.warning(f"Invalid image at {url}: {e}")
+                    return None
             return None
         except Exception as e:
             logger.error(f"Error downloading image {url}: {e}")
@@ -128,26 +125,26 @@ class ProfessionalEventScraper:
             # Use Meetup's API search endpoint
             search_url = f"https://www.meetup.com/find/events/?allMeetups=false&keywords={quote(query)}&radius=50"
             
-            async with self.session.get(search_url, ssl=False) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    events = []
-                    event_elements = soup.select('[data-testid*="event-card"], .event-listing, .event-card')
-                    
-                    for element in event_elements[:max_events]:
-                        try:
-                            event_data = await self.parse_meetup_event(element, query)
-                            if event_data:
-                                events.append(event_data)
-                        except Exception as e:
-                            logger.warning(f"Error parsing Meetup event: {e}")
-                            continue
-                    
-                    return events
-                else:
-                    return await self.generate_detailed_mock_events(query, "Meetup", max_events)
+            response = await self.fetch(search_url)
+            if response.status_code == 200:
+                html = response.text
+                soup = BeautifulSoup(html, 'html.parser')
+                
+                events = []
+                event_elements = soup.select('[data-testid*="event-card"], .event-listing, .event-card')
+                
+                for element in event_elements[:max_events]:
+                    try:
+                        event_data = await self.parse_meetup_event(element, query)
+                        if event_data:
+                            events.append(event_data)
+                    except Exception as e:
+                        logger.warning(f"Error parsing Meetup event: {e}")
+                        continue
+                
+                return events
+            else:
+                return await self.generate_detailed_mock_events(query, "Meetup", max_events)
         except Exception as e:
             logger.error(f"Error scraping Meetup: {e}")
             return await self.generate_detailed_mock_events(query, "Meetup", max_events)
@@ -203,26 +200,26 @@ class ProfessionalEventScraper:
         try:
             search_url = f"https://www.eventbrite.com/d/online/{quote(query)}--events/"
             
-            async with self.session.get(search_url, ssl=False) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    events = []
-                    event_elements = soup.select('[data-testid*="event-card"], .event-card, .search-event-card')
-                    
-                    for element in event_elements[:max_events]:
-                        try:
-                            event_data = await self.parse_eventbrite_event(element, query)
-                            if event_data:
-                                events.append(event_data)
-                        except Exception as e:
-                            logger.warning(f"Error parsing Eventbrite event: {e}")
-                            continue
-                    
-                    return events
-                else:
-                    return await self.generate_detailed_mock_events(query, "Eventbrite", max_events)
+            response = await self.fetch(search_url)
+            if response.status_code == 200:
+                html = response.text
+                soup = BeautifulSoup(html, 'html.parser')
+                
+                events = []
+                event_elements = soup.select('[data-testid*="event-card"], .event-card, .search-event-card')
+                
+                for element in event_elements[:max_events]:
+                    try:
+                        event_data = await self.parse_eventbrite_event(element, query)
+                        if event_data:
+                            events.append(event_data)
+                    except Exception as e:
+                        logger.warning(f"Error parsing Eventbrite event: {e}")
+                        continue
+                
+                return events
+            else:
+                return await self.generate_detailed_mock_events(query, "Eventbrite", max_events)
         except Exception as e:
             logger.error(f"Error scraping Eventbrite: {e}")
             return await self.generate_detailed_mock_events(query, "Eventbrite", max_events)
@@ -278,59 +275,59 @@ class ProfessionalEventScraper:
         try:
             search_url = f"https://www.google.com/search?q={quote(query + ' events 2024 tickets')}&tbm=nws"
             
-            async with self.session.get(search_url, ssl=False) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    events = []
-                    results = soup.select('.SoaBEf, .mnr-c, .g, .ZINbbc')
-                    
-                    for i, result in enumerate(results[:max_events]):
-                        try:
-                            title_elem = result.select_one('h3, .n0jPhd, .BNeawe')
-                            title = title_elem.get_text().strip() if title_elem else f"{query.title()} Event {i+1}"
-                            
-                            desc_elem = result.select_one('.f, .MUxGbd, .BNeawe')
-                            description = desc_elem.get_text() if desc_elem else f"Join our {query} event"
-                            
-                            link_elem = result.find('a')
-                            event_url = ""
-                            if link_elem and link_elem.get('href'):
-                                href = link_elem['href']
-                                if href.startswith('/url?q='):
-                                    event_url = href.split('/url?q=')[1].split('&')[0]
-                            
-                            start_date = (datetime.now() + timedelta(days=random.randint(1, 60))).isoformat()
-                            end_date = (datetime.now() + timedelta(days=random.randint(61, 90))).isoformat()
-                            
-                            # Generate appropriate image
-                            image_url = f"https://source.unsplash.com/400x200/?{query.replace(' ', ',')}"
-                            image_base64 = await self.download_image(image_url)
-                            
-                            event = {
-                                'event_name': title,
-                                'description': description,
-                                'start_date': start_date,
-                                'end_date': end_date,
-                                'venue': 'Various Locations',
-                                'apply_link': event_url,
-                                'event_details_link': event_url,
-                                'image_url': image_url,
-                                'image_base64': image_base64,
-                                'source': 'Google Search',
-                                'category': query.title(),
-                                'scraped_at': datetime.utcnow().isoformat(),
-                                'price': 'Free',
-                                'organizer': 'Various Organizers'
-                            }
-                            events.append(event)
-                        except Exception as e:
-                            continue
-                    
-                    return events
-                else:
-                    return await self.generate_detailed_mock_events(query, "Google", max_events)
+            response = await self.fetch(search_url)
+            if response.status_code == 200:
+                html = response.text
+                soup = BeautifulSoup(html, 'html.parser')
+                
+                events = []
+                results = soup.select('.SoaBEf, .mnr-c, .g, .ZINbbc')
+                
+                for i, result in enumerate(results[:max_events]):
+                    try:
+                        title_elem = result.select_one('h3, .n0jPhd, .BNeawe')
+                        title = title_elem.get_text().strip() if title_elem else f"{query.title()} Event {i+1}"
+                        
+                        desc_elem = result.select_one('.f, .MUxGbd, .BNeawe')
+                        description = desc_elem.get_text() if desc_elem else f"Join our {query} event"
+                        
+                        link_elem = result.find('a')
+                        event_url = ""
+                        if link_elem and link_elem.get('href'):
+                            href = link_elem['href']
+                            if href.startswith('/url?q='):
+                                event_url = href.split('/url?q=')[1].split('&')[0]
+                        
+                        start_date = (datetime.now() + timedelta(days=random.randint(1, 60))).isoformat()
+                        end_date = (datetime.now() + timedelta(days=random.randint(61, 90))).isoformat()
+                        
+                        # Generate appropriate image
+                        image_url = f"https://source.unsplash.com/400x200/?{query.replace(' ', ',')}"
+                        image_base64 = await self.download_image(image_url)
+                        
+                        event = {
+                            'event_name': title,
+                            'description': description,
+                            'start_date': start_date,
+                            'end_date': end_date,
+                            'venue': 'Various Locations',
+                            'apply_link': event_url,
+                            'event_details_link': event_url,
+                            'image_url': image_url,
+                            'image_base64': image_base64,
+                            'source': 'Google Search',
+                            'category': query.title(),
+                            'scraped_at': datetime.utcnow().isoformat(),
+                            'price': 'Free',
+                            'organizer': 'Various Organizers'
+                        }
+                        events.append(event)
+                    except Exception as e:
+                        continue
+                
+                return events
+            else:
+                return await self.generate_detailed_mock_events(query, "Google", max_events)
         except Exception as e:
             logger.error(f"Error scraping Google: {e}")
             return await self.generate_detailed_mock_events(query, "Google", max_events)
@@ -0,0 +1,18 @@
+# backend/routes/job_routes.py
+from fastapi import APIRouter, Depends, HTTPException
+from middleware.auth_middleware import get_current_user
+from utils.job_queue import job_queue, serialize_job
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+@router.get("/{job_id}")
+async def get_job_status(job_id: str, user=Depends(get_current_user)):
+    """Report progress of a background job. Users can only see jobs they started."""
+    job = await job_queue.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if user["role"] != "admin" and job.get("owner_id") != str(user["_id"]):
+        raise HTTPException(status_code=403, detail="Can only view your own jobs")
+
+    return serialize_job(job)
@@ -1,21 +1,29 @@
 # backend/routes/performance_routes.py
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Response
+from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
 from bson import ObjectId
 from typing import List, Optional
 from datetime import datetime
+import base64
+import json
 from config.db import db
 from models.performance_model import (
     PerformanceRecordIn, PerformanceRecordOut, PerformanceAnalytics,
     NotificationOut, PerformanceThreshold, AIPrediction, AIImprovementSuggestion,
-    PerformanceType, PerformanceLevel
+    PerformanceType, PerformanceLevel, CohortAnalytics, StudentRank, PerformanceTimeSeries
 )
 from middleware.auth_middleware import get_current_user, require_role
 from utils.performance_utils import (
     get_performance_thresholds, calculate_performance_level,
-    update_student_analytics_async, detect_low_performance
+    schedule_analytics_update, detect_low_performance
 )
 from utils.notification_utils import notification_service, create_performance_notification
 from utils.ai_utils import get_or_create_prediction, get_or_create_suggestions
+from utils.performance_import import import_performance_records, iter_upload_lines, detect_format
+from utils.cohort_analytics import get_cohort_analytics
+from utils.performance_rollups import apply_records_to_rollups, rebuild_rollups, get_student_timeseries, month_key
+from utils.percentile_ranks import rank_index, ALL_COHORT
 from utils.mock_performance_data import get_mock_performance_data, get_student_name
 
 router = APIRouter(prefix="/api/performance", tags=["performance"])
@@ -37,6 +45,29 @@ def serialize_record(record: dict) -> dict:
     record.pop("_id")
     return record
 
+def encode_cursor(values: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError("Malformed cursor")
+    if not isinstance(values, list):
+        raise ValueError("Malformed cursor")
+    return values
+
+def keyset_filter(sort_keys: List[str], last_values: list) -> dict:
+    """Mongo filter for rows strictly after `last_values` in ascending (k1, k2, ...) order."""
+    if len(sort_keys) != len(last_values):
+        raise ValueError("Cursor does not match sort order")
+    clauses = []
+    for i, key in enumerate(sort_keys):
+        clause = {sort_keys[j]: last_values[j] for j in range(i)}
+        clause[key] = {"$gt": last_values[i]}
+        clauses.append(clause)
+    return {"$or": clauses}
+
 # API Endpoints
 
 @router.post("/add", response_model=PerformanceRecordOut)
@@ -59,9 +90,10 @@ async def add_performance_record(
 
     result = await db[PERFORMANCE_COLLECTION].insert_one(record_data)
     created_record = await db[PERFORMANCE_COLLECTION].find_one({"_id": result.inserted_id})
+    await apply_records_to_rollups([created_record])
 
-    # Trigger analytics update
-    await update_student_analytics_async(record.student_id)
+    # Recompute analytics in the background
+    await schedule_analytics_update(record.student_id)
 
     # Check for low performance notification
     if level == PerformanceLevel.LOW:
@@ -74,6 +106,19 @@ async def add_performance_record(
 
     return PerformanceRecordOut(**serialize_record(created_record))
 
+@router.post("/import")
+async def import_performance_records_route(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    user=Depends(require_role(["admin", "club"]))
+):
+    """Bulk import records from a CSV (with header row) or NDJSON upload. Admin/Faculty only."""
+    fmt = format or detect_format(file.filename, file.content_type)
+    if not fmt:
+        raise HTTPException(status_code=400, detail="Could not detect file format; pass format=csv or format=ndjson")
+
+    return await import_performance_records(iter_upload_lines(file), fmt)
+
 @router.get("/student/{student_id}", response_model=List[PerformanceRecordOut])
 async def get_student_performance(
     student_id: str,
@@ -110,25 +155,93 @@ async def get_student_performance(
 
     return records
 
+@router.get("/timeseries/{student_id}", response_model=PerformanceTimeSeries)
+async def get_performance_timeseries(
+    student_id: str,
+    months: int = Query(48, ge=1, le=120),
+    type: Optional[PerformanceType] = None,
+    category: Optional[str] = None,
+    user=Depends(get_current_user)
+):
+    """Monthly count/average/min/max for a student, served from rollups only."""
+    if user["role"] not in ["admin", "club"] and student_id != str(user["_id"]):
+        raise HTTPException(status_code=403, detail="Can only view your own performance records")
+
+    points = await get_student_timeseries(student_id, months, type.value if type else None, category)
+    return PerformanceTimeSeries(student_id=student_id, type=type, category=category, points=points)
+
 @router.get("/analytics", response_model=List[PerformanceAnalytics])
 async def get_performance_analytics(
+    response: Response,
     student_id: Optional[str] = None,
+    level: Optional[PerformanceLevel] = None,
+    trend: Optional[str] = None,
+    department: Optional[str] = None,
+    sort: str = Query("risk", pattern="^(risk|student_id)$"),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
     user=Depends(require_role(["admin", "club"]))
 ):
-    """Get performance analytics. Admin/Faculty can view all or specific student."""
+    """
+    Get performance analytics. Admin/Faculty can view all or specific student.
+    Results are filtered server-side, sorted by risk (low level, declining
+    trend and low average first) and paginated with a keyset cursor returned
+    in the X-Next-Cursor header.
+    """
     query = {}
     if student_id:
         query["student_id"] = student_id
-
-    cursor = db[ANALYTICS_COLLECTION].find(query)
-    analytics = []
-    async for analytic in cursor:
-        analytic["id"] = str(analytic["_id"])
-        analytic.pop("_id")
-        analytics.append(PerformanceAnalytics(**analytic))
-
-    # If no real analytics exist, return mock data
-    if not analytics:
+    if level:
+        query["performance_level"] = level.value
+    if trend:
+        query["trend"] = trend
+    if department:
+        query["department"] = department
+
+    sort_keys = ["risk_score", "student_id"] if sort == "risk" else ["student_id"]
+    filtered = any(v is not None for v in (level, trend, department, cursor))
+    if cursor:
+        try:
+            query.update(keyset_filter(sort_keys, decode_cursor(cursor)))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    projection = None
+    if fields:
+        requested = {f.strip() for f in fields.split(",") if f.strip()}
+        unknown = requested - set(PerformanceAnalytics.model_fields)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+        # Always fetch what sorting, paging and percentiles need
+        projection = {f: 1 for f in requested | set(sort_keys) | {"overall_average", "department"}}
+
+    docs = await db[ANALYTICS_COLLECTION].find(query, projection).sort(
+        [(key, 1) for key in sort_keys]
+    ).limit(limit + 1).to_list(limit + 1)
+
+    headers = {}
+    if len(docs) > limit:
+        docs = docs[:limit]
+        headers["X-Next-Cursor"] = encode_cursor([docs[-1].get(key) for key in sort_keys])
+        response.headers.update(headers)
+
+    if docs:
+        await rank_index.ensure_built()
+        for doc in docs:
+            doc.pop("_id", None)
+            position = rank_index.describe(doc.get("overall_average", 0), doc.get("department"))
+            doc["percentile"] = position["percentile"]
+            doc["percentile_cohort"] = position["cohort"]
+
+    if projection is not None:
+        items = [{k: v for k, v in doc.items() if k in requested} for doc in docs]
+        return JSONResponse(jsonable_encoder(items), headers=headers)
+
+    analytics = [PerformanceAnalytics(**doc) for doc in docs]
+
+    # If no real analytics exist (and nothing was filtered out), return mock data
+    if not analytics and not filtered:
         if student_id:
             # Return analytics for specific student
             mock_data = get_mock_performance_data(student_id)
@@ -136,16 +249,84 @@ async def get_performance_analytics(
         else:
             # For admin view, return mock data for multiple students (at least 11)
             mock_student_ids = [f"student_{i:03d}" for i in range(1, 16)]  # 15 students
-            analytics = []
-            for student_id in mock_student_ids:
-                mock_data = get_mock_performance_data(student_id)
+            for mock_student_id in mock_student_ids:
+                mock_data = get_mock_performance_data(mock_student_id)
                 analytics_data = mock_data["analytics"]
                 # Add student name to the analytics
-                analytics_data["student_name"] = get_student_name(student_id)
+                analytics_data["student_name"] = get_student_name(mock_student_id)
                 analytics.append(PerformanceAnalytics(**analytics_data))
 
     return analytics
 
+@router.get("/cohorts", response_model=CohortAnalytics)
+async def get_cohort_performance(
+    group_by: str = Query("department", pattern="^(department|student_year|semester|year|category|type)$"),
+    type: Optional[PerformanceType] = None,
+    user=Depends(require_role(["admin", "club"]))
+):
+    """
+    Cohort statistics (mean, median, p10/p90, histogram, level counts).
+    Department and student_year (year of study) cohorts are built from
+    per-student averages; the other groupings use individual record scores
+    and can be filtered by type.
+    """
+    return await get_cohort_analytics(group_by, type.value if type else None)
+
+@router.get("/rankings", response_model=List[StudentRank])
+async def get_rankings(
+    cohort: str = ALL_COHORT,
+    order: str = Query("top", pattern="^(top|bottom)$"),
+    n: int = Query(10, ge=1, le=100),
+    user=Depends(require_role(["admin", "club"]))
+):
+    """Top or bottom N students of a cohort ("all" or "department:<name>")."""
+    await rank_index.ensure_built()
+    ranks = rank_index.get(cohort)
+    if ranks is None:
+        raise HTTPException(status_code=404, detail="Cohort not found")
+
+    entries = ranks.top(n) if order == "top" else ranks.bottom(n)
+    return [
+        StudentRank(
+            student_id=student_id,
+            overall_average=score,
+            rank=ranks.rank(score),
+            percentile=ranks.percentile(score),
+            cohort=cohort,
+            cohort_size=len(ranks),
+        )
+        for student_id, score in entries
+    ]
+
+@router.get("/rank/{student_id}", response_model=StudentRank)
+async def get_student_rank(
+    student_id: str,
+    user=Depends(get_current_user)
+):
+    """Where a student stands within their department (or campus-wide)."""
+    if user["role"] not in ["admin", "club"] and student_id != str(user["_id"]):
+        raise HTTPException(status_code=403, detail="Can only view your own rank")
+
+    analytic = await db[ANALYTICS_COLLECTION].find_one(
+        {"student_id": student_id}, {"overall_average": 1, "department": 1, "total_records": 1}
+    )
+    if not analytic or not analytic.get("total_records"):
+        raise HTTPException(status_code=404, detail="No analytics for this student yet")
+
+    await rank_index.ensure_built()
+    position = rank_index.describe(analytic["overall_average"], analytic.get("department"))
+    if position["rank"] is None:
+        raise HTTPException(status_code=404, detail="Rankings are not available yet")
+
+    return StudentRank(
+        student_id=student_id,
+        overall_average=analytic["overall_average"],
+        rank=position["rank"],
+        percentile=position["percentile"],
+        cohort=position["cohort"],
+        cohort_size=position["cohort_size"],
+    )
+
 @router.put("/update/{record_id}", response_model=PerformanceRecordOut)
 async def update_performance_record(
     record_id: str,
@@ -173,7 +354,8 @@ async def update_performance_record(
     )
 
     updated = await db[PERFORMANCE_COLLECTION].find_one({"_id": ObjectId(record_id)})
-    await update_student_analytics_async(existing["student_id"])
+    await rebuild_rollups(student_id=existing["student_id"], months=[month_key(existing["created_at"])])
+    await schedule_analytics_update(existing["student_id"])
 
     return PerformanceRecordOut(**serialize_record(updated))
 
@@ -1,58 +1,113 @@
 from fastapi import APIRouter, Depends, HTTPException
+from cachetools import TTLCache
 from config.db import db
-import google.generativeai as genai
+import json
+import logging
 import os
 from utils.id_util import normalize_id
+from utils.llm_client import gemini_generate
+from utils.llm_cache import content_hash
+from utils.chat_context import chat_context
+from utils.search_index import build_search_indexes, club_text, event_text
+from utils.text_keys import tokenize
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/recommendations", tags=["recommendations"])
 
-# Configure Gemini
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+
+TOP_K = 5
+# Only what the scoring uses; never the password hash or images
+PROFILE_FIELDS = {"_id": 0, "department": 1, "year": 1, "skills": 1, "interests": 1, "achievements": 1}
+MATCH_FIELDS = ("skills", "interests", "achievements")
+DESCRIPTION_CHARS = 240
+
+# Per-student results; the context version in the key drops them after any club/event write
+recommendation_cache = TTLCache(
+    maxsize=int(os.getenv("RECOMMENDATION_CACHE_SIZE", 4096)),
+    ttl=int(os.getenv("RECOMMENDATION_CACHE_TTL_SECONDS", 900)),
+)
 
 async def get_student_profile(USN_id: str):
-    student = await db.users.find_one({"_id": normalize_id(USN_id), "role": "student"})
+    student = await db.users.find_one({"_id": normalize_id(USN_id), "role": "student"}, {"name": 1})
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
-    return student
+    profile = await db.student_profiles.find_one({"user_id": student["_id"]}, PROFILE_FIELDS) or {}
+    return {"id": str(student["_id"]), "name": student.get("name"), **profile}
 
-async def fetch_context():
-    clubs = await db.clubs.find({"approved": True}).to_list(100)
-    events = await db.events.find({}).to_list(100)
-    return clubs, events
+async def generate_recommendation(prompt: str, fallback: str) -> str:
+    """Have Gemini phrase the ranked list; the local text is used if it is unavailable."""
+    if not GEMINI_API_KEY:
+        return fallback
+    try:
+        return await gemini_generate(prompt, GEMINI_API_KEY, "gemini-pro")
+    except Exception as e:
+        logger.error(f"Gemini recommendation failed: {e}")
+        return fallback
 
-@router.get("/clubs/{USN_id}")
-async def recommend_clubs(USN_id: str):
-    student = await get_student_profile(USN_id)
-    clubs, events = await fetch_context()
-
-    # Prepare context for Gemini
-    prompt = f"""
-    You are an AI advisor. Suggest the best clubs for this student.
-    Student Profile: {student}
-    Clubs Available: {clubs}
-    Respond with a short explanation.
-    """
+def profile_terms(student: dict) -> list:
+    terms = []
+    for field in MATCH_FIELDS:
+        terms += [str(value) for value in student.get(field) or []]
+    return terms
 
-    model = genai.GenerativeModel("gemini-pro")
-    response = model.generate_content(prompt)
-    text = response.text if hasattr(response, "text") else "No recommendation found."
+def rank(kind: str, student: dict, snapshot) -> list:
+    """Top items by TF-IDF similarity between their text and the student's skills, interests and achievements."""
+    terms = profile_terms(student)
+    if not terms:
+        return []
+    index = snapshot.derived("search_index", build_search_indexes)[kind]
+    where = (lambda club: club.get("approved") is True) if kind == "club" else None
+    student_tokens = set(tokenize(" ".join(terms)))
+    text = club_text if kind == "club" else event_text
+    ranked = []
+    for score, item in index.search(" ".join(terms), TOP_K, where=where):
+        matched = [token for token in tokenize(text(item)) if token in student_tokens]
+        fields = ("name", "description") if kind == "club" else ("title", "description", "date", "venue", "clubName")
+        ranked.append({
+            **{field: item.get(field) for field in fields},
+            "description": (item.get("description") or "")[:DESCRIPTION_CHARS],
+            "score": round(score, 3),
+            "matched": list(dict.fromkeys(matched))[:3],
+        })
+    return ranked
 
-    return {"recommendations": text}
+def describe(kind: str, ranked: list) -> str:
+    if not ranked:
+        return f"No {kind}s match your profile yet. Add skills and interests to your profile to get recommendations."
+    label = "name" if kind == "club" else "title"
+    parts = [f"{item[label]} (matches {', '.join(item['matched'])})" if item["matched"] else item[label] for item in ranked]
+    return f"Recommended {kind}s for you: " + "; ".join(parts) + "."
 
-@router.get("/events/{USN_id}")
-async def recommend_events(USN_id: str):
+async def recommend(kind: str, USN_id: str, phrase: bool) -> dict:
     student = await get_student_profile(USN_id)
-    clubs, events = await fetch_context()
+    snapshot = await chat_context.get()
+    key = (kind, student["id"], content_hash(student), snapshot.version, phrase)
+    cached = recommendation_cache.get(key)
+    if cached is not None:
+        return cached
 
-    prompt = f"""
-    You are an AI event recommender. Suggest suitable events for this student.
-    Student Profile: {student}
-    Events Available: {events}
-    Respond with a short explanation.
+    ranked = rank(kind, student, snapshot)
+    text = describe(kind, ranked)
+    if phrase and ranked:
+        # The LLM only rewords the ranked list; it gets the matched fields and item summaries
+        profile = {field: student[field] for field in MATCH_FIELDS if student.get(field)}
+        prompt = f"""
+    You are an AI advisor. In a short, friendly paragraph, explain why these {kind}s suit this student.
+    Student Profile: {json.dumps(profile)}
+    Recommended {kind.capitalize()}s (best first): {json.dumps(ranked, default=str)}
     """
+        text = await generate_recommendation(prompt, text)
 
-    model = genai.GenerativeModel("gemini-pro")
-    response = model.generate_content(prompt)
-    text = response.text if hasattr(response, "text") else "No recommendation found."
+    result = {"recommendations": text, f"{kind}s": ranked}
+    recommendation_cache[key] = result
+    return result
 
-    return {"recommendations": text}
+@router.get("/clubs/{USN_id}")
+async def recommend_clubs(USN_id: str, phrase: bool = False):
+    return await recommend("club", USN_id, phrase)
+
+@router.get("/events/{USN_id}")
+async def recommend_events(USN_id: str, phrase: bool = False):
+    return await recommend("event", USN_id, phrase)
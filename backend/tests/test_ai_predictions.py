@@ -0,0 +1,123 @@
+# backend/tests/test_ai_predictions.py
+from datetime import datetime
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from utils.ai_utils import build_predictions, fit_linear_trends
+
+
+class TestVectorizedTrends:
+    """Test the batched per-student regression against sklearn"""
+
+    def test_matches_linear_regression_per_group(self):
+        rng = np.random.default_rng(0)
+        groups = np.repeat(np.arange(4), [5, 8, 3, 12])
+        x = np.concatenate([np.sort(rng.integers(0, 200, n)) for n in [5, 8, 3, 12]]).astype(float)
+        y = rng.uniform(40, 100, len(x))
+
+        fits = fit_linear_trends(groups, x, y)
+        for code in range(4):
+            mask = groups == code
+            model = LinearRegression().fit(x[mask].reshape(-1, 1), y[mask])
+            assert np.isclose(fits["slope"][code], model.coef_[0])
+            assert np.isclose(fits["intercept"][code], model.intercept_)
+            assert np.isclose(fits["r_squared"][code], model.score(x[mask].reshape(-1, 1), y[mask]))
+
+    def test_degenerate_series(self):
+        groups = np.array([0, 0, 0, 1, 1, 1])
+        x = np.array([0, 0, 0, 0, 10, 20], dtype=float)
+        y = np.array([50, 60, 70, 80, 80, 80], dtype=float)
+        fits = fit_linear_trends(groups, x, y)
+        # Same-day records: flat line through the mean
+        assert fits["slope"][0] == 0 and np.isclose(fits["intercept"][0], 60)
+        # Constant scores fit perfectly
+        assert fits["r_squared"][1] == 1.0
+
+    def test_build_predictions_skips_sparse_students(self):
+        groups = np.array([0, 0, 1, 1, 1])
+        x = np.array([0, 5, 0, 10, 20], dtype=float)
+        y = np.array([70, 72, 60, 70, 80], dtype=float)
+        predictions = build_predictions(["a", "b"], groups, x, y, datetime.utcnow())
+        assert [p.student_id for p in predictions] == ["b"]
+        assert predictions[0].trend == "improving"
+        assert predictions[0].predicted_score == 100.0
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.docs:
+            yield doc
+
+    async def to_list(self, length):
+        return list(self.docs)
+
+
+class _LatestCollection:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def aggregate(self, pipeline, allowDiskUse=False):
+        return _Cursor([{"_id": "s1", "ids": [d["_id"] for d in self.docs], "count": len(self.docs)}])
+
+    def find(self, query):
+        return _Cursor([d for d in self.docs if d["_id"] in query["_id"]["$in"]])
+
+    async def delete_many(self, query):
+        before = len(self.docs)
+        self.docs = [d for d in self.docs if d["_id"] not in query["_id"]["$in"]]
+        return type("Result", (), {"deleted_count": before - len(self.docs)})()
+
+
+class _HistoryCollection:
+    def __init__(self, error_code):
+        self.error_code = error_code
+
+    async def insert_many(self, docs, ordered=True):
+        from pymongo.errors import BulkWriteError
+        raise BulkWriteError({"writeErrors": [{"index": 0, "code": self.error_code}]})
+
+
+class _DedupeDB:
+    def __init__(self, error_code):
+        self.latest = _LatestCollection([{"_id": 2, "student_id": "s1"}, {"_id": 1, "student_id": "s1"}])
+        self.history = _HistoryCollection(error_code)
+
+    def __getitem__(self, name):
+        return self.history if name.endswith("_history") else self.latest
+
+
+class TestDedupeLatest:
+    """Test the startup cleanup that precedes the unique student_id index"""
+
+    @pytest.mark.asyncio
+    async def test_already_archived_copies_are_ignored(self, monkeypatch):
+        import utils.ai_utils as ai_utils
+
+        fake = _DedupeDB(error_code=11000)
+        monkeypatch.setattr(ai_utils, "db", fake)
+        monkeypatch.setenv("AI_HISTORY_ENABLED", "true")
+
+        await ai_utils._dedupe_latest("ai_predictions")
+        assert [d["_id"] for d in fake.latest.docs] == [2]
+
+    @pytest.mark.asyncio
+    async def test_other_write_errors_still_fail(self, monkeypatch):
+        import utils.ai_utils as ai_utils
+        from pymongo.errors import BulkWriteError
+
+        fake = _DedupeDB(error_code=121)
+        monkeypatch.setattr(ai_utils, "db", fake)
+        monkeypatch.setenv("AI_HISTORY_ENABLED", "true")
+
+        with pytest.raises(BulkWriteError):
+            await ai_utils._dedupe_latest("ai_predictions")
+        # Nothing is deleted before its history copy exists
+        assert len(fake.latest.docs) == 2
@@ -0,0 +1,108 @@
+# backend/tests/test_chat_answers.py
+from types import SimpleNamespace
+
+import pytest
+
+import utils.llm_cache as llm_cache_module
+from utils.chat_answers import ChatAnswerCache, normalize_question
+from utils.chat_context import ContextSnapshot
+from utils.llm_cache import LLMCache
+
+
+class _NoStore:
+    """Mongo stand-in that never has an entry, so only the in-process layer answers."""
+
+    def __getitem__(self, name):
+        return self
+
+    async def find_one_and_update(self, *args, **kwargs):
+        return None
+
+    async def replace_one(self, *args, **kwargs):
+        pass
+
+
+class _FakeCompletions:
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, model, messages):
+        self.calls += 1
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content='{"message": "Clubs meet on Fridays."}'))],
+            usage=SimpleNamespace(total_tokens=120),
+        )
+
+
+class _FakeContext:
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    async def get(self):
+        return self.snapshot
+
+
+@pytest.fixture
+def answer_cache(monkeypatch):
+    monkeypatch.setattr(llm_cache_module, "db", _NoStore())
+    return ChatAnswerCache(LLMCache("chat_answers_test", ttl_seconds=60, max_entries=10), cost_per_1k_tokens=0.5)
+
+
+class TestChatAnswerCache:
+    """Test question normalization and savings accounting"""
+
+    def test_normalize_question(self):
+        assert normalize_question("How do I join a CLUB?") == normalize_question("how do i join a club")
+
+    @pytest.mark.asyncio
+    async def test_savings_counters(self, answer_cache):
+        key = answer_cache.key("general", "how do i join a club", "v1")
+        assert await answer_cache.get(key) is None
+        answer_cache.record_call(2.0, tokens=100)
+        await answer_cache.set(key, "Ask the club lead.")
+
+        assert await answer_cache.get(key) == "Ask the club lead."
+        assert await answer_cache.get(key) == "Ask the club lead."
+        metrics = answer_cache.get_metrics()
+        assert metrics["saved_calls"] == 2
+        assert metrics["saved_seconds"] == 4.0
+        assert metrics["saved_tokens"] == 200
+        assert metrics["saved_cost_usd"] == 0.1
+
+    def test_context_version_is_part_of_the_key(self, answer_cache):
+        assert answer_cache.key("general", "q", "v1") != answer_cache.key("general", "q", "v2")
+
+
+class TestChatbotAnswerCaching:
+    """Test that query_chatbot reuses answers until the context changes"""
+
+    @pytest.mark.asyncio
+    async def test_repeat_question_skips_the_llm(self, answer_cache, monkeypatch):
+        import routes.chatbot_routes as chatbot_routes
+
+        completions = _FakeCompletions()
+        snapshot = ContextSnapshot([], [], [], [], stamp=0)
+        context = _FakeContext(snapshot)
+
+        async def no_log(*args):
+            pass
+
+        monkeypatch.setattr(chatbot_routes, "chat_context", context)
+        monkeypatch.setattr(chatbot_routes, "chat_answer_cache", answer_cache)
+        monkeypatch.setattr(chatbot_routes, "log_chat", no_log)
+        monkeypatch.setattr(chatbot_routes, "get_chat_client", lambda: SimpleNamespace(
+            chat=SimpleNamespace(completions=completions)
+        ))
+
+        request = chatbot_routes.ChatRequest(user_id="u1", question="When do clubs meet?")
+        first = await chatbot_routes.query_chatbot(request)
+        second = await chatbot_routes.query_chatbot(
+            chatbot_routes.ChatRequest(user_id="u2", question="when do clubs meet")
+        )
+        assert first["message"] == second["message"] == "Clubs meet on Fridays."
+        assert completions.calls == 1
+
+        # New data means a new snapshot version and a fresh answer
+        context.snapshot = ContextSnapshot([{"name": "Chess Club"}], [], [], [], stamp=1)
+        await chatbot_routes.query_chatbot(request)
+        assert completions.calls == 2
@@ -0,0 +1,186 @@
+# backend/tests/test_chat_context.py
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+
+import utils.cache_versions as cache_versions
+import utils.chat_context as chat_context_module
+from utils.chat_context import ChatContextCache
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length):
+        return [dict(d) for d in self.docs[:length]]
+
+
+class _Collection:
+    def __init__(self, db, docs):
+        self.db, self.docs = db, docs
+
+    def find(self, query=None, projection=None):
+        self.db.queries += 1
+        return _Cursor(self.docs)
+
+
+class _VersionCollection:
+    def __init__(self):
+        self.version = 0
+
+    async def find_one(self, query):
+        return {"version": self.version} if self.version else None
+
+    async def update_one(self, query, update, upsert=False):
+        self.version += 1
+
+
+class _FakeDB:
+    def __init__(self):
+        self.queries = 0
+        self.versions = _VersionCollection()
+        self.clubs = _Collection(self, [{"name": "Robotics Club", "description": "Build robots"}])
+        self.events = _Collection(self, [{"title": "Hackathon", "venue": "Hall A"}])
+        self.teachers = _Collection(self, [{"name": "Dr. Rao", "department": "CSE"}])
+        self.users = _Collection(self, [{"name": "Asha"}])
+
+    def __getitem__(self, name):
+        return self.versions
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    fake = _FakeDB()
+    monkeypatch.setattr(chat_context_module, "db", fake)
+    monkeypatch.setattr(cache_versions, "db", fake)
+    return fake
+
+
+class TestChatContextCache:
+    """Test the chatbot context snapshot lifecycle"""
+
+    @pytest.mark.asyncio
+    async def test_messages_reuse_the_snapshot(self, fake_db):
+        cache = ChatContextCache(ttl_seconds=300, stamp_check_seconds=300)
+        first = await cache.get()
+        queries = fake_db.queries
+        for _ in range(5):
+            assert await cache.get() is first
+        assert fake_db.queries == queries
+        assert first.context["clubs"][0]["name"] == "Robotics Club"
+
+    @pytest.mark.asyncio
+    async def test_local_write_invalidates(self, fake_db):
+        cache = ChatContextCache(ttl_seconds=300, stamp_check_seconds=300)
+        first = await cache.get()
+        fake_db.clubs.docs.append({"name": "Chess Club", "description": "Play chess"})
+        await cache.invalidate()
+
+        second = await cache.get()
+        assert second is not first
+        assert second.version != first.version
+        assert len(second.clubs) == 2
+
+    @pytest.mark.asyncio
+    async def test_write_in_another_worker_is_noticed(self, fake_db):
+        cache = ChatContextCache(ttl_seconds=300, stamp_check_seconds=0)
+        first = await cache.get()
+        await cache_versions.bump_version(chat_context_module.CONTEXT_VERSION_KEY)
+        assert await cache.get() is not first
+
+    @pytest.mark.asyncio
+    async def test_version_depends_only_on_content(self, fake_db):
+        first = await ChatContextCache().get()
+        second = await ChatContextCache().get()
+        assert first.version == second.version
+
+    @pytest.mark.asyncio
+    async def test_derived_structures_follow_the_snapshot(self, fake_db):
+        cache = ChatContextCache(ttl_seconds=300, stamp_check_seconds=300)
+        builds = []
+
+        def build(snapshot):
+            builds.append(snapshot.version)
+            return [club["name"] for club in snapshot.clubs]
+
+        snapshot = await cache.get()
+        assert snapshot.derived("names", build) == ["Robotics Club"]
+        assert snapshot.derived("names", build) == ["Robotics Club"]
+        await cache.invalidate()
+        (await cache.get()).derived("names", build)
+        assert len(builds) == 2
+
+    @pytest.mark.asyncio
+    async def test_refresh_errors_serve_previous_snapshot(self, fake_db, monkeypatch):
+        cache = ChatContextCache(ttl_seconds=0, stamp_check_seconds=300)
+        first = await cache.get()
+
+        async def broken_load(stamp):
+            raise RuntimeError("database unavailable")
+
+        monkeypatch.setattr(cache, "load", broken_load)
+        assert await cache.get() is first
+        assert cache.metrics["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_registered_structures_are_built_on_refresh(self, fake_db):
+        cache = ChatContextCache()
+        cache.register_derived("club_count", lambda snapshot: len(snapshot.clubs))
+        snapshot = await cache.refresh()
+        assert snapshot._derived == {"club_count": 1}
+
+
+class _ApprovalCollection:
+    def __init__(self):
+        self.club = {
+            "_id": ObjectId(), "name": "Robotics Club", "created_by": ObjectId(),
+            "created_at": datetime(2025, 1, 1), "approved": False,
+        }
+
+    async def find_one(self, query):
+        return dict(self.club)
+
+    async def update_one(self, query, update):
+        self.club.update(update["$set"])
+        return SimpleNamespace(modified_count=1)
+
+
+class _ApprovalDB:
+    def __init__(self):
+        self.clubs = self.events = _ApprovalCollection()
+
+    def __getitem__(self, name):
+        return self.clubs
+
+
+class _RecordingContext:
+    def __init__(self):
+        self.invalidations = 0
+
+    async def invalidate(self):
+        self.invalidations += 1
+
+
+class TestApprovalInvalidates:
+    """Test that approving or rejecting clubs/events refreshes the chat context"""
+
+    @pytest.mark.asyncio
+    async def test_approval_routes_invalidate(self, monkeypatch):
+        import routes.admin_routes as admin_routes
+        import routes.club_routes as club_routes
+
+        fake = _ApprovalDB()
+        context = _RecordingContext()
+        for module in (club_routes, admin_routes):
+            monkeypatch.setattr(module, "db", fake)
+            monkeypatch.setattr(module, "chat_context", context)
+        club_id = str(fake.clubs.club["_id"])
+
+        await club_routes.approve_club(club_id)
+        await club_routes.reject_club(club_id)
+        await admin_routes.approve_club(club_id)
+        await admin_routes.approve_event(club_id)
+        assert context.invalidations == 4
@@ -0,0 +1,108 @@
+# backend/tests/test_chat_intents.py
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils.chat_context import ContextSnapshot
+from utils.chat_intents import OPEN, IntentClassifier
+from utils.entity_matcher import EntityMatcher
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return IntentClassifier()
+
+
+@pytest.fixture
+def matcher():
+    return EntityMatcher({"club": ["Robotics Club", "Coding Club"], "event": ["Hackathon 2025"]})
+
+
+class TestIntentClassifier:
+    """Test intent and slot detection for structured chatbot questions"""
+
+    def test_structured_intents(self, classifier, matcher):
+        assert classifier.classify("list upcoming events", matcher).intent == "upcoming_events"
+        assert classifier.classify("What clubs are there?", matcher).intent == "list_clubs"
+
+        result = classifier.classify("Who teaches the robotics club?", matcher)
+        assert result.intent == "club_teachers"
+        assert result.slots == {"club": "Robotics Club"}
+
+        assert classifier.classify("When is Hackathon 2025?", matcher).intent == "event_when"
+        assert classifier.classify("where is hackathon 2025 held", matcher).intent == "event_where"
+
+    def test_open_questions_go_to_the_llm(self, classifier, matcher):
+        assert classifier.classify("How do I become a better programmer?", matcher).intent == OPEN
+        assert classifier.classify("Tell me about the coding club", matcher).intent == OPEN
+
+    @pytest.mark.parametrize("question", [
+        "who is the president of Robotics Club",
+        "who is the secretary of robotics club",
+        "is Hackathon 2025 free",
+        "does hackathon 2025 cost anything",
+        "list past events",
+        "show previous events",
+        "what events did I attend last week",
+    ])
+    def test_lookalike_questions_go_to_the_llm(self, classifier, matcher, question):
+        assert classifier.classify(question, matcher).intent == OPEN
+
+    def test_intent_needs_a_cue_word(self, matcher):
+        # A model that calls every club question a teacher question is still held back
+        eager = IntentClassifier([("who <club>", "club_teachers"), ("hello there", OPEN)], threshold=0.0)
+        assert eager.classify("who teaches robotics club", matcher).intent == "club_teachers"
+        assert eager.classify("who is the president of robotics club", matcher).intent == OPEN
+        assert eager.classify("who sits in robotics club", matcher).intent == OPEN
+
+    def test_missing_slot_is_open(self, classifier, matcher):
+        # Shaped like an event question but names no known event
+        assert classifier.classify("when is the dance night", matcher).intent == OPEN
+
+    def test_delexicalize_skips_overlapping_spans(self):
+        tokens = ["is", "robotics", "club", "at", "hackathon", "2025"]
+        spans = {"club": (1, 2, "Robotics Club"), "event": (4, 2, "Hackathon 2025")}
+        assert IntentClassifier.delexicalize(tokens, spans) == ["is", "<club>", "at", "<event>"]
+        overlapping = {"club": (1, 2, "Robotics Club"), "event": (2, 1, "Club")}
+        assert IntentClassifier.delexicalize(tokens, overlapping) == ["is", "robotics", "<event>", "at", "hackathon", "2025"]
+
+
+class TestLocalAnswers:
+    """Test templated answers served without an LLM call"""
+
+    @pytest.mark.asyncio
+    async def test_upcoming_events_from_snapshot(self):
+        from routes.chatbot_routes import answer_locally
+
+        now = datetime.utcnow()
+        events = [
+            {"title": "Past Talk", "date": now - timedelta(days=1), "venue": "Hall A"},
+            {"title": "Robotics Expo", "date": now + timedelta(days=2), "venue": "Hall B"},
+            {"title": "Hackathon 2025", "date": now + timedelta(days=1), "venue": "Lab 1"},
+        ]
+        snapshot = ContextSnapshot([], events, [], [], stamp=0)
+
+        answer = await answer_locally("list upcoming events", snapshot)
+        assert list(answer["events"]) == ["Hackathon 2025", "Robotics Expo"]
+        assert answer["message"].startswith("Upcoming events: Hackathon 2025 on ")
+        assert "Past Talk" not in answer["message"]
+
+    @pytest.mark.asyncio
+    async def test_event_when_uses_event_details(self, monkeypatch):
+        import routes.chatbot_routes as chatbot_routes
+
+        async def fake_details(title):
+            return {"title": title, "date": "2025-03-01T10:00:00", "venue": "Main Hall"}
+
+        monkeypatch.setattr(chatbot_routes, "fetch_event_details", fake_details)
+        snapshot = ContextSnapshot([], [{"title": "Hackathon 2025"}], [], [], stamp=0)
+
+        answer = await chatbot_routes.answer_locally("When is Hackathon 2025?", snapshot)
+        assert answer["message"] == "Hackathon 2025 is on Sat 01 Mar 2025, 10:00 AM at Main Hall."
+
+    @pytest.mark.asyncio
+    async def test_open_question_has_no_local_answer(self):
+        from routes.chatbot_routes import answer_locally
+
+        snapshot = ContextSnapshot([{"name": "Chess Club"}], [], [], [], stamp=0)
+        assert await answer_locally("When do clubs meet?", snapshot) is None
@@ -0,0 +1,149 @@
+# backend/tests/test_chat_log.py
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+import utils.chat_log as chat_log_module
+from utils.chat_log import ChatLogWriter, archive_old_chat_logs
+
+
+class _FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def limit(self, n):
+        self.docs = self.docs[:n]
+        return self
+
+    async def to_list(self, length):
+        return list(self.docs)
+
+
+class _FakeCollection:
+    def __init__(self):
+        self.docs = {}
+        self.insert_calls = 0
+        self.fail_next = None
+
+    async def insert_many(self, docs, ordered=True):
+        self.insert_calls += 1
+        if self.fail_next:
+            error, self.fail_next = self.fail_next, None
+            raise error
+        errors = []
+        for i, doc in enumerate(docs):
+            if doc["_id"] in self.docs:
+                errors.append({"index": i, "code": 11000})
+            else:
+                self.docs[doc["_id"]] = dict(doc)
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+
+    def find(self, query):
+        cutoff = query["timestamp"]["$lt"]
+        return _FakeCursor([d for d in self.docs.values() if d["timestamp"] < cutoff])
+
+    async def delete_many(self, query):
+        ids = query["_id"]["$in"]
+        for _id in ids:
+            self.docs.pop(_id, None)
+        return type("Result", (), {"deleted_count": len(ids)})()
+
+
+class _FakeDB:
+    def __init__(self):
+        self.collections = {}
+
+    def __getitem__(self, name):
+        return self.collections.setdefault(name, _FakeCollection())
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    fake = _FakeDB()
+    monkeypatch.setattr(chat_log_module, "db", fake)
+    return fake
+
+
+def _entry(user_id="u1", age_days=0):
+    return {
+        "user_id": user_id,
+        "question": "q",
+        "response": {"message": "a", "clubs": {}},
+        "timestamp": datetime.utcnow() - timedelta(days=age_days),
+    }
+
+
+class TestChatLogWriter:
+    """Test batching, retries and shutdown flushing of chat logs"""
+
+    @pytest.mark.asyncio
+    async def test_size_threshold_flushes_one_batch(self, fake_db):
+        writer = ChatLogWriter(batch_size=3, flush_seconds=60)
+        for _ in range(3):
+            writer.log(_entry())
+        await writer.size_flush
+
+        assert len(fake_db["chat_logs"].docs) == 3
+        assert fake_db["chat_logs"].insert_calls == 1
+        assert writer.get_metrics()["buffered"] == 0
+
+    @pytest.mark.asyncio
+    async def test_time_threshold_and_shutdown(self, fake_db):
+        writer = ChatLogWriter(batch_size=100, flush_seconds=0.01)
+        writer.start()
+        writer.log(_entry())
+        await asyncio.sleep(0.05)
+        assert len(fake_db["chat_logs"].docs) == 1
+
+        writer.log(_entry())
+        await writer.shutdown()
+        assert len(fake_db["chat_logs"].docs) == 2
+        assert writer.flusher is None
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried_without_duplicates(self, fake_db):
+        writer = ChatLogWriter(batch_size=100, flush_seconds=60)
+        writer.log(_entry())
+        writer.log(_entry())
+        await writer.flush()
+
+        # Simulate a batch that was partly written before the connection dropped
+        writer.log(_entry())
+        first = writer.buffer[0]
+        fake_db["chat_logs"].docs[first["_id"]] = dict(first)
+        fake_db["chat_logs"].fail_next = ConnectionError("network down")
+        await writer.flush()
+        assert writer.get_metrics()["buffered"] == 1
+        assert writer.metrics["failed_flushes"] == 1
+
+        await writer.flush()
+        assert len(fake_db["chat_logs"].docs) == 3
+        assert writer.get_metrics()["buffered"] == 0
+
+    def test_buffer_cap_drops_oldest(self):
+        writer = ChatLogWriter(batch_size=100, flush_seconds=60, max_buffer=2)
+        for user_id in ["u1", "u2", "u3"]:
+            writer.log(_entry(user_id))
+        assert [e["user_id"] for e in writer.buffer] == ["u2", "u3"]
+        assert writer.metrics["dropped"] == 1
+        assert writer.pending_for("u3")[0]["user_id"] == "u3"
+
+
+class TestChatLogArchive:
+    """Test moving old chat logs to the archive"""
+
+    @pytest.mark.asyncio
+    async def test_archive_moves_old_logs(self, fake_db):
+        writer = ChatLogWriter(batch_size=100, flush_seconds=60)
+        writer.log(_entry(age_days=45))
+        writer.log(_entry(age_days=1))
+        await writer.flush()
+
+        assert await archive_old_chat_logs(older_than_days=30) == 1
+        assert len(fake_db["chat_logs"].docs) == 1
+        archived = list(fake_db["chat_logs_archive"].docs.values())
+        assert archived[0]["message"] == "a"
+        assert "response" not in archived[0]
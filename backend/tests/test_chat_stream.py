@@ -0,0 +1,136 @@
+# backend/tests/test_chat_stream.py
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import utils.llm_cache as llm_cache_module
+from utils.chat_answers import ChatAnswerCache
+from utils.chat_context import ContextSnapshot
+from utils.llm_cache import LLMCache
+
+
+class _NoStore:
+    def __getitem__(self, name):
+        return self
+
+    async def find_one_and_update(self, *args, **kwargs):
+        return None
+
+    async def replace_one(self, *args, **kwargs):
+        pass
+
+
+def _chunk(text=None, usage=None):
+    choices = [SimpleNamespace(delta=SimpleNamespace(content=text))] if text is not None else []
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+class _FakeStream:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+class _FakeCompletions:
+    def __init__(self):
+        self.calls = []
+
+    async def create(self, model, messages, **kwargs):
+        self.calls.append({"messages": messages, **kwargs})
+        return _FakeStream([
+            _chunk("Clubs meet "),
+            _chunk("on Fridays."),
+            _chunk(usage=SimpleNamespace(total_tokens=42)),
+        ])
+
+
+class _FakeContext:
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    async def get(self):
+        return self.snapshot
+
+
+def _parse(body: str):
+    frames = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n")
+        frames.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return frames
+
+
+@pytest.fixture
+def chatbot(monkeypatch):
+    import routes.chatbot_routes as chatbot_routes
+
+    monkeypatch.setattr(llm_cache_module, "db", _NoStore())
+    completions = _FakeCompletions()
+    logged = []
+
+    async def fake_log(user_id, question, response_json):
+        logged.append(response_json)
+
+    snapshot = ContextSnapshot([{"name": "Chess Club"}], [], [], [], stamp=0)
+    monkeypatch.setattr(chatbot_routes, "chat_context", _FakeContext(snapshot))
+    monkeypatch.setattr(chatbot_routes, "chat_answer_cache", ChatAnswerCache(
+        LLMCache("chat_stream_test", ttl_seconds=60, max_entries=10)
+    ))
+    monkeypatch.setattr(chatbot_routes, "log_chat", fake_log)
+    monkeypatch.setattr(chatbot_routes, "get_chat_client", lambda: SimpleNamespace(
+        chat=SimpleNamespace(completions=completions)
+    ))
+    return SimpleNamespace(routes=chatbot_routes, completions=completions, logged=logged)
+
+
+async def _stream(chatbot, question):
+    response = await chatbot.routes.query_chatbot_stream(chatbot.routes.ChatRequest(user_id="u1", question=question))
+    assert response.media_type == "text/event-stream"
+    return _parse("".join([frame async for frame in response.body_iterator]))
+
+
+class TestChatStreaming:
+    """Test the Server-Sent Events variant of the chatbot query"""
+
+    @pytest.mark.asyncio
+    async def test_tokens_then_structured_frame(self, chatbot):
+        frames = await _stream(chatbot, "When do clubs meet?")
+
+        assert frames[:2] == [("token", {"text": "Clubs meet "}), ("token", {"text": "on Fridays."})]
+        event, final = frames[-1]
+        assert event == "done"
+        assert final["message"] == "Clubs meet on Fridays."
+        assert final["clubs"] == {"Chess Club": [{"name": "Chess Club"}]}
+
+        call = chatbot.completions.calls[0]
+        assert call["stream"] is True
+        assert "plain text" in call["messages"][0]["content"]
+        assert chatbot.logged == [final]
+        assert chatbot.routes.chat_answer_cache.get_metrics()["llm_tokens"] == 42
+
+    @pytest.mark.asyncio
+    async def test_cached_answer_is_one_token_frame(self, chatbot):
+        await _stream(chatbot, "When do clubs meet?")
+        frames = await _stream(chatbot, "when do clubs meet")
+
+        assert frames[0] == ("token", {"text": "Clubs meet on Fridays."})
+        assert frames[-1][0] == "done"
+        assert len(chatbot.completions.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_llm_failure_is_reported_in_band(self, chatbot):
+        async def broken(*args, **kwargs):
+            raise RuntimeError("upstream down")
+
+        chatbot.completions.create = broken
+        frames = await _stream(chatbot, "When do clubs meet?")
+
+        assert frames == [("error", {"detail": "Chatbot error: upstream down"})]
+        assert chatbot.logged == []
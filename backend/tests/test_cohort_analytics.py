@@ -0,0 +1,106 @@
+# backend/tests/test_cohort_analytics.py
+import numpy as np
+import pytest
+
+import utils.cohort_analytics as cohort_module
+from utils.cohort_analytics import summarize_distribution, build_cohort_stats, get_cohort_analytics, _bucket_pipeline
+
+
+class TestCohortStatistics:
+    """Test NumPy post-processing of bucketed score distributions"""
+
+    def test_matches_raw_numpy_statistics(self):
+        scores = np.array([35.0, 50.0, 50.0, 62.5, 70.0, 70.0, 70.0, 81.0, 90.0, 98.0])
+        values, counts = np.unique(scores, return_counts=True)
+        stats = summarize_distribution(values, counts, float(scores.sum()))
+
+        assert stats["count"] == 10
+        assert stats["mean"] == round(scores.mean(), 2)
+        assert stats["median"] == np.percentile(scores, 50, method="inverted_cdf")
+        assert stats["p10"] == np.percentile(scores, 10, method="inverted_cdf")
+        assert stats["p90"] == np.percentile(scores, 90, method="inverted_cdf")
+        assert stats["std"] == round(scores.std(), 2)
+        assert (stats["min"], stats["max"]) == (35.0, 98.0)
+        assert sum(b["count"] for b in stats["histogram"]) == 10
+
+    def test_histogram_includes_perfect_scores(self):
+        stats = summarize_distribution(np.array([100.0]), np.array([3]), 300.0)
+        assert stats["histogram"][-1] == {"start": 90, "end": 100, "count": 3}
+
+    def test_build_cohort_stats_groups_buckets(self):
+        buckets = [
+            {"_id": {"cohort": "Fall 2024", "value": 90.0, "level": "excellent"}, "count": 2, "total": 180.0},
+            {"_id": {"cohort": "Fall 2024", "value": 40.0, "level": "low"}, "count": 1, "total": 40.0},
+            {"_id": {"cohort": "Spring 2025", "value": 70.0, "level": "average"}, "count": 4, "total": 280.0},
+            {"_id": {"cohort": "Spring 2025", "value": None, "level": None}, "count": 1, "total": 0},
+        ]
+        stats = build_cohort_stats(buckets)
+
+        assert [s["cohort"] for s in stats] == ["Fall 2024", "Spring 2025"]
+        assert stats[0]["level_counts"] == {"excellent": 2, "low": 1}
+        assert stats[0]["mean"] == round(220 / 3, 2)
+        assert stats[1]["count"] == 4
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_dimension(self):
+        with pytest.raises(ValueError):
+            await get_cohort_analytics("favourite_colour")
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length):
+        return self.docs
+
+
+class _SharedDB:
+    """Stand-in for the MongoDB every worker process talks to."""
+
+    def __init__(self):
+        self.version = 0
+        self.aggregations = []
+
+    def __getitem__(self, name):
+        return self
+
+    async def find_one(self, query):
+        return {"version": self.version} if self.version else None
+
+    async def update_one(self, query, update, upsert=False):
+        self.version += update["$inc"]["version"]
+
+    def aggregate(self, pipeline, allowDiskUse=False):
+        self.aggregations.append(pipeline)
+        return _Cursor([{"_id": {"cohort": "CSE", "value": 70.0, "level": "average"}, "count": 1, "total": 70.0}])
+
+
+class TestCohortCache:
+    """Test the shared version stamp and the student-level dimensions"""
+
+    @pytest.mark.asyncio
+    async def test_version_stamp_invalidates_other_processes(self, monkeypatch):
+        shared = _SharedDB()
+        import utils.cache_versions as cache_versions
+        monkeypatch.setattr(cohort_module, "db", shared)
+        monkeypatch.setattr(cache_versions, "db", shared)
+        cohort_module._cache.clear()
+
+        await get_cohort_analytics("category")
+        await get_cohort_analytics("category")
+        assert len(shared.aggregations) == 1
+
+        # Another worker handled a write: only the stamp in MongoDB changes here
+        shared.version += 1
+        await get_cohort_analytics("category")
+        assert len(shared.aggregations) == 2
+
+        await cohort_module.invalidate_cohort_cache()
+        assert shared.version == 2
+
+    def test_student_year_uses_per_student_averages(self):
+        pipeline = _bucket_pipeline("student_year", None)
+        assert pipeline[0]["$match"] == {"total_records": {"$gt": 0}}
+        assert pipeline[1]["$group"]["_id"]["cohort"] == {"$ifNull": ["$student_year", "unknown"]}
+        assert "student_year" in cohort_module.STUDENT_DIMENSIONS
@@ -0,0 +1,64 @@
+# backend/tests/test_entity_matcher.py
+from utils.entity_matcher import EntityMatcher, TokenAutomaton
+from utils.text_keys import fold_text, tokenize
+
+
+class TestTextKeys:
+    """Test folding used for name keys and matching"""
+
+    def test_fold_text(self):
+        assert fold_text("  Café   CODERS ") == "cafe coders"
+        assert tokenize("Who runs the Café-Coders club?") == ["who", "runs", "the", "cafe", "coders", "club"]
+
+
+class TestTokenAutomaton:
+    """Test the Aho-Corasick automaton over word tokens"""
+
+    def test_overlapping_patterns(self):
+        automaton = TokenAutomaton()
+        automaton.add(["machine", "learning"], 0, "ml")
+        automaton.add(["learning", "lab"], 0, "lab")
+        automaton.add(["lab"], 0, "short")
+        automaton.build()
+
+        matches = sorted(automaton.iter_matches("the machine learning lab".split()))
+        assert matches == [(1, 2, 0, "ml"), (2, 2, 0, "lab"), (3, 1, 0, "short")]
+
+    def test_partial_prefix_does_not_match(self):
+        automaton = TokenAutomaton()
+        automaton.add(["robotics", "club"], 0, "robotics")
+        automaton.build()
+        assert list(automaton.iter_matches(["robotics", "society"])) == []
+
+
+class TestEntityMatcher:
+    """Test club/event detection from chat questions"""
+
+    def setup_method(self):
+        self.matcher = EntityMatcher({
+            "club": ["IWX Club", "Robotics Club", "Robotics Club Advanced", "Coding Club", "AI"],
+            "event": ["Hackathon 2025", "Robotics Expo"],
+        })
+
+    def test_full_names_on_word_boundaries(self):
+        assert self.matcher.find("Tell me about the coding club", "club") == "Coding Club"
+        assert self.matcher.find("what does the AI club do", "club") == "AI"
+        # "ai" inside another word is not a mention
+        assert self.matcher.find("how do I get a chair", "club") is None
+
+    def test_longest_name_wins(self):
+        assert self.matcher.find("join robotics club advanced", "club") == "Robotics Club Advanced"
+
+    def test_distinctive_word_alias(self):
+        assert self.matcher.find("who leads iwx?", "club") == "IWX Club"
+        # "robotics" belongs to several names, so on its own it identifies none
+        assert self.matcher.find("anything about robotics?", "club") is None
+
+    def test_clubs_and_events_in_one_pass(self):
+        assert self.matcher.match("is the coding club going to hackathon 2025") == {
+            "club": "Coding Club", "event": "Hackathon 2025"
+        }
+
+    def test_accents_and_case(self):
+        matcher = EntityMatcher({"club": ["Café Coders"]})
+        assert matcher.find("CAFE CODERS meeting?", "club") == "Café Coders"
@@ -0,0 +1,107 @@
+# backend/tests/test_http_client.py
+import asyncio
+
+import httpx
+import pytest
+from tenacity import wait_none
+
+import utils.http_client as http_client
+from utils.http_client import HostLimitedTransport, HttpClients
+
+
+def make_clients(handler) -> HttpClients:
+    clients = HttpClients()
+    clients.clients["default"] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return clients
+
+
+class TestRetryPolicy:
+    """Test the shared outbound retry policy"""
+
+    @pytest.fixture(autouse=True)
+    def no_wait(self, monkeypatch):
+        monkeypatch.setattr(http_client, "RETRY_WAIT", wait_none())
+
+    @pytest.mark.asyncio
+    async def test_get_retries_on_unavailable(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503 if len(calls) < 3 else 200, text="ok")
+
+        response = await make_clients(handler).request("GET", "https://api.test/x", retries=2)
+        assert response.status_code == 200
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_post_is_not_retried_after_reaching_server(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        response = await make_clients(handler).request("POST", "https://api.test/x", retries=2)
+        assert response.status_code == 503
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_connect_errors_are_retried_for_any_method(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(200)
+
+        response = await make_clients(handler).request("POST", "https://api.test/x", retries=1)
+        assert response.status_code == 200
+        assert len(calls) == 2
+
+
+class TestHostLimitedTransport:
+    """Test the per-host concurrency cap"""
+
+    @pytest.mark.asyncio
+    async def test_caps_each_host_separately(self):
+        active, peak = {}, {}
+
+        async def handler(request):
+            host = request.url.host
+            active[host] = active.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), active[host])
+            await asyncio.sleep(0.01)
+            active[host] -= 1
+            return httpx.Response(200, text="ok")
+
+        transport = HostLimitedTransport(httpx.MockTransport(handler), per_host=2)
+        async with httpx.AsyncClient(transport=transport) as client:
+            urls = ["https://a.test/"] * 6 + ["https://b.test/"] * 3
+            # A leaked slot would block forever; fail fast instead of hanging the suite
+            responses = await asyncio.wait_for(asyncio.gather(*(client.get(url) for url in urls)), timeout=5)
+
+        assert all(r.text == "ok" for r in responses)
+        assert peak == {"a.test": 2, "b.test": 2}
+        # Every slot was handed back once the bodies were read
+        assert all(s._value == 2 for s in transport.semaphores.values())
+
+    @pytest.mark.asyncio
+    async def test_streamed_body_releases_slot_when_read(self):
+        class Streaming(httpx.AsyncBaseTransport):
+            async def handle_async_request(self, request):
+                # Mimic a network transport: no _content until the stream is read
+                response = httpx.Response(200, stream=StreamOnce())
+                return response
+
+        class StreamOnce(httpx.AsyncByteStream):
+            async def __aiter__(self):
+                yield b"chunk"
+
+        transport = HostLimitedTransport(Streaming(), per_host=1)
+        async with httpx.AsyncClient(transport=transport) as client:
+            for _ in range(3):
+                response = await asyncio.wait_for(client.get("https://a.test/"), timeout=5)
+                assert response.content == b"chunk"
+        assert transport.semaphores["a.test"]._value == 1
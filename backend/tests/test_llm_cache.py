@@ -0,0 +1,130 @@
+# backend/tests/test_llm_cache.py
+from datetime import datetime, timedelta
+
+import pytest
+
+import utils.llm_cache as llm_cache_module
+from utils.llm_cache import LLMCache, normalize_text
+
+
+class _DeleteResult:
+    def __init__(self, deleted_count):
+        self.deleted_count = deleted_count
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, key, direction):
+        self.docs.sort(key=lambda d: d[key], reverse=direction < 0)
+        return self
+
+    def limit(self, n):
+        self.docs = self.docs[:n]
+        return self
+
+    async def to_list(self, length):
+        return self.docs
+
+
+class _CacheCollection:
+    """Just enough of a motor collection for LLMCache."""
+
+    def __init__(self):
+        self.docs = {}
+
+    def __getitem__(self, name):
+        return self
+
+    async def find_one_and_update(self, query, update, projection=None):
+        doc = self.docs.get(query["_id"])
+        if doc is None or doc["expires_at"] <= query["expires_at"]["$gt"]:
+            return None
+        doc["hits"] += 1
+        return {"_id": doc["_id"], "value": doc["value"]}
+
+    async def replace_one(self, query, doc, upsert=False):
+        self.docs[query["_id"]] = {"_id": query["_id"], **doc}
+
+    async def count_documents(self, query):
+        return sum(1 for d in self.docs.values() if d["namespace"] == query["namespace"])
+
+    def find(self, query, projection=None):
+        return _Cursor([d for d in self.docs.values() if d["namespace"] == query["namespace"]])
+
+    async def delete_many(self, query):
+        ids = query["_id"]["$in"]
+        for _id in ids:
+            self.docs.pop(_id, None)
+        return _DeleteResult(len(ids))
+
+
+@pytest.fixture
+def store(monkeypatch):
+    collection = _CacheCollection()
+    monkeypatch.setattr(llm_cache_module, "db", collection)
+    return collection
+
+
+class TestLLMCache:
+    """Test the content-hash LLM cache against an in-memory collection"""
+
+    def test_normalized_inputs_share_a_key(self):
+        cache = LLMCache("demo", ttl_seconds=60, max_entries=10)
+        assert normalize_text("  Robotics\n club ") == "Robotics club"
+        assert cache.make_key("v1", normalize_text("Café  club")) == cache.make_key("v1", normalize_text("Café club"))
+        assert cache.make_key("v1", "a") != cache.make_key("v2", "a")
+
+    @pytest.mark.asyncio
+    async def test_hits_from_mongo_after_memory_eviction(self, store):
+        cache = LLMCache("demo", ttl_seconds=60, max_entries=10)
+        assert await cache.get("k") is None
+        await cache.set("k", {"type": "Technical"})
+
+        cache.memory.clear()  # another worker, or this one after a restart
+        assert await cache.get("k") == {"type": "Technical"}
+        assert await cache.get("k") == {"type": "Technical"}
+        metrics = cache.get_metrics()
+        assert (metrics["hits"], metrics["memory_hits"], metrics["misses"]) == (2, 1, 1)
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_miss(self, store):
+        cache = LLMCache("demo", ttl_seconds=60, max_entries=10)
+        await cache.set("k", "value")
+        store.docs["k"]["expires_at"] = datetime.utcnow() - timedelta(seconds=1)
+        cache.memory.clear()
+        assert await cache.get("k") is None
+
+    @pytest.mark.asyncio
+    async def test_trim_keeps_newest_entries(self, store):
+        cache = LLMCache("demo", ttl_seconds=60, max_entries=2)
+        for i in range(4):
+            await cache.set(f"k{i}", i)
+            store.docs[f"k{i}"]["created_at"] = datetime(2024, 1, 1, 0, i)
+        await cache.trim()
+        assert sorted(store.docs) == ["k2", "k3"]
+        assert cache.metrics["trimmed"] == 2
+
+
+class TestEnhancementCache:
+    """Test that repeat club applications skip the Gemini round trip"""
+
+    @pytest.mark.asyncio
+    async def test_repeat_application_hits_cache(self, store, monkeypatch):
+        import routes.club_routes as club_routes
+
+        calls = []
+
+        async def fake_generate(prompt, *args, **kwargs):
+            calls.append(prompt)
+            return '{"enhanced_description": "D", "enhanced_purpose": "P", "type": "Technical"}'
+
+        monkeypatch.setattr(club_routes, "GEMINI_API_KEY", "test-key")
+        monkeypatch.setattr(club_routes, "gemini_generate", fake_generate)
+        monkeypatch.setattr(club_routes, "enhancement_cache", LLMCache("club_enhancement", 60, 10))
+
+        first = await club_routes.request_gemini_enhancement("We build robots", "Compete  in contests")
+        second = await club_routes.request_gemini_enhancement("We build robots ", "Compete in contests")
+        assert first == second == {"enhanced_description": "D", "enhanced_purpose": "P", "type": "Technical"}
+        assert len(calls) == 1
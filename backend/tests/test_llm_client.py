@@ -0,0 +1,95 @@
+# backend/tests/test_llm_client.py
+import asyncio
+
+import pytest
+
+from utils.ai_utils import AIService
+from utils.llm_client import CircuitBreaker, LLMClient, LLMError, LLMTimeout, LLMUnavailable, StubProvider
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker:
+    """Test breaker state transitions"""
+
+    def test_opens_then_half_opens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "open" and not breaker.allow()
+
+        clock.now = 31
+        assert breaker.allow()          # single trial call
+        assert not breaker.allow()      # others keep failing fast
+        breaker.record_success()
+        assert breaker.state == "closed" and breaker.allow()
+
+    def test_failed_trial_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now = 11
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert not breaker.allow()
+
+
+class TestLLMClient:
+    """Test deadlines, concurrency and fail-fast behaviour with the stub provider"""
+
+    @pytest.mark.asyncio
+    async def test_timeout_then_fail_fast(self):
+        provider = StubProvider(latency=0.5)
+        client = LLMClient(provider, timeout=0.05, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+
+        for _ in range(2):
+            with pytest.raises(LLMTimeout):
+                await client.complete("hi")
+        with pytest.raises(LLMUnavailable):
+            await client.complete("hi")
+        assert provider.calls == 2
+        assert client.get_status()["circuit"] == "open"
+
+    @pytest.mark.asyncio
+    async def test_provider_errors_are_wrapped(self):
+        client = LLMClient(StubProvider(fail=True))
+        with pytest.raises(LLMError):
+            await client.complete("hi")
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        active, peak = 0, 0
+
+        class Tracking(StubProvider):
+            async def complete(self, prompt, max_tokens, temperature):
+                nonlocal active, peak
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.02)
+                active -= 1
+                return "ok"
+
+        client = LLMClient(Tracking(), timeout=2, max_concurrency=2)
+        results = await asyncio.gather(*(client.complete("hi") for _ in range(6)))
+        assert results == ["ok"] * 6
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_suggestions_fall_back_to_rules(self):
+        service = AIService(LLMClient(StubProvider(latency=0.5), timeout=0.05))
+        suggestions = await service._generate_ai_suggestions([{"score": 50}], ["Physics"], None)
+        assert suggestions[0] == "Schedule extra practice sessions for Physics"
+
+    @pytest.mark.asyncio
+    async def test_suggestions_parse_provider_json(self):
+        service = AIService(LLMClient(StubProvider(response='["A", "B"]')))
+        assert await service._generate_ai_suggestions([{"score": 80}], [], None) == ["A", "B"]
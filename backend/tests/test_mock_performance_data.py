@@ -0,0 +1,35 @@
+# backend/tests/test_mock_performance_data.py
+import random
+
+from utils.mock_performance_data import (
+    clear_mock_cache, get_mock_performance_data, get_student_seed, _mock_cache
+)
+
+
+class TestMockPerformanceData:
+    """Test memoized mock performance data"""
+
+    def setup_method(self):
+        clear_mock_cache()
+
+    def test_seed_is_stable_across_processes(self):
+        # crc32-based, so the value never depends on PYTHONHASHSEED
+        assert get_student_seed("student_001") == get_student_seed("student_001")
+        assert get_student_seed("student_001") == 7149
+
+    def test_results_are_cached_and_independent(self):
+        first = get_mock_performance_data("student_001")
+        first["analytics"]["student_name"] = "Changed"
+        first["records"].clear()
+
+        second = get_mock_performance_data("student_001")
+        assert len(_mock_cache) == 1
+        assert "student_name" not in second["analytics"]
+        assert len(second["records"]) == 15
+
+    def test_generation_leaves_global_random_untouched(self):
+        random.seed(123)
+        expected = random.random()
+        random.seed(123)
+        get_mock_performance_data("student_002")
+        assert random.random() == expected
@@ -0,0 +1,66 @@
+# backend/tests/test_name_lookup.py
+import re
+
+import pytest
+
+import utils.name_lookup as name_lookup
+from utils.name_lookup import find_by_name, with_name_key
+
+
+class _Collection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+
+    async def find_one(self, query, projection=None, sort=None):
+        self.queries.append(query)
+        ((field, condition),) = query.items()
+        for doc in sorted(self.docs, key=lambda d: d[field]):
+            if isinstance(condition, dict):
+                if re.match(condition["$regex"], doc[field]):
+                    return doc
+            elif doc[field] == condition:
+                return doc
+        return None
+
+
+class _FakeDB:
+    def __init__(self, collections):
+        self.collections = collections
+
+    def __getitem__(self, name):
+        return self.collections[name]
+
+
+@pytest.fixture
+def clubs(monkeypatch):
+    docs = [with_name_key("clubs", {"name": name}) for name in ["Robotics Club", "Robotics Club Advanced", "C++ Guild"]]
+    collection = _Collection(docs)
+    monkeypatch.setattr(name_lookup, "db", _FakeDB({"clubs": collection}))
+    return collection
+
+
+class TestNameLookup:
+    """Test exact-then-prefix lookups on folded name keys"""
+
+    def test_with_name_key(self):
+        assert with_name_key("events", {"title": "Café  Night"})["title_key"] == "cafe night"
+        # $set payloads without the display field are left alone
+        assert with_name_key("events", {"venue": "Hall"}) == {"venue": "Hall"}
+
+    @pytest.mark.asyncio
+    async def test_exact_key_first(self, clubs):
+        doc = await find_by_name("clubs", "  robotics CLUB ")
+        assert doc["name"] == "Robotics Club"
+        assert clubs.queries == [{"name_key": "robotics club"}]
+
+    @pytest.mark.asyncio
+    async def test_prefix_fallback_is_anchored_and_escaped(self, clubs):
+        doc = await find_by_name("clubs", "C++")
+        assert doc["name"] == "C++ Guild"
+        assert clubs.queries[-1] == {"name_key": {"$regex": r"^c\+\+"}}
+
+    @pytest.mark.asyncio
+    async def test_no_match(self, clubs):
+        assert await find_by_name("clubs", "chess") is None
+        assert await find_by_name("clubs", "   ") is None
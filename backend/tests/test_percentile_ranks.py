@@ -0,0 +1,55 @@
+# backend/tests/test_percentile_ranks.py
+from utils.percentile_ranks import CohortRanks, RankIndex, ALL_COHORT
+
+
+class TestCohortRanks:
+    """Test bisect-based rank and percentile lookups"""
+
+    def setup_method(self):
+        self.ranks = CohortRanks([(70.0, "c"), (90.0, "a"), (50.0, "e"), (70.0, "d"), (80.0, "b")])
+
+    def test_rank(self):
+        assert self.ranks.rank(90.0) == 1
+        assert self.ranks.rank(80.0) == 2
+        assert self.ranks.rank(70.0) == 3  # ties share the best rank
+        assert self.ranks.rank(50.0) == 5
+        assert self.ranks.rank(95.0) == 1
+
+    def test_percentile(self):
+        assert self.ranks.percentile(50.0) == 10.0
+        assert self.ranks.percentile(70.0) == 40.0
+        assert self.ranks.percentile(90.0) == 90.0
+        assert self.ranks.percentile(100.0) == 100.0
+        assert CohortRanks([]).percentile(50.0) == 0.0
+
+    def test_top_and_bottom(self):
+        assert self.ranks.top(2) == [("a", 90.0), ("b", 80.0)]
+        assert self.ranks.bottom(2) == [("e", 50.0), ("c", 70.0)]
+        assert len(self.ranks.top(10)) == 5
+        assert self.ranks.top(0) == []
+
+
+class TestRankIndex:
+    """Test cohort grouping and per-student description"""
+
+    def test_department_and_campus_cohorts(self):
+        index = RankIndex()
+        index.load([
+            {"student_id": "s1", "overall_average": 92, "department": "CSE"},
+            {"student_id": "s2", "overall_average": 61, "department": "CSE"},
+            {"student_id": "s3", "overall_average": 75, "department": "ECE"},
+            {"student_id": "s4", "overall_average": 40},
+        ])
+
+        assert len(index.get(ALL_COHORT)) == 4
+        assert len(index.get("department:CSE")) == 2
+
+        cse = index.describe(61, "CSE")
+        assert cse == {"cohort": "department:CSE", "rank": 2, "cohort_size": 2, "percentile": 25.0}
+
+        # Unknown department falls back to the whole campus
+        assert index.describe(40, None)["cohort"] == ALL_COHORT
+        assert index.describe(40, "MECH")["rank"] == 4
+
+    def test_empty_index(self):
+        assert RankIndex().describe(80)["percentile"] is None
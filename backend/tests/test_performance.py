@@ -289,5 +289,31 @@ class TestEdgeCases:
         response = client.post("/api/performance/add", json=record_data, headers=headers)
         assert response.status_code in [200, 201]
 
+class TestAnalyticsPagination:
+    """Test risk ordering and keyset cursor helpers"""
+
+    def test_risk_score_ordering(self):
+        from utils.performance_utils import calculate_risk_score
+        low_declining = calculate_risk_score(PerformanceLevel.LOW, "declining", 55)
+        low_stable = calculate_risk_score(PerformanceLevel.LOW, "stable", 30)
+        average_declining = calculate_risk_score(PerformanceLevel.AVERAGE, "declining", 61)
+        excellent = calculate_risk_score(PerformanceLevel.EXCELLENT, "improving", 95)
+        assert low_declining < low_stable < average_declining < excellent
+
+    def test_cursor_round_trip(self):
+        from routes.performance_routes import encode_cursor, decode_cursor
+        assert decode_cursor(encode_cursor([1200.5, "abc"])) == [1200.5, "abc"]
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+    def test_keyset_filter(self):
+        from routes.performance_routes import keyset_filter
+        assert keyset_filter(["risk_score", "student_id"], [10.0, "s1"]) == {"$or": [
+            {"risk_score": {"$gt": 10.0}},
+            {"risk_score": 10.0, "student_id": {"$gt": "s1"}},
+        ]}
+        with pytest.raises(ValueError):
+            keyset_filter(["student_id"], [1, 2])
+
 if __name__ == "__main__":
-    pytest.main([__file__])
\ No newline at end of file
+    pytest.main([__file__])
@@ -0,0 +1,174 @@
+# backend/tests/test_performance_import.py
+import io
+import pytest
+from datetime import datetime
+from pydantic import ValidationError
+from starlette.datastructures import UploadFile
+
+from models.performance_model import PerformanceThreshold, PerformanceLevel
+from utils.performance_import import RowParser, build_record, detect_format, iter_upload_lines
+
+
+class TestRowParser:
+    """Test streaming CSV / NDJSON parsing"""
+
+    def test_csv_header_and_rows(self):
+        parser = RowParser("csv")
+        assert parser.parse("student_id,type,category,score,semester") is None
+        row = parser.parse("s1,academic,exam,72.5,")
+        assert row == {"student_id": "s1", "type": "academic", "category": "exam", "score": "72.5"}
+
+    def test_csv_column_mismatch(self):
+        parser = RowParser("csv")
+        parser.parse("student_id,type,category,score")
+        with pytest.raises(ValueError):
+            parser.parse("s1,academic,exam")
+
+    def test_csv_quoted_field_spanning_lines(self):
+        parser = RowParser("csv")
+        parser.parse("student_id,type,category,score,remarks")
+        assert parser.parse('s1,academic,exam,72.5,"Good work.') is None
+        assert parser.in_record
+        assert parser.parse("") is None
+        row = parser.parse('Said ""thanks"" in class"')
+        assert row["remarks"] == 'Good work.\n\nSaid "thanks" in class'
+        assert not parser.in_record
+        assert parser.parse("s2,academic,exam,80,ok")["student_id"] == "s2"
+
+    def test_csv_unterminated_quote(self):
+        parser = RowParser("csv")
+        parser.parse("student_id,remarks")
+        parser.parse('s1,"never closed')
+        with pytest.raises(ValueError):
+            parser.finish()
+
+    def test_ndjson_rows(self):
+        parser = RowParser("ndjson")
+        assert parser.parse("   ") is None
+        assert parser.parse('{"student_id": "s1", "score": 90}')["score"] == 90
+        with pytest.raises(ValueError):
+            parser.parse("[1, 2]")
+
+    def test_detect_format(self):
+        assert detect_format("scores.csv", None) == "csv"
+        assert detect_format("scores.jsonl", None) == "ndjson"
+        assert detect_format("upload", "application/x-ndjson") == "ndjson"
+        assert detect_format("upload.bin", "application/octet-stream") is None
+
+
+class TestBuildRecord:
+    """Test validation against PerformanceRecordIn"""
+
+    def test_valid_row(self):
+        now = datetime(2024, 6, 1)
+        row = {"student_id": "s1", "type": "academic", "category": "exam", "score": "30"}
+        record = build_record(row, PerformanceThreshold(), now)
+        assert record["score"] == 30.0
+        assert record["calculated_level"] == PerformanceLevel.LOW
+        assert record["created_at"] == now
+
+    def test_created_at_column(self):
+        row = {"student_id": "s1", "type": "academic", "category": "exam", "score": 90,
+               "created_at": "2023-02-03T10:00:00Z"}
+        record = build_record(row, PerformanceThreshold(), datetime(2024, 6, 1))
+        assert record["created_at"] == datetime(2023, 2, 3, 10, 0)
+
+    def test_created_at_offset_converted_to_utc(self):
+        row = {"student_id": "s1", "type": "academic", "category": "exam", "score": 90,
+               "created_at": "2023-02-03T10:00:00+05:30"}
+        record = build_record(row, PerformanceThreshold(), datetime(2024, 6, 1))
+        assert record["created_at"] == datetime(2023, 2, 3, 4, 30)
+        assert record["created_at"].tzinfo is None
+
+    def test_invalid_score(self):
+        row = {"student_id": "s1", "type": "academic", "category": "exam", "score": 150}
+        with pytest.raises(ValidationError):
+            build_record(row, PerformanceThreshold(), datetime.utcnow())
+
+
+class TestUploadLines:
+    """Test incremental decoding of uploads"""
+
+    @pytest.mark.asyncio
+    async def test_lines_across_chunks(self):
+        data = "a,b\r\nMathématiques,2\nlast".encode("utf-8")
+        upload = UploadFile(file=io.BytesIO(data))
+        lines = [line async for line in iter_upload_lines(upload, chunk_size=3)]
+        assert lines == ["a,b", "Mathématiques,2", "last"]
+
+
+class TestImportDecodeErrors:
+    """Test that a bad byte mid-file returns the partial summary"""
+
+    @pytest.mark.asyncio
+    async def test_partial_summary_and_analytics(self, monkeypatch):
+        import utils.performance_import as import_module
+
+        written, scheduled = [], []
+
+        async def thresholds():
+            return PerformanceThreshold()
+
+        async def flush(batch, summary, collection):
+            written.extend(doc for _, doc in batch)
+            summary.inserted += len(batch)
+            summary.students.update(doc["student_id"] for _, doc in batch)
+            batch.clear()
+
+        async def schedule(student_id):
+            scheduled.append(student_id)
+
+        monkeypatch.setattr(import_module, "get_performance_thresholds", thresholds)
+        monkeypatch.setattr(import_module, "_flush", flush)
+        monkeypatch.setattr(import_module, "schedule_analytics_update", schedule)
+
+        data = b"student_id,type,category,score\ns1,academic,exam,80\ns2,academic,exam,70\n\xff\xfe,bad\n"
+        upload = UploadFile(file=io.BytesIO(data))
+        summary = await import_module.import_performance_records(
+            iter_upload_lines(upload, chunk_size=16), "csv", batch_size=1
+        )
+
+        assert summary["aborted"] is True
+        assert summary["inserted"] == 2
+        assert summary["failed"] == 1
+        assert "UTF-8" in summary["errors"][0]["error"]
+        assert sorted(scheduled) == ["s1", "s2"]
+
+
+class TestImportMultilineCsv:
+    """Test that quoted fields spanning lines import as one record"""
+
+    @pytest.mark.asyncio
+    async def test_multiline_description(self, monkeypatch):
+        import utils.performance_import as import_module
+
+        written = []
+
+        async def thresholds():
+            return PerformanceThreshold()
+
+        async def flush(batch, summary, collection):
+            written.extend(batch)
+            summary.inserted += len(batch)
+            batch.clear()
+
+        monkeypatch.setattr(import_module, "get_performance_thresholds", thresholds)
+        monkeypatch.setattr(import_module, "_flush", flush)
+
+        data = (
+            'student_id,type,category,score,description\n'
+            's1,academic,exam,80,"Strong term.\nNeeds practice, mostly in labs."\n'
+            's2,academic,exam,70,fine\n'
+            's3,academic,exam,150,"out of range\nscore"\n'
+        ).encode("utf-8")
+        upload = UploadFile(file=io.BytesIO(data))
+        summary = await import_module.import_performance_records(
+            iter_upload_lines(upload, chunk_size=16), "csv", schedule_analytics=False
+        )
+
+        assert summary["rows"] == 3
+        assert summary["inserted"] == 2
+        assert written[0][1]["description"] == "Strong term.\nNeeds practice, mostly in labs."
+        # Rows and errors are numbered by the first line of their record
+        assert [(line, doc["student_id"]) for line, doc in written] == [(2, "s1"), (4, "s2")]
+        assert summary["errors"][0]["line"] == 5
@@ -0,0 +1,42 @@
+# backend/tests/test_performance_rollups.py
+from datetime import datetime
+
+from models.performance_model import PerformanceType
+from utils.performance_rollups import build_rollup_updates, combine_rollups, month_key, rollup_id
+
+
+class TestRollupUpdates:
+    """Test in-memory pre-aggregation of records into rollup upserts"""
+
+    def test_records_grouped_per_bucket(self):
+        records = [
+            {"student_id": "s1", "type": PerformanceType.ACADEMIC, "category": "exam", "score": 70, "created_at": datetime(2024, 3, 2)},
+            {"student_id": "s1", "type": "academic", "category": "exam", "score": 90, "created_at": datetime(2024, 3, 28)},
+            {"student_id": "s1", "type": "academic", "category": "exam", "score": 50, "created_at": datetime(2024, 4, 1)},
+        ]
+        updates = build_rollup_updates(records)
+        assert len(updates) == 2
+
+        march = updates[0]._doc
+        assert updates[0]._filter == {"_id": rollup_id("s1", "2024-03", "academic", "exam")}
+        assert march["$inc"] == {"count": 2, "sum": 160.0}
+        assert march["$min"] == {"min": 70.0}
+        assert march["$max"] == {"max": 90.0}
+        assert march["$setOnInsert"]["month"] == "2024-03"
+
+    def test_month_key(self):
+        assert month_key(datetime(2024, 1, 31, 23, 59)) == "2024-01"
+
+
+class TestCombineRollups:
+    """Test merging category rollups into monthly points"""
+
+    def test_combine_across_categories(self):
+        rollups = [
+            {"month": "2024-04", "count": 1, "sum": 50.0, "min": 50.0, "max": 50.0},
+            {"month": "2024-03", "count": 2, "sum": 160.0, "min": 70.0, "max": 90.0},
+            {"month": "2024-03", "count": 2, "sum": 100.0, "min": 40.0, "max": 60.0},
+        ]
+        points = combine_rollups(rollups)
+        assert [p["month"] for p in points] == ["2024-03", "2024-04"]
+        assert points[0] == {"month": "2024-03", "count": 4, "average": 65.0, "min": 40.0, "max": 90.0}
@@ -0,0 +1,123 @@
+# backend/tests/test_performance_storage.py
+import pytest
+
+from utils.performance_storage import collection_options, get_storage_mode
+
+
+class TestStorageMode:
+    """Test performance_records storage mode configuration"""
+
+    def test_default_mode_is_standard(self, monkeypatch):
+        monkeypatch.delenv("PERFORMANCE_STORAGE_MODE", raising=False)
+        assert get_storage_mode() == "standard"
+        assert collection_options("standard") == {}
+
+    def test_timeseries_options(self, monkeypatch):
+        monkeypatch.setenv("PERFORMANCE_STORAGE_MODE", "TimeSeries")
+        assert get_storage_mode() == "timeseries"
+        options = collection_options("timeseries")["timeseries"]
+        assert options["timeField"] == "created_at"
+        assert options["metaField"] == "student_id"
+        assert options["granularity"] == "hours"
+
+    def test_unknown_mode_rejected(self, monkeypatch):
+        monkeypatch.setenv("PERFORMANCE_STORAGE_MODE", "capped")
+        with pytest.raises(ValueError):
+            get_storage_mode()
+        with pytest.raises(ValueError):
+            collection_options("capped")
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, keys):
+        return self
+
+    async def to_list(self, length):
+        return self.docs
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for doc in list(self.docs):
+            yield doc
+
+
+class _Collection:
+    def __init__(self, db, name):
+        self.db, self.name = db, name
+
+    def find(self, query):
+        return _Cursor(self.db.data[self.name])
+
+    async def count_documents(self, query):
+        return len(self.db.data[self.name])
+
+    async def insert_many(self, docs, ordered=True):
+        self.db.data[self.name].extend(docs)
+
+    async def create_index(self, keys):
+        pass
+
+    async def rename(self, new_name):
+        if self.db.types[self.name] == "timeseries":
+            raise RuntimeError("cannot rename a time-series collection")
+        self.db.renames.append((self.name, new_name))
+        self.db.data[new_name] = self.db.data.pop(self.name)
+        self.db.types[new_name] = self.db.types.pop(self.name)
+
+    async def drop(self):
+        self.db.data.pop(self.name, None)
+        self.db.types.pop(self.name, None)
+
+
+class _FakeDB:
+    def __init__(self, mode, docs):
+        self.data = {"performance_records": docs}
+        self.types = {"performance_records": mode}
+        self.renames = []
+
+    def __getitem__(self, name):
+        return _Collection(self, name)
+
+    def list_collections(self, filter):
+        name = filter["name"]
+        return _Cursor([{"name": name, "type": self.types[name]}] if name in self.types else [])
+
+    async def create_collection(self, name, **options):
+        self.data[name] = []
+        self.types[name] = "timeseries" if "timeseries" in options else "collection"
+
+
+class TestMigrateStorage:
+    """Test the collection swap against a stand-in database"""
+
+    def _records(self):
+        from datetime import datetime
+        return [{"student_id": f"s{i}", "created_at": datetime(2024, 1, i + 1), "score": 50} for i in range(3)]
+
+    @pytest.mark.asyncio
+    async def test_refuses_to_run_while_writes_may_happen(self):
+        from utils.performance_storage import migrate_storage
+        with pytest.raises(RuntimeError):
+            await migrate_storage("timeseries")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("source,target", [("collection", "timeseries"), ("timeseries", "standard")])
+    async def test_never_renames_time_series(self, monkeypatch, source, target):
+        import utils.performance_storage as storage
+        fake = _FakeDB(source, self._records())
+        monkeypatch.setattr(storage, "db", fake)
+
+        result = await storage.migrate_storage(target, batch_size=2, writes_stopped=True)
+
+        assert result["migrated"] == 3
+        expected_type = "timeseries" if target == "timeseries" else "collection"
+        assert fake.types["performance_records"] == expected_type
+        assert fake.types[result["backup"]] == "collection"
+        assert len(fake.data[result["backup"]]) == 3
+        # Only the standard source may be renamed aside
+        assert fake.renames == ([("performance_records", result["backup"])] if source == "collection" else [])
@@ -0,0 +1,206 @@
+# backend/tests/test_recommendations.py
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+import routes.recommendation_routes as recommendation_routes
+from utils.chat_context import ContextSnapshot
+
+STUDENT_ID = ObjectId()
+
+
+class _FakeCollection:
+    def __init__(self, doc):
+        self.doc = doc
+        self.projections = []
+
+    async def find_one(self, query, projection=None):
+        self.projections.append(projection)
+        return dict(self.doc) if self.doc else None
+
+    def find(self, query=None, projection=None):
+        return _Cursor([])
+
+
+class _FakeDB:
+    def __init__(self, profile):
+        self.users = _FakeCollection({"_id": STUDENT_ID, "name": "Asha"})
+        self.student_profiles = _FakeCollection(profile)
+
+
+class _FakeContext:
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    async def get(self):
+        return self.snapshot
+
+
+def _snapshot():
+    clubs = [
+        {"name": "Robotics Club", "description": "Build robots with arduino", "approved": True},
+        {"name": "Coding Club", "description": "Python and competitive programming", "approved": True},
+        {"name": "Secret Python Society", "description": "Python meetups", "approved": False},
+        {"name": "Drama Club", "description": "Theatre and acting", "approved": True},
+    ]
+    events = [
+        {"title": "Python Bootcamp", "description": "Learn python", "date": datetime(2025, 3, 1), "venue": "Lab 1"},
+        {"title": "Dance Night", "description": "Music and dance", "date": datetime(2025, 3, 2), "venue": "Hall"},
+    ]
+    return ContextSnapshot(clubs, events, [], [], stamp=0)
+
+
+@pytest.fixture
+def recommender(monkeypatch):
+    fake_db = _FakeDB({"skills": ["Python", "Arduino"], "interests": ["robots"], "achievements": []})
+    monkeypatch.setattr(recommendation_routes, "db", fake_db)
+    monkeypatch.setattr(recommendation_routes, "chat_context", _FakeContext(_snapshot()))
+    monkeypatch.setattr(recommendation_routes, "recommendation_cache", {})
+    return fake_db
+
+
+class TestLocalRecommender:
+    """Test TF-IDF recommendations without an LLM"""
+
+    @pytest.mark.asyncio
+    async def test_clubs_ranked_from_profile(self, recommender):
+        result = await recommendation_routes.recommend_clubs(str(STUDENT_ID))
+
+        names = [club["name"] for club in result["clubs"]]
+        assert set(names) == {"Robotics Club", "Coding Club"}
+        # Unapproved clubs are never recommended
+        assert "Secret Python Society" not in names
+        assert result["recommendations"].startswith("Recommended clubs for you: ")
+        assert "robots" in result["clubs"][names.index("Robotics Club")]["matched"]
+
+    @pytest.mark.asyncio
+    async def test_events_ranked_from_profile(self, recommender):
+        result = await recommendation_routes.recommend_events(str(STUDENT_ID))
+        assert [event["title"] for event in result["events"]] == ["Python Bootcamp"]
+
+    @pytest.mark.asyncio
+    async def test_profile_reads_never_include_secrets(self, recommender):
+        await recommendation_routes.recommend_clubs(str(STUDENT_ID))
+        assert recommender.users.projections == [{"name": 1}]
+        assert "password" not in recommender.student_profiles.projections[0]
+        assert recommender.student_profiles.projections[0]["_id"] == 0
+
+    @pytest.mark.asyncio
+    async def test_results_are_cached_per_student(self, recommender, monkeypatch):
+        calls = []
+        rank = recommendation_routes.rank
+        monkeypatch.setattr(recommendation_routes, "rank", lambda *args: calls.append(1) or rank(*args))
+
+        first = await recommendation_routes.recommend_clubs(str(STUDENT_ID))
+        second = await recommendation_routes.recommend_clubs(str(STUDENT_ID))
+        assert first is second
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_llm_only_phrases_the_ranked_list(self, recommender, monkeypatch):
+        prompts = []
+
+        async def fake_gemini(prompt, api_key, model):
+            prompts.append(prompt)
+            return "You'd love the Robotics Club."
+
+        monkeypatch.setattr(recommendation_routes, "GEMINI_API_KEY", "key")
+        monkeypatch.setattr(recommendation_routes, "gemini_generate", fake_gemini)
+
+        result = await recommendation_routes.recommend_clubs(str(STUDENT_ID), phrase=True)
+        assert result["recommendations"] == "You'd love the Robotics Club."
+        assert {club["name"] for club in result["clubs"]} == {"Robotics Club", "Coding Club"}
+        assert "Drama Club" not in prompts[0]
+        assert "Asha" not in prompts[0]
+
+    @pytest.mark.asyncio
+    async def test_empty_profile(self, recommender):
+        recommender.student_profiles.doc = None
+        result = await recommendation_routes.recommend_clubs(str(STUDENT_ID))
+        assert result["clubs"] == []
+        assert result["recommendations"].startswith("No clubs match your profile yet")
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length):
+        return [dict(d) for d in self.docs][:length]
+
+
+class _ClubStore:
+    """Club collection shared by the approval route and the chat context loader."""
+
+    def __init__(self, clubs):
+        self.clubs = clubs
+
+    def find(self, query=None, projection=None):
+        return _Cursor(self.clubs)
+
+    async def find_one(self, query, projection=None):
+        return next((dict(c) for c in self.clubs if c["_id"] == query["_id"]), None)
+
+    async def update_one(self, query, update):
+        for club in self.clubs:
+            if club["_id"] == query["_id"]:
+                club.update(update["$set"])
+
+
+class _VersionStore:
+    def __init__(self):
+        self.version = 0
+
+    async def find_one(self, query):
+        return {"version": self.version}
+
+    async def update_one(self, query, update, upsert=False):
+        self.version += 1
+
+
+class _WorldDB:
+    def __init__(self):
+        club = {
+            "_id": ObjectId(), "name": "Robotics Club", "description": "Build robots with arduino",
+            "created_by": ObjectId(), "created_at": datetime(2025, 1, 1), "approved": False,
+        }
+        self.clubs = _ClubStore([club])
+        self.events = _ClubStore([])
+        self.teachers = _ClubStore([])
+        self.users = _FakeCollection({"_id": STUDENT_ID, "name": "Asha"})
+        self.student_profiles = _FakeCollection({"skills": ["Arduino"], "interests": ["robots"]})
+        self.versions = _VersionStore()
+
+    def __getitem__(self, name):
+        return self.clubs if name == "clubs" else self.versions
+
+
+class TestRecommendationsFollowApproval:
+    """Test that approving or rejecting a club changes recommendations right away"""
+
+    @pytest.mark.asyncio
+    async def test_approve_then_reject(self, monkeypatch):
+        import routes.club_routes as club_routes
+        import utils.cache_versions as cache_versions
+        import utils.chat_context as chat_context_module
+        from utils.chat_context import ChatContextCache
+
+        world = _WorldDB()
+        # Long TTL and no stamp polling: only the approval's invalidation can refresh the snapshot
+        context = ChatContextCache(ttl_seconds=3600, stamp_check_seconds=3600)
+        for module in (chat_context_module, cache_versions, club_routes, recommendation_routes):
+            monkeypatch.setattr(module, "db", world)
+        monkeypatch.setattr(club_routes, "chat_context", context)
+        monkeypatch.setattr(recommendation_routes, "chat_context", context)
+        monkeypatch.setattr(recommendation_routes, "recommendation_cache", {})
+        club_id = str(world.clubs.clubs[0]["_id"])
+
+        assert (await recommendation_routes.recommend_clubs(str(STUDENT_ID)))["clubs"] == []
+
+        await club_routes.approve_club(club_id)
+        result = await recommendation_routes.recommend_clubs(str(STUDENT_ID))
+        assert [club["name"] for club in result["clubs"]] == ["Robotics Club"]
+
+        await club_routes.reject_club(club_id)
+        assert (await recommendation_routes.recommend_clubs(str(STUDENT_ID)))["clubs"] == []
@@ -0,0 +1,89 @@
+# backend/tests/test_scheduler.py
+import asyncio
+
+import pytest
+from datetime import datetime
+
+import utils.scheduler as scheduler_module
+from utils.scheduler import CronTrigger, IntervalTrigger, Scheduler
+
+
+class TestCronTrigger:
+    """Test cron expression parsing and next fire time calculation"""
+
+    def test_daily_cron(self):
+        trigger = CronTrigger("0 2 * * *")
+        assert trigger.next_fire_time(datetime(2024, 5, 1, 1, 30)) == datetime(2024, 5, 1, 2, 0)
+        assert trigger.next_fire_time(datetime(2024, 5, 1, 2, 0)) == datetime(2024, 5, 2, 2, 0)
+
+    def test_step_and_list_fields(self):
+        trigger = CronTrigger("*/15 9,17 * * *")
+        assert trigger.next_fire_time(datetime(2024, 5, 1, 9, 1)) == datetime(2024, 5, 1, 9, 15)
+        assert trigger.next_fire_time(datetime(2024, 5, 1, 9, 45)) == datetime(2024, 5, 1, 17, 0)
+
+    def test_weekday_field(self):
+        # 2024-05-01 is a Wednesday; next Monday is 2024-05-06
+        trigger = CronTrigger("0 8 * * 1")
+        assert trigger.next_fire_time(datetime(2024, 5, 1, 12, 0)) == datetime(2024, 5, 6, 8, 0)
+
+    def test_sunday_as_zero_and_seven(self):
+        assert CronTrigger("0 0 * * 0").weekdays == CronTrigger("0 0 * * 7").weekdays == {6}
+
+    def test_month_rollover(self):
+        trigger = CronTrigger("0 0 1 1 *")
+        assert trigger.next_fire_time(datetime(2024, 3, 10)) == datetime(2025, 1, 1)
+
+    def test_invalid_expressions(self):
+        with pytest.raises(ValueError):
+            CronTrigger("0 2 * *")
+        with pytest.raises(ValueError):
+            CronTrigger("61 * * * *")
+
+
+class TestIntervalTrigger:
+    """Test interval slots are aligned so every worker agrees on them"""
+
+    def test_epoch_alignment(self):
+        trigger = IntervalTrigger(600)
+        assert trigger.next_fire_time(datetime(2024, 5, 1, 10, 3, 20)) == datetime(2024, 5, 1, 10, 10)
+        assert trigger.next_fire_time(datetime(2024, 5, 1, 10, 10)) == datetime(2024, 5, 1, 10, 20)
+
+
+class TestScheduler:
+    """Test job registration"""
+
+    def test_add_job_requires_one_trigger(self):
+        async def job():
+            pass
+
+        scheduler = Scheduler()
+        with pytest.raises(ValueError):
+            scheduler.add_job("both", job, cron="* * * * *", interval=60)
+        with pytest.raises(ValueError):
+            scheduler.add_job("none", job)
+
+        scheduler.add_job("every_minute", job, interval=60)
+        with pytest.raises(ValueError):
+            scheduler.add_job("every_minute", job, interval=60)
+        assert scheduler.get_metrics()[0]["name"] == "every_minute"
+
+    @pytest.mark.asyncio
+    async def test_lease_errors_do_not_stop_the_job_loop(self, monkeypatch):
+        async def broken_lease(*args, **kwargs):
+            raise RuntimeError("server selection timeout")
+
+        async def job():
+            pass
+
+        monkeypatch.setattr(scheduler_module, "acquire_lease", broken_lease)
+        scheduler = Scheduler()
+        scheduler.add_job("flaky", job, interval=0.05)
+        scheduler.start()
+        await asyncio.sleep(0.3)
+        task = scheduler.jobs["flaky"].task
+        await scheduler.shutdown()
+
+        metrics = scheduler.get_metrics()[0]
+        assert metrics["error_count"] >= 2
+        assert metrics["last_error"] == "server selection timeout"
+        assert task.cancelled()
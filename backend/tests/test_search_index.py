@@ -0,0 +1,119 @@
+# backend/tests/test_search_index.py
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from utils.chat_context import ContextSnapshot
+from utils.search_index import TextIndex, club_text, take_within_budget
+
+
+def _clubs():
+    return [
+        {"name": "Robotics Club", "description": "Build robots with arduino and sensors"},
+        {"name": "Coding Club", "description": "Competitive programming in python and java"},
+        {"name": "Drama Club", "description": "Theatre, acting and stage plays"},
+    ]
+
+
+def _sync(index, clubs):
+    index.sync((club["name"], club_text(club), club) for club in clubs)
+
+
+class TestTextIndex:
+    """Test the incremental TF-IDF index over club/event text"""
+
+    def test_search_ranks_by_relevance(self):
+        index = TextIndex(n_features=2 ** 12)
+        _sync(index, _clubs())
+
+        results = index.search("I like python programming", k=2)
+        assert [item["name"] for _, item in results] == ["Coding Club"]
+        assert index.search("quantum chemistry", k=2) == []
+
+    def test_top_k_is_ordered(self):
+        index = TextIndex(n_features=2 ** 12)
+        _sync(index, _clubs())
+
+        results = index.search("robots acting python", k=2)
+        assert len(results) == 2
+        assert results[0][0] >= results[1][0]
+
+    def test_sync_only_vectorizes_changes(self):
+        index = TextIndex(n_features=2 ** 12)
+        clubs = _clubs()
+        _sync(index, clubs)
+        assert index.metrics["vectorized"] == 3
+
+        clubs[2] = {"name": "Drama Club", "description": "Musicals and python scripting for stage lights"}
+        _sync(index, clubs[1:])
+        assert index.metrics["vectorized"] == 4
+        assert index.metrics["removed"] == 1
+        assert index.get_metrics()["documents"] == 2
+        assert [item["name"] for _, item in index.search("robots", k=3)] == []
+        assert {item["name"] for _, item in index.search("python", k=3)} == {"Coding Club", "Drama Club"}
+
+    def test_document_frequencies_match_a_fresh_index(self):
+        incremental = TextIndex(n_features=2 ** 12)
+        clubs = _clubs()
+        _sync(incremental, clubs)
+        clubs[0] = {"name": "Robotics Club", "description": "Drones and python"}
+        _sync(incremental, clubs)
+
+        fresh = TextIndex(n_features=2 ** 12)
+        _sync(fresh, clubs)
+        assert (incremental.df == fresh.df).all()
+        assert abs(incremental.matrix - fresh.matrix).sum() < 1e-9
+
+
+class TestPromptBudget:
+    """Test that recommendation prompts stay within the token budget"""
+
+    def test_take_within_budget(self):
+        items = [{"name": "x" * 40}] * 10
+        # Each item is ~13 tokens
+        assert len(take_within_budget(items, 30)) == 2
+        assert take_within_budget(items, 5) == []
+
+    def test_recommendation_candidates(self, monkeypatch):
+        import routes.chatbot_routes as chatbot_routes
+
+        monkeypatch.setattr(chatbot_routes, "RECOMMEND_PROMPT_TOKENS", 60)
+        clubs = _clubs() + [{"name": f"Club {i}", "description": "Gardening " * 30} for i in range(50)]
+        snapshot = ContextSnapshot(clubs, [], [], [], stamp=0)
+        plan = SimpleNamespace(snapshot=snapshot, recommendation_type="club")
+
+        candidates = chatbot_routes.select_recommendation_candidates(
+            "recommend a club", {"skills": ["python"], "interests": ["robots"]}, plan
+        )
+        assert {c["name"] for c in candidates} == {"Coding Club", "Robotics Club"}
+        assert sum(len(json.dumps(c)) for c in candidates) // 4 <= 60
+
+
+class TestKeywordIndex:
+    """Test profile keyword matching for chatbot recommendations"""
+
+    def setup_method(self):
+        from utils.search_index import KeywordIndex, recommendation_club_text
+
+        self.clubs = _clubs() + [{"name": "Maintenance Crew", "description": "Campus upkeep"}]
+        self.index = KeywordIndex(self.clubs, recommendation_club_text)
+
+    def test_keywords_match_whole_tokens(self):
+        assert self.index.matching("Python") == {1}
+        assert self.index.matching("competitive programming") == {1}
+        # "ai" is not a word of "maintenance"
+        assert self.index.matching("ai") == set()
+        assert self.index.matching("") == set()
+
+    def test_top_k_by_keyword_count_then_catalog_order(self):
+        top = self.index.top_k(["python", "java", "robots", "acting"], 2)
+        assert [club["name"] for club in top] == ["Coding Club", "Robotics Club"]
+        assert self.index.top_k(["gardening"], 3) == []
+
+    def test_chatbot_recommenders_use_the_index(self):
+        from routes.chatbot_routes import recommend_clubs
+
+        profile = {"skills": ["Python"], "interests": ["Stage plays"], "achievements": []}
+        assert [c["name"] for c in recommend_clubs(profile, self.index)] == ["Coding Club", "Drama Club"]
+        assert recommend_clubs(None, self.index) == []
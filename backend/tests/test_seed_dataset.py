@@ -0,0 +1,41 @@
+# backend/tests/test_seed_dataset.py
+from utils.seed_dataset import (
+    generate_clubs, generate_performance_records, generate_users, plan_chunks, registration_pair, seeded_id
+)
+
+COUNTS = {"users": 1000, "clubs": 20, "events": 50, "registrations": 5000, "performance_records": 2000}
+
+
+class TestSeedDataset:
+    """Test the synthetic dataset generators (no database needed)"""
+
+    def test_ids_are_deterministic_and_distinct_per_kind(self):
+        assert seeded_id("users", 5) == seeded_id("users", 5)
+        assert seeded_id("users", 5) != seeded_id("events", 5)
+
+    def test_generation_is_reproducible(self):
+        first = list(generate_performance_records(0, 200, COUNTS, 42, "hash"))
+        second = list(generate_performance_records(0, 200, COUNTS, 42, "hash"))
+        assert first == second
+        assert all(0 <= doc["score"] <= 100 for _, doc in first)
+
+    def test_users_come_with_profiles(self):
+        docs = list(generate_users(10, 15, COUNTS, 42, "hash"))
+        users = [d for c, d in docs if c == "users"]
+        profiles = [d for c, d in docs if c == "student_profiles"]
+        assert len(users) == len(profiles) == 5
+        assert [p["user_id"] for p in profiles] == [u["_id"] for u in users]
+
+    def test_club_members_reference_seeded_users(self):
+        user_ids = {seeded_id("users", i) for i in range(COUNTS["users"])}
+        for collection, doc in generate_clubs(0, COUNTS["clubs"], COUNTS, 42, "hash"):
+            if collection == "clubs":
+                assert set(doc["members"]) <= user_ids
+                assert not set(doc["requests"]) & set(doc["members"])
+
+    def test_registrations_never_repeat_for_an_event(self):
+        pairs = {registration_pair(i, COUNTS["events"], COUNTS["users"]) for i in range(COUNTS["registrations"])}
+        assert len(pairs) == COUNTS["registrations"]
+
+    def test_plan_chunks(self):
+        assert plan_chunks(25, 10) == [(0, 10), (10, 20), (20, 25)]
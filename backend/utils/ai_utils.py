@@ -6,29 +6,167 @@ from datetime import datetime, timedelta
 import logging
 from config.db import db
 from models.performance_model import AIPrediction, AIImprovementSuggestion
-import openai
-import google.generativeai as genai
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import StandardScaler
 import numpy as np
+from pymongo import ReplaceOne
+from pymongo.errors import BulkWriteError
+from utils.job_queue import job_queue
+from utils.llm_client import llm_client, LLMError
 
 logger = logging.getLogger(__name__)
 
 AI_PREDICTIONS_COLLECTION = "ai_predictions"
 AI_SUGGESTIONS_COLLECTION = "ai_suggestions"
+AI_PREDICTIONS_HISTORY_COLLECTION = "ai_predictions_history"
+AI_SUGGESTIONS_HISTORY_COLLECTION = "ai_suggestions_history"
+
+DUPLICATE_KEY = 11000
+
+# ai_predictions / ai_suggestions hold only the latest document per student;
+# past generations are optionally kept in *_history for AI_HISTORY_TTL_DAYS
+HISTORY_COLLECTIONS = {
+    AI_PREDICTIONS_COLLECTION: AI_PREDICTIONS_HISTORY_COLLECTION,
+    AI_SUGGESTIONS_COLLECTION: AI_SUGGESTIONS_HISTORY_COLLECTION,
+}
+
+def history_enabled() -> bool:
+    return os.getenv("AI_HISTORY_ENABLED", "false").lower() == "true"
+
+async def save_latest(collection: str, doc: Dict[str, Any]):
+    """Upsert the student's latest document and append it to history if enabled."""
+    await db[collection].replace_one({"student_id": doc["student_id"]}, doc, upsert=True)
+    if history_enabled():
+        await db[HISTORY_COLLECTIONS[collection]].insert_one(dict(doc))
+
+async def _dedupe_latest(collection: str):
+    """Keep the newest document per student so the unique index can be built."""
+    duplicates = db[collection].aggregate([
+        {"$sort": {"student_id": 1, "generated_at": -1}},
+        {"$group": {"_id": "$student_id", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ], allowDiskUse=True)
+    removed = 0
+    async for group in duplicates:
+        stale = group["ids"][1:]
+        if history_enabled():
+            older = await db[collection].find({"_id": {"$in": stale}}).to_list(None)
+            try:
+                if older:
+                    await db[HISTORY_COLLECTIONS[collection]].insert_many(older, ordered=False)
+            except BulkWriteError as e:
+                # Copied by another worker or by an earlier run that stopped before deleting
+                if any(err.get("code") != DUPLICATE_KEY for err in e.details.get("writeErrors", [])):
+                    raise
+        result = await db[collection].delete_many({"_id": {"$in": stale}})
+        removed += result.deleted_count
+    if removed:
+        logger.info(f"Removed {removed} superseded documents from {collection}")
+
+async def ensure_ai_indexes():
+    """One document per student in the latest collections; TTL-expired history."""
+    ttl_seconds = int(os.getenv("AI_HISTORY_TTL_DAYS", 90)) * 86400
+    for collection, history in HISTORY_COLLECTIONS.items():
+        await _dedupe_latest(collection)
+        await db[collection].create_index("student_id", unique=True)
+        await db[history].create_index([("student_id", 1), ("generated_at", -1)])
+        await db[history].create_index("generated_at", expireAfterSeconds=ttl_seconds, name="history_ttl")
+
+MIN_RECORDS_FOR_PREDICTION = 3
+PREDICTION_HORIZON_DAYS = 30
+
+def fit_linear_trends(groups: np.ndarray, x: np.ndarray, y: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Least-squares line per group in one pass using np.bincount sums.
+    `groups` holds contiguous 0-based group codes. Matches sklearn's
+    LinearRegression fit and R^2 (1.0 for a constant series).
+    """
+    n = np.bincount(groups).astype(float)
+    sx = np.bincount(groups, weights=x)
+    sy = np.bincount(groups, weights=y)
+    sxx = np.bincount(groups, weights=x * x)
+    sxy = np.bincount(groups, weights=x * y)
+    syy = np.bincount(groups, weights=y * y)
+
+    cov_xy = sxy - sx * sy / n
+    var_x = sxx - sx * sx / n
+    var_y = syy - sy * sy / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(var_x > 1e-12, cov_xy / var_x, 0.0)
+        r_squared = np.where(var_y > 1e-12, slope * cov_xy / var_y, 1.0)
+    intercept = (sy - slope * sx) / n
+
+    return {"count": n.astype(int), "slope": slope, "intercept": intercept, "r_squared": np.clip(r_squared, 0.0, 1.0)}
+
+def classify_trend(slope: float) -> str:
+    if slope > 0.5:
+        return "improving"
+    if slope < -0.5:
+        return "declining"
+    return "stable"
+
+def trend_suggestions(trend: str, predicted_score: float) -> List[str]:
+    """Rule-based suggestions for a predicted trend and score."""
+    suggestions = []
+
+    if trend == "declining":
+        suggestions.extend([
+            "Increase study time and focus on weak subjects",
+            "Consider tutoring or additional help",
+            "Review and practice regularly"
+        ])
+    elif trend == "stable":
+        suggestions.extend([
+            "Try new learning techniques to improve performance",
+            "Set specific goals for improvement",
+            "Focus on understanding concepts deeply"
+        ])
+    elif trend == "improving":
+        suggestions.extend([
+            "Maintain current study habits",
+            "Continue building on strengths",
+            "Challenge yourself with advanced topics"
+        ])
+
+    # Add prediction-based suggestions
+    if predicted_score < 60:
+        suggestions.append("Based on current trend, focus on immediate improvement to avoid falling below passing grade")
+    elif predicted_score > 85:
+        suggestions.append("Keep up the excellent work - you're on track for high achievement")
+
+    return suggestions[:5]  # Limit to 5 suggestions
+
+def build_predictions(student_ids: List[str], groups: np.ndarray, x: np.ndarray, y: np.ndarray, now: datetime) -> List[AIPrediction]:
+    """Fit every student's trend at once and turn the fits into predictions."""
+    fits = fit_linear_trends(groups, x, y)
+    # Records are time-ordered within a group, so the last x is the group max
+    last_x = np.zeros(len(student_ids))
+    np.maximum.at(last_x, groups, x)
+    predicted = fits["intercept"] + fits["slope"] * (last_x + PREDICTION_HORIZON_DAYS)
+
+    predictions = []
+    for code, student_id in enumerate(student_ids):
+        if fits["count"][code] < MIN_RECORDS_FOR_PREDICTION:
+            continue
+        trend = classify_trend(float(fits["slope"][code]))
+        score = float(predicted[code])
+        predictions.append(AIPrediction(
+            student_id=student_id,
+            predicted_score=round(max(0, min(100, score)), 1),
+            confidence=round(min(float(fits["r_squared"][code]) * 100, 95), 1),  # Cap at 95%
+            trend=trend,
+            suggestions=trend_suggestions(trend, score),
+            generated_at=now
+        ))
+    return predictions
+
+def rule_based_suggestions(weak_areas: List[str]) -> List[str]:
+    """Suggestions used when no LLM is configured or the LLM is failing."""
+    suggestions = [f"Schedule extra practice sessions for {area}" for area in weak_areas[:3]]
+    suggestions.extend(["Consider regular study sessions", "Seek feedback from instructors", "Practice consistently"])
+    return suggestions[:5]
 
 class AIService:
-    def __init__(self):
-        # Initialize OpenAI
-        openai.api_key = os.getenv("OPENAI_API_KEY")
-
-        # Initialize Google AI
-        google_api_key = os.getenv("GOOGLE_AI_API_KEY")
-        if google_api_key:
-            genai.configure(api_key=google_api_key)
-            self.google_model = genai.GenerativeModel('gemini-pro')
-        else:
-            self.google_model = None
+    def __init__(self, llm=None):
+        self.llm = llm or llm_client
 
     async def predict_performance_trend(self, student_id: str) -> AIPrediction:
         """Predict future performance trend using historical data."""
@@ -39,7 +177,7 @@ class AIService:
             async for record in records_cursor:
                 records.append(record)
 
-            if len(records) < 3:
+            if len(records) < MIN_RECORDS_FOR_PREDICTION:
                 return AIPrediction(
                     student_id=student_id,
                     predicted_score=0,
@@ -49,48 +187,14 @@ class AIService:
                     generated_at=datetime.utcnow()
                 )
 
-            # Prepare data for ML prediction
-            dates = [(r["created_at"] - records[0]["created_at"]).days for r in records]
-            scores = [r["score"] for r in records]
-
-            # Simple linear regression for trend prediction
-            X = np.array(dates).reshape(-1, 1)
-            y = np.array(scores)
-
-            model = LinearRegression()
-            model.fit(X, y)
-
-            # Predict next score (30 days from last record)
-            next_date = dates[-1] + 30
-            predicted_score = model.predict([[next_date]])[0]
-
-            # Calculate confidence based on R-squared
-            r_squared = model.score(X, y)
-            confidence = min(r_squared * 100, 95)  # Cap at 95%
-
-            # Determine trend
-            slope = model.coef_[0]
-            if slope > 0.5:
-                trend = "improving"
-            elif slope < -0.5:
-                trend = "declining"
-            else:
-                trend = "stable"
-
-            # Generate AI-powered suggestions
-            suggestions = await self._generate_improvement_suggestions(records, trend, predicted_score)
-
-            prediction = AIPrediction(
-                student_id=student_id,
-                predicted_score=round(max(0, min(100, predicted_score)), 1),
-                confidence=round(confidence, 1),
-                trend=trend,
-                suggestions=suggestions,
-                generated_at=datetime.utcnow()
-            )
+            # Same vectorized fit the nightly batch uses, for a single group
+            x = np.array([(r["created_at"] - records[0]["created_at"]).days for r in records], dtype=float)
+            y = np.array([r["score"] for r in records], dtype=float)
+            groups = np.zeros(len(records), dtype=np.int64)
+            prediction = build_predictions([student_id], groups, x, y, datetime.utcnow())[0]
 
             # Save to database
-            await db[AI_PREDICTIONS_COLLECTION].insert_one(prediction.dict())
+            await save_latest(AI_PREDICTIONS_COLLECTION, prediction.dict())
 
             return prediction
 
@@ -152,7 +256,7 @@ class AIService:
             )
 
             # Save to database
-            await db[AI_SUGGESTIONS_COLLECTION].insert_one(improvement_suggestion.dict())
+            await save_latest(AI_SUGGESTIONS_COLLECTION, improvement_suggestion.dict())
 
             return improvement_suggestion
 
@@ -196,21 +300,15 @@ class AIService:
             Return only the suggestions as a JSON array of strings.
             """
 
-            if self.google_model:
-                # Use Google AI
-                response = self.google_model.generate_content(prompt)
-                suggestions_text = response.text.strip()
-            elif openai.api_key:
-                # Use OpenAI
-                response = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=300,
-                    temperature=0.7
-                )
-                suggestions_text = response.choices[0].message.content.strip()
-            else:
-                return ["Consider regular study sessions", "Seek feedback from instructors", "Practice consistently"]
+            if not self.llm.available:
+                return rule_based_suggestions(weak_areas)
+
+            try:
+                suggestions_text = await self.llm.complete(prompt, max_tokens=300, temperature=0.7)
+            except LLMError as e:
+                # Timeouts and an open circuit land here without waiting on the provider
+                logger.warning(f"LLM suggestions unavailable, using rule-based ones: {e}")
+                return rule_based_suggestions(weak_areas)
 
             # Parse JSON response
             try:
@@ -226,44 +324,78 @@ class AIService:
 
     async def _generate_improvement_suggestions(self, records: List[Dict], trend: str, predicted_score: float) -> List[str]:
         """Generate suggestions based on trend and prediction."""
-        suggestions = []
-
-        if trend == "declining":
-            suggestions.extend([
-                "Increase study time and focus on weak subjects",
-                "Consider tutoring or additional help",
-                "Review and practice regularly"
-            ])
-        elif trend == "stable":
-            suggestions.extend([
-                "Try new learning techniques to improve performance",
-                "Set specific goals for improvement",
-                "Focus on understanding concepts deeply"
-            ])
-        elif trend == "improving":
-            suggestions.extend([
-                "Maintain current study habits",
-                "Continue building on strengths",
-                "Challenge yourself with advanced topics"
-            ])
-
-        # Add prediction-based suggestions
-        if predicted_score < 60:
-            suggestions.append("Based on current trend, focus on immediate improvement to avoid falling below passing grade")
-        elif predicted_score > 85:
-            suggestions.append("Keep up the excellent work - you're on track for high achievement")
-
-        return suggestions[:5]  # Limit to 5 suggestions
+        return trend_suggestions(trend, predicted_score)
 
 # Global AI service instance
 ai_service = AIService()
 
+@job_queue.task("ai.refresh_suggestions", max_attempts=3, visibility_timeout=120)
+async def refresh_suggestions_job(payload: Dict[str, Any]):
+    """Background job: regenerate improvement suggestions after new performance data."""
+    await ai_service.generate_improvement_suggestions(payload["student_id"])
+
+async def _flush_predictions(student_ids: List[str], groups: List[int], x: List[float], y: List[float], now: datetime) -> int:
+    if not student_ids:
+        return 0
+    predictions = build_predictions(
+        student_ids,
+        np.array(groups, dtype=np.int64),
+        np.array(x, dtype=float),
+        np.array(y, dtype=float),
+        now,
+    )
+    if predictions:
+        docs = [p.dict() for p in predictions]
+        await db[AI_PREDICTIONS_COLLECTION].bulk_write(
+            [ReplaceOne({"student_id": doc["student_id"]}, doc, upsert=True) for doc in docs],
+            ordered=False,
+        )
+        if history_enabled():
+            await db[AI_PREDICTIONS_HISTORY_COLLECTION].insert_many([dict(doc) for doc in docs], ordered=False)
+    return len(predictions)
+
+async def precompute_predictions(chunk_rows: int = 200_000) -> int:
+    """
+    Nightly batch: stream every record ordered by (student_id, created_at),
+    fit all students of a chunk in one vectorized pass and upsert one
+    prediction per student. Chunks only break between students.
+    """
+    cursor = db["performance_records"].find(
+        {}, {"_id": 0, "student_id": 1, "created_at": 1, "score": 1}
+    ).sort([("student_id", 1), ("created_at", 1)]).batch_size(10_000)
+
+    now = datetime.utcnow()
+    total = 0
+    student_ids: List[str] = []
+    groups: List[int] = []
+    x: List[float] = []
+    y: List[float] = []
+    current, first_date = None, None
+
+    async for record in cursor:
+        if record.get("score") is None or record.get("created_at") is None:
+            continue
+        if record["student_id"] != current:
+            if len(x) >= chunk_rows:
+                total += await _flush_predictions(student_ids, groups, x, y, now)
+                student_ids, groups, x, y = [], [], [], []
+            current, first_date = record["student_id"], record["created_at"]
+            student_ids.append(current)
+        groups.append(len(student_ids) - 1)
+        x.append((record["created_at"] - first_date).days)
+        y.append(record["score"])
+
+    total += await _flush_predictions(student_ids, groups, x, y, now)
+    logger.info(f"Precomputed AI predictions for {total} students")
+    return total
+
 # Convenience functions
 async def get_or_create_prediction(student_id: str) -> AIPrediction:
     """Get existing prediction or create new one."""
     # Check for recent prediction (within 7 days)
     recent_prediction = await db[AI_PREDICTIONS_COLLECTION].find_one(
-        {"student_id": student_id, "generated_at": {"$gte": datetime.utcnow() - timedelta(days=7)}}
+        {"student_id": student_id, "generated_at": {"$gte": datetime.utcnow() - timedelta(days=7)}},
+        sort=[("generated_at", -1)]
     )
 
     if recent_prediction:
@@ -278,7 +410,8 @@ async def get_or_create_suggestions(student_id: str) -> AIImprovementSuggestion:
     """Get existing suggestions or create new ones."""
     # Check for recent suggestions (within 7 days)
     recent_suggestions = await db[AI_SUGGESTIONS_COLLECTION].find_one(
-        {"student_id": student_id, "generated_at": {"$gte": datetime.utcnow() - timedelta(days=7)}}
+        {"student_id": student_id, "generated_at": {"$gte": datetime.utcnow() - timedelta(days=7)}},
+        sort=[("generated_at", -1)]
     )
 
     if recent_suggestions:
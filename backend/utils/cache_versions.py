@@ -0,0 +1,18 @@
+# backend/utils/cache_versions.py
+"""
+Shared version stamps for per-process caches.
+Each uvicorn worker keeps its own in-memory caches; a counter document in
+MongoDB lets a write handled by one worker invalidate the others.
+"""
+from config.db import db
+
+CACHE_VERSIONS_COLLECTION = "cache_versions"
+
+
+async def get_version(key: str) -> int:
+    doc = await db[CACHE_VERSIONS_COLLECTION].find_one({"_id": key})
+    return doc["version"] if doc else 0
+
+
+async def bump_version(key: str):
+    await db[CACHE_VERSIONS_COLLECTION].update_one({"_id": key}, {"$inc": {"version": 1}}, upsert=True)
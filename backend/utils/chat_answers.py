@@ -0,0 +1,78 @@
+# backend/utils/chat_answers.py
+"""
+Answer cache for the chatbot.
+Answers are keyed by route type, subject (folded question, entity name or
+profile hash) and the chat context snapshot version, so a club/event/
+teacher write makes every answer that could mention it unreachable.
+Counters estimate the LLM calls, latency, tokens and cost saved by cache
+hits and by questions answered locally (see utils.chat_intents).
+"""
+import os
+from typing import Any, Dict, Optional
+
+from utils.llm_cache import LLMCache
+from utils.text_keys import tokenize
+
+
+def normalize_question(question: str) -> str:
+    """Folded word tokens only, so case, accents and punctuation don't split entries."""
+    return " ".join(tokenize(question))
+
+
+class ChatAnswerCache:
+    def __init__(self, cache: LLMCache, cost_per_1k_tokens: float = 0.002):
+        self.cache = cache
+        self.cost_per_1k_tokens = cost_per_1k_tokens
+        self.stats = {"llm_calls": 0, "llm_seconds": 0.0, "llm_tokens": 0, "hits": 0, "misses": 0, "local_answers": 0}
+
+    def key(self, route: str, subject: Any, context_version: str) -> str:
+        return self.cache.make_key(route, subject, context_version)
+
+    async def get(self, key: str) -> Optional[str]:
+        message = await self.cache.get(key)
+        self.stats["hits" if message is not None else "misses"] += 1
+        return message
+
+    async def set(self, key: str, message: str):
+        await self.cache.set(key, message)
+
+    def record_call(self, seconds: float, tokens: int = 0):
+        """Account for one LLM round trip that the cache could not answer."""
+        self.stats["llm_calls"] += 1
+        self.stats["llm_seconds"] += seconds
+        self.stats["llm_tokens"] += tokens
+
+    def record_local_answer(self):
+        """Account for a question answered from the database without the LLM."""
+        self.stats["local_answers"] += 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        calls = self.stats["llm_calls"]
+        hits = self.stats["hits"]
+        saved = hits + self.stats["local_answers"]
+        # Each saved call is assumed to have cost what an average LLM call cost
+        avg_seconds = self.stats["llm_seconds"] / calls if calls else 0.0
+        avg_tokens = self.stats["llm_tokens"] / calls if calls else 0.0
+        lookups = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": round(hits / lookups, 3) if lookups else None,
+            "avg_llm_seconds": round(avg_seconds, 3),
+            "saved_calls": saved,
+            "saved_seconds": round(saved * avg_seconds, 1),
+            "saved_tokens": int(saved * avg_tokens),
+            "saved_cost_usd": round(saved * avg_tokens / 1000 * self.cost_per_1k_tokens, 4),
+            "cache": self.cache.get_metrics(),
+        }
+
+
+# Global chatbot answer cache
+chat_answer_cache = ChatAnswerCache(
+    LLMCache(
+        "chat_answers",
+        ttl_seconds=int(os.getenv("CHAT_ANSWER_CACHE_TTL_SECONDS", 6 * 3600)),
+        max_entries=int(os.getenv("CHAT_ANSWER_CACHE_MAX_ENTRIES", 20000)),
+        memory_entries=1024,
+    ),
+    cost_per_1k_tokens=float(os.getenv("CHAT_COST_PER_1K_TOKENS", 0.002)),
+)
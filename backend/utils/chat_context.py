@@ -0,0 +1,147 @@
+# backend/utils/chat_context.py
+"""
+In-memory snapshot of the data the chatbot answers from (clubs, events,
+teachers and a few students), so a chat message needs no context queries.
+
+The snapshot is rebuilt when it is older than CHAT_CONTEXT_TTL_SECONDS or
+after a club/event/teacher write. Writes bump a shared version stamp, which
+other workers check at most every CHAT_CONTEXT_STAMP_CHECK_SECONDS.
+Structures derived from a snapshot (matchers, search indexes) are memoized
+on it and rebuilt with it.
+"""
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from config.db import db
+from utils.cache_versions import bump_version, get_version
+from utils.llm_cache import content_hash
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_VERSION_KEY = "chat_context"
+
+CLUB_FIELDS = {"_id": 0, "name": 1, "description": 1, "faculty_incharge": 1, "members_count": 1, "approved": 1}
+EVENT_FIELDS = {"_id": 0, "title": 1, "description": 1, "date": 1, "venue": 1, "clubName": 1, "tags": 1}
+TEACHER_FIELDS = {"_id": 0, "name": 1, "department": 1, "email": 1, "phone": 1}
+STUDENT_FIELDS = {"_id": 0, "name": 1, "roll_no": 1, "year": 1, "email": 1}
+STUDENT_SAMPLE_SIZE = 10
+
+
+class ContextSnapshot:
+    def __init__(self, clubs: List[dict], events: List[dict], teachers: List[dict], students: List[dict], stamp: int):
+        self.clubs = clubs
+        self.events = events
+        self.teachers = teachers
+        self.students = students
+        self.stamp = stamp
+        self.built_at = datetime.utcnow()
+        self.loaded_at = time.monotonic()
+        # Same data gives the same version in every worker
+        self.version = content_hash(clubs, events, teachers, students)[:16]
+        self._derived: Dict[str, Any] = {}
+
+    @property
+    def context(self) -> Dict[str, List[dict]]:
+        return {"clubs": self.clubs, "events": self.events, "teachers": self.teachers, "students": self.students}
+
+    def derived(self, name: str, build: Callable[["ContextSnapshot"], Any]) -> Any:
+        """Build a structure from this snapshot once and reuse it until the snapshot is replaced."""
+        if name not in self._derived:
+            self._derived[name] = build(self)
+        return self._derived[name]
+
+
+class ChatContextCache:
+    def __init__(self, ttl_seconds: float = 300, stamp_check_seconds: float = 5):
+        self.ttl_seconds = ttl_seconds
+        self.stamp_check_seconds = stamp_check_seconds
+        self.snapshot: Optional[ContextSnapshot] = None
+        self.stale = True
+        self.stamp_checked_at = 0.0
+        self.lock = asyncio.Lock()
+        self.builders: Dict[str, Callable[[ContextSnapshot], Any]] = {}
+        self.metrics = {"hits": 0, "refreshes": 0, "stamp_checks": 0, "errors": 0}
+
+    def register_derived(self, name: str, build: Callable[[ContextSnapshot], Any]):
+        """Build `name` eagerly on every refresh instead of on the first message that needs it."""
+        self.builders[name] = build
+
+    async def load(self, stamp: int) -> ContextSnapshot:
+        clubs = await db.clubs.find({}, CLUB_FIELDS).to_list(None)
+        events = await db.events.find({}, EVENT_FIELDS).to_list(None)
+        teachers = await db.teachers.find({}, TEACHER_FIELDS).to_list(None)
+        students = await db.users.find({"role": "student"}, STUDENT_FIELDS).to_list(STUDENT_SAMPLE_SIZE)
+        return ContextSnapshot(clubs, events, teachers, students, stamp)
+
+    async def refresh(self) -> ContextSnapshot:
+        async with self.lock:
+            stamp = await get_version(CONTEXT_VERSION_KEY)
+            snapshot = await self.load(stamp)
+            for name, build in self.builders.items():
+                snapshot.derived(name, build)
+            self.snapshot = snapshot
+            # A write landing during the load bumps the stamp and is caught by the next check
+            self.stale = False
+            self.stamp_checked_at = time.monotonic()
+            self.metrics["refreshes"] += 1
+            logger.info(
+                f"Loaded chat context {self.snapshot.version}: {len(self.snapshot.clubs)} clubs, "
+                f"{len(self.snapshot.events)} events, {len(self.snapshot.teachers)} teachers"
+            )
+            return self.snapshot
+
+    async def _stamp_changed(self) -> bool:
+        if time.monotonic() - self.stamp_checked_at < self.stamp_check_seconds:
+            return False
+        self.stamp_checked_at = time.monotonic()
+        self.metrics["stamp_checks"] += 1
+        return await get_version(CONTEXT_VERSION_KEY) != self.snapshot.stamp
+
+    async def get(self) -> ContextSnapshot:
+        snapshot = self.snapshot
+        if snapshot is None:
+            return await self.refresh()
+
+        expired = time.monotonic() - snapshot.loaded_at >= self.ttl_seconds
+        try:
+            if self.stale or expired or await self._stamp_changed():
+                self.stale = True
+                if self.lock.locked():
+                    # Someone is already rebuilding; answer from the previous snapshot meanwhile
+                    return snapshot
+                return await self.refresh()
+        except Exception as e:
+            # Serving slightly old context beats failing the chat message
+            self.metrics["errors"] += 1
+            logger.warning(f"Chat context refresh failed, serving version {snapshot.version}: {e}")
+            return snapshot
+
+        self.metrics["hits"] += 1
+        return snapshot
+
+    async def invalidate(self):
+        """Call after writing clubs, events or teachers."""
+        self.stale = True
+        await bump_version(CONTEXT_VERSION_KEY)
+
+    def get_status(self) -> Dict[str, Any]:
+        snapshot = self.snapshot
+        return {
+            "version": snapshot.version if snapshot else None,
+            "built_at": snapshot.built_at if snapshot else None,
+            "clubs": len(snapshot.clubs) if snapshot else 0,
+            "events": len(snapshot.events) if snapshot else 0,
+            "teachers": len(snapshot.teachers) if snapshot else 0,
+            **self.metrics,
+        }
+
+
+# Global chat context cache (one snapshot per worker process)
+chat_context = ChatContextCache(
+    ttl_seconds=float(os.getenv("CHAT_CONTEXT_TTL_SECONDS", 300)),
+    stamp_check_seconds=float(os.getenv("CHAT_CONTEXT_STAMP_CHECK_SECONDS", 5)),
+)
@@ -0,0 +1,188 @@
+# backend/utils/chat_intents.py
+"""
+Local intent and slot classifier for chatbot questions.
+Structured questions ("list upcoming events", "who teaches the robotics
+club", "when is Hackathon 2025") are answered from the database without an
+LLM call; anything classified below the confidence threshold is "open" and
+goes to the LLM.
+
+Slots come from the entity matcher. Matched names are replaced by <club> /
+<event> placeholders before classification, so the model learns sentence
+shapes rather than names.
+
+The model alone is too eager on questions unlike its examples ("who is
+the president of <club>" looks like a teacher question), so a structured
+intent is only accepted when the question also contains one of its cue
+words and none of its blocking words.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+
+from utils.entity_matcher import EntityMatcher
+from utils.text_keys import tokenize
+
+OPEN = "open"
+
+# Intent -> slot it needs (None = no slot)
+INTENT_SLOTS = {
+    "upcoming_events": None,
+    "list_clubs": None,
+    "club_teachers": "club",
+    "event_when": "event",
+    "event_where": "event",
+    OPEN: None,
+}
+
+# Words a question must contain (any of) before an intent is answered locally
+INTENT_CUES = {
+    "upcoming_events": {"upcoming", "next", "coming", "soon", "happening", "scheduled", "this", "today", "tomorrow"},
+    "list_clubs": {"list", "all", "clubs", "many"},
+    "club_teachers": {
+        "teach", "teaches", "teacher", "teachers", "faculty", "incharge", "charge", "mentor", "mentors",
+        "coordinator", "professor", "guides", "staff",
+    },
+    "event_when": {"when", "date", "time", "day", "start", "starts", "begin", "begins"},
+    "event_where": {"where", "venue", "hall", "location", "place", "held", "room"},
+}
+
+# Words that send a question to the LLM even when the intent and cue match
+INTENT_BLOCKERS = {
+    "upcoming_events": {
+        "past", "previous", "last", "earlier", "ago", "yesterday", "attended", "attend", "did", "was", "were",
+        "my", "i", "registered", "completed",
+    },
+    "list_clubs": {"best", "good", "better", "should", "recommend", "suggest", "why", "worth", "my", "joined"},
+    "club_teachers": {"president", "leader", "lead", "leads", "head", "captain", "secretary", "member", "members", "student", "students"},
+    "event_when": {"free", "cost", "fee", "fees", "price", "register", "registration", "worth", "deadline"},
+    "event_where": {"free", "cost", "fee", "fees", "price", "register", "registration", "worth"},
+}
+
+TRAINING_EXAMPLES: List[Tuple[str, str]] = [
+    ("list upcoming events", "upcoming_events"),
+    ("what events are this week", "upcoming_events"),
+    ("what events are coming up", "upcoming_events"),
+    ("show me the next events", "upcoming_events"),
+    ("any events soon", "upcoming_events"),
+    ("which events are happening this month", "upcoming_events"),
+    ("upcoming events on campus", "upcoming_events"),
+    ("what's happening on campus this weekend", "upcoming_events"),
+    ("list all clubs", "list_clubs"),
+    ("what clubs are there", "list_clubs"),
+    ("which clubs can i join", "list_clubs"),
+    ("show me the clubs on campus", "list_clubs"),
+    ("how many clubs do we have", "list_clubs"),
+    ("name the student clubs", "list_clubs"),
+    ("who teaches the <club>", "club_teachers"),
+    ("who teaches <club>", "club_teachers"),
+    ("who is the faculty in charge of <club>", "club_teachers"),
+    ("which teacher runs the <club>", "club_teachers"),
+    ("who is the mentor for <club>", "club_teachers"),
+    ("faculty coordinator of <club>", "club_teachers"),
+    ("who guides the <club>", "club_teachers"),
+    ("who handles <club>", "club_teachers"),
+    ("when is <event>", "event_when"),
+    ("what date is <event>", "event_when"),
+    ("when does <event> start", "event_when"),
+    ("what time is <event>", "event_when"),
+    ("date of <event>", "event_when"),
+    ("when is the <event> happening", "event_when"),
+    ("where is <event>", "event_where"),
+    ("what is the venue for <event>", "event_where"),
+    ("where will <event> be held", "event_where"),
+    ("venue of <event>", "event_where"),
+    ("which hall is <event> in", "event_where"),
+    ("where does <event> take place", "event_where"),
+    ("how do i become a better programmer", OPEN),
+    ("tell me about campus life", OPEN),
+    ("what should i study for exams", OPEN),
+    ("give me tips for my first semester", OPEN),
+    ("why should i join a club", OPEN),
+    ("how often do clubs meet", OPEN),
+    ("can i join more than one club", OPEN),
+    ("how do i register for events", OPEN),
+    ("do events give attendance credit", OPEN),
+    ("how can i start my own club", OPEN),
+    ("what is machine learning", OPEN),
+    ("tell me about <club>", OPEN),
+    ("what does <club> do", OPEN),
+    ("describe <event>", OPEN),
+    ("is <event> worth attending", OPEN),
+    ("who is the president of <club>", OPEN),
+    ("who leads <club>", OPEN),
+    ("who are the members of <club>", OPEN),
+    ("is <event> free", OPEN),
+    ("how much does <event> cost", OPEN),
+    ("how do i register for <event>", OPEN),
+    ("list past events", OPEN),
+    ("what events did i attend last week", OPEN),
+    ("which events have i registered for", OPEN),
+    ("which clubs have i joined", OPEN),
+    ("hello", OPEN),
+    ("thanks", OPEN),
+]
+
+
+class IntentResult:
+    def __init__(self, intent: str, confidence: float, slots: Dict[str, str]):
+        self.intent = intent
+        self.confidence = confidence
+        self.slots = slots
+
+    def __repr__(self) -> str:
+        return f"IntentResult({self.intent!r}, {self.confidence:.2f}, {self.slots!r})"
+
+
+class IntentClassifier:
+    def __init__(self, examples: List[Tuple[str, str]] = TRAINING_EXAMPLES, threshold: float = 0.5):
+        self.threshold = threshold
+        texts = [text for text, _ in examples]
+        self.model = make_pipeline(
+            # Keep <club> / <event> placeholders as single tokens
+            TfidfVectorizer(ngram_range=(1, 2), token_pattern=r"<\w+>|\w+", sublinear_tf=True),
+            LogisticRegression(C=10, max_iter=1000),
+        )
+        self.model.fit(texts, [intent for _, intent in examples])
+
+    @staticmethod
+    def delexicalize(tokens: List[str], spans: Dict[str, Tuple[int, int, str]]) -> List[str]:
+        """Replace matched entity spans with their placeholder token."""
+        result = list(tokens)
+        limit = len(tokens)
+        # Right to left so earlier offsets stay valid; skip a span overlapping one already replaced
+        for entity_type, (start, length, _) in sorted(spans.items(), key=lambda item: -item[1][0]):
+            if start + length <= limit:
+                result[start:start + length] = [f"<{entity_type}>"]
+                limit = start
+        return result
+
+    def classify(self, question: str, matcher: Optional[EntityMatcher] = None) -> IntentResult:
+        tokens = tokenize(question)
+        spans = matcher.match_spans(tokens) if matcher else {}
+        text = " ".join(self.delexicalize(tokens, spans))
+        probabilities = self.model.predict_proba([text])[0]
+        best = int(probabilities.argmax())
+        intent, confidence = str(self.model.classes_[best]), float(probabilities[best])
+        slots = {entity_type: name for entity_type, (_, _, name) in spans.items()}
+
+        needed = INTENT_SLOTS.get(intent)
+        if confidence < self.threshold or (needed and needed not in slots):
+            return IntentResult(OPEN, confidence, slots)
+        # Cue words are checked outside entity names, so "Time Travel Expo" is no date question
+        words = set(text.split())
+        if intent != OPEN and (not words & INTENT_CUES[intent] or words & INTENT_BLOCKERS[intent]):
+            return IntentResult(OPEN, confidence, slots)
+        return IntentResult(intent, confidence, slots)
+
+
+_classifier: Optional[IntentClassifier] = None
+
+
+def get_intent_classifier() -> IntentClassifier:
+    """Train on first use; fitting the seed examples takes a few milliseconds."""
+    global _classifier
+    if _classifier is None:
+        _classifier = IntentClassifier()
+    return _classifier
@@ -0,0 +1,173 @@
+# backend/utils/chat_log.py
+"""
+Write-behind logger for chatbot exchanges.
+Chat requests append to an in-process buffer and return; the buffer is
+written with one insert_many when it reaches CHAT_LOG_BATCH_SIZE entries
+or every CHAT_LOG_FLUSH_SECONDS, and once more on shutdown. Failed
+batches are retried on the next flush (entries carry their _id, so a
+partly written batch is not duplicated); past CHAT_LOG_MAX_BUFFER the
+oldest unwritten entries are dropped.
+
+Retention: a daily job moves logs older than CHAT_LOG_ARCHIVE_DAYS to
+chat_logs_archive as question/answer pairs, which expire after
+CHAT_LOG_ARCHIVE_TTL_DAYS. A TTL index on chat_logs removes anything the
+archive job missed after twice the archive age.
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import BulkWriteError
+
+from config.db import db
+
+logger = logging.getLogger(__name__)
+
+CHAT_LOGS_COLLECTION = "chat_logs"
+CHAT_LOGS_ARCHIVE_COLLECTION = "chat_logs_archive"
+
+ARCHIVE_AFTER_DAYS = int(os.getenv("CHAT_LOG_ARCHIVE_DAYS", 30))
+ARCHIVE_TTL_DAYS = int(os.getenv("CHAT_LOG_ARCHIVE_TTL_DAYS", 365))
+ARCHIVE_BATCH_SIZE = 1000
+
+DUPLICATE_KEY = 11000
+
+
+class ChatLogWriter:
+    def __init__(self, batch_size: int = 100, flush_seconds: float = 2.0, max_buffer: int = 10000):
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.max_buffer = max_buffer
+        self.buffer: List[Dict[str, Any]] = []
+        self.flusher: Optional[asyncio.Task] = None
+        self.size_flush: Optional[asyncio.Task] = None
+        self.metrics = {"logged": 0, "written": 0, "flushes": 0, "failed_flushes": 0, "dropped": 0}
+
+    def log(self, entry: Dict[str, Any]):
+        """Buffer one chat_logs document; a full batch is written in the background."""
+        entry.setdefault("_id", ObjectId())
+        self.buffer.append(entry)
+        self.metrics["logged"] += 1
+        if len(self.buffer) > self.max_buffer:
+            # The database has been unreachable for a while; keep the newest entries
+            excess = len(self.buffer) - self.max_buffer
+            del self.buffer[:excess]
+            self.metrics["dropped"] += excess
+        if len(self.buffer) >= self.batch_size and (self.size_flush is None or self.size_flush.done()):
+            self.size_flush = asyncio.create_task(self.flush())
+
+    async def flush(self):
+        while self.buffer:
+            batch = self.buffer[:self.batch_size]
+            del self.buffer[:len(batch)]
+            self.metrics["flushes"] += 1
+            try:
+                await db[CHAT_LOGS_COLLECTION].insert_many(batch, ordered=False)
+                self.metrics["written"] += len(batch)
+            except BulkWriteError as e:
+                # Entries already written by an earlier attempt count as written
+                failed = {err["index"] for err in e.details.get("writeErrors", []) if err.get("code") != DUPLICATE_KEY}
+                self._retry_later([entry for i, entry in enumerate(batch) if i in failed], e)
+                self.metrics["written"] += len(batch) - len(failed)
+                if failed:
+                    return
+            except Exception as e:
+                self._retry_later(batch, e)
+                return
+
+    def _retry_later(self, entries: List[Dict[str, Any]], error: Exception):
+        if not entries:
+            return
+        self.metrics["failed_flushes"] += 1
+        logger.warning(f"Chat log flush failed, keeping {len(entries)} entries for the next flush: {error}")
+        self.buffer[:0] = entries
+
+    def pending_for(self, user_id: Any) -> List[Dict[str, Any]]:
+        """Buffered entries of one user, newest first."""
+        return [entry for entry in reversed(self.buffer) if entry.get("user_id") == user_id]
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Chat log flush loop error: {e}")
+
+    def start(self):
+        if self.flusher is None:
+            self.flusher = asyncio.create_task(self._flush_loop())
+
+    async def shutdown(self):
+        if self.flusher is not None:
+            self.flusher.cancel()
+            await asyncio.gather(self.flusher, return_exceptions=True)
+            self.flusher = None
+        if self.size_flush is not None:
+            await asyncio.gather(self.size_flush, return_exceptions=True)
+        await self.flush()
+        if self.buffer:
+            logger.error(f"Shutting down with {len(self.buffer)} chat log entries unwritten")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {"buffered": len(self.buffer), **self.metrics}
+
+
+async def archive_old_chat_logs(older_than_days: int = ARCHIVE_AFTER_DAYS) -> int:
+    """Move chat logs older than the cutoff to the archive as question/answer pairs."""
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    archived = 0
+    while True:
+        logs = await db[CHAT_LOGS_COLLECTION].find({"timestamp": {"$lt": cutoff}}).limit(
+            ARCHIVE_BATCH_SIZE
+        ).to_list(ARCHIVE_BATCH_SIZE)
+        if not logs:
+            break
+        now = datetime.utcnow()
+        try:
+            await db[CHAT_LOGS_ARCHIVE_COLLECTION].insert_many(
+                [
+                    {
+                        "_id": log["_id"],
+                        "user_id": log.get("user_id"),
+                        "question": log.get("question"),
+                        "message": (log.get("response") or {}).get("message"),
+                        "timestamp": log.get("timestamp"),
+                        "archived_at": now,
+                    }
+                    for log in logs
+                ],
+                ordered=False,
+            )
+        except BulkWriteError as e:
+            # Archived by an earlier run that stopped before deleting
+            if any(err.get("code") != DUPLICATE_KEY for err in e.details.get("writeErrors", [])):
+                raise
+        result = await db[CHAT_LOGS_COLLECTION].delete_many({"_id": {"$in": [log["_id"] for log in logs]}})
+        archived += result.deleted_count
+    if archived:
+        logger.info(f"Archived {archived} chat logs older than {older_than_days} days")
+    return archived
+
+
+async def ensure_chat_log_indexes():
+    """History lookup, archive scan and TTL backstop for chat_logs; TTL for the archive."""
+    await db[CHAT_LOGS_COLLECTION].create_index([("user_id", ASCENDING), ("timestamp", DESCENDING)])
+    await db[CHAT_LOGS_COLLECTION].create_index(
+        "timestamp", expireAfterSeconds=2 * ARCHIVE_AFTER_DAYS * 24 * 3600
+    )
+    await db[CHAT_LOGS_ARCHIVE_COLLECTION].create_index(
+        "timestamp", expireAfterSeconds=ARCHIVE_TTL_DAYS * 24 * 3600
+    )
+
+
+# Global chat log writer (one buffer per worker process)
+chat_log_writer = ChatLogWriter(
+    batch_size=int(os.getenv("CHAT_LOG_BATCH_SIZE", 100)),
+    flush_seconds=float(os.getenv("CHAT_LOG_FLUSH_SECONDS", 2)),
+    max_buffer=int(os.getenv("CHAT_LOG_MAX_BUFFER", 10000)),
+)
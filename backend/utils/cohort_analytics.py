@@ -0,0 +1,146 @@
+# backend/utils/cohort_analytics.py
+"""
+Server-side cohort analytics (department, student_year, semester, year,
+category, type). MongoDB collapses scores into (cohort, score, level)
+buckets with $group; NumPy turns the bucketed distribution into
+mean/median/percentiles and a histogram. Results are cached per process
+under a version stamp kept in MongoDB, so a write handled by any worker
+invalidates every worker's cache.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from cachetools import TTLCache
+
+from config.db import db
+from utils.cache_versions import bump_version, get_version
+
+PERFORMANCE_COLLECTION = "performance_records"
+ANALYTICS_COLLECTION = "performance_analytics"
+
+COHORT_CACHE_KEY = "cohort_analytics"
+
+# Cohorts over raw record scores vs. over per-student averages.
+# "year" is the record's academic year; "student_year" the student's year of study
+RECORD_DIMENSIONS = {"semester", "year", "category", "type"}
+STUDENT_DIMENSIONS = {"department", "student_year"}
+COHORT_DIMENSIONS = RECORD_DIMENSIONS | STUDENT_DIMENSIONS
+
+HISTOGRAM_EDGES = np.arange(0, 101, 10)
+
+_cache: TTLCache = TTLCache(maxsize=64, ttl=600)
+
+
+async def invalidate_cohort_cache():
+    """Drop cached cohort results after performance records or analytics change."""
+    _cache.clear()
+    # Other processes notice the bumped stamp on their next read
+    await bump_version(COHORT_CACHE_KEY)
+
+
+def _bucket_pipeline(dimension: str, record_type: Optional[str]) -> List[Dict[str, Any]]:
+    if dimension in STUDENT_DIMENSIONS:
+        value_field, level_field = "$overall_average", "$performance_level"
+        match: Dict[str, Any] = {"total_records": {"$gt": 0}}
+    else:
+        value_field, level_field = "$score", "$calculated_level"
+        match = {"type": record_type} if record_type else {}
+
+    return [
+        {"$match": match},
+        {"$group": {
+            "_id": {
+                "cohort": {"$ifNull": [f"${dimension}", "unknown"]},
+                "value": {"$round": [value_field, 1]},
+                "level": level_field,
+            },
+            "count": {"$sum": 1},
+            "total": {"$sum": value_field},
+        }},
+    ]
+
+
+def summarize_distribution(values: np.ndarray, counts: np.ndarray, total: float) -> Dict[str, Any]:
+    """Compute summary statistics for a bucketed (value, count) distribution."""
+    order = np.argsort(values)
+    values, counts = values[order], counts[order]
+    n = int(counts.sum())
+    cumulative = np.cumsum(counts)
+
+    def percentile(q: float) -> float:
+        # Smallest value whose cumulative share reaches q (nearest-rank)
+        rank = max(1, int(np.ceil(q * n)))
+        return float(values[np.searchsorted(cumulative, rank)])
+
+    mean = total / n
+    variance = float(np.sum(counts * (values - mean) ** 2) / n)
+    histogram, _ = np.histogram(values, bins=HISTOGRAM_EDGES, weights=counts)
+
+    return {
+        "count": n,
+        "mean": round(mean, 2),
+        "median": round(percentile(0.5), 2),
+        "p10": round(percentile(0.1), 2),
+        "p90": round(percentile(0.9), 2),
+        "std": round(float(np.sqrt(variance)), 2),
+        "min": round(float(values[0]), 2),
+        "max": round(float(values[-1]), 2),
+        "histogram": [
+            {"start": int(HISTOGRAM_EDGES[i]), "end": int(HISTOGRAM_EDGES[i + 1]), "count": int(histogram[i])}
+            for i in range(len(histogram))
+        ],
+    }
+
+
+def build_cohort_stats(buckets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Turn $group output into one stats entry per cohort."""
+    grouped: Dict[str, Dict[str, Any]] = {}
+    for bucket in buckets:
+        key = bucket["_id"]
+        if key.get("value") is None:
+            continue
+        cohort = grouped.setdefault(str(key["cohort"]), {"values": [], "counts": [], "total": 0.0, "levels": {}})
+        cohort["values"].append(key["value"])
+        cohort["counts"].append(bucket["count"])
+        cohort["total"] += bucket["total"]
+        level = key.get("level") or "unknown"
+        cohort["levels"][level] = cohort["levels"].get(level, 0) + bucket["count"]
+
+    results = []
+    for name, data in grouped.items():
+        stats = summarize_distribution(
+            np.array(data["values"], dtype=float),
+            np.array(data["counts"], dtype=np.int64),
+            data["total"],
+        )
+        stats["cohort"] = name
+        stats["level_counts"] = data["levels"]
+        results.append(stats)
+
+    results.sort(key=lambda s: s["cohort"])
+    return results
+
+
+async def get_cohort_analytics(dimension: str, record_type: Optional[str] = None) -> Dict[str, Any]:
+    """Cohort statistics for a dimension, served from cache when possible."""
+    if dimension not in COHORT_DIMENSIONS:
+        raise ValueError(f"Unsupported cohort dimension: {dimension}")
+
+    cache_key = (dimension, record_type, await get_version(COHORT_CACHE_KEY))
+    if cache_key in _cache:
+        return _cache[cache_key]
+
+    collection = ANALYTICS_COLLECTION if dimension in STUDENT_DIMENSIONS else PERFORMANCE_COLLECTION
+    pipeline = _bucket_pipeline(dimension, record_type)
+    buckets = await db[collection].aggregate(pipeline, allowDiskUse=True).to_list(None)
+
+    result = {
+        "group_by": dimension,
+        "type": record_type,
+        "basis": "student_average" if dimension in STUDENT_DIMENSIONS else "record_score",
+        "cohorts": build_cohort_stats(buckets),
+        "generated_at": datetime.utcnow(),
+    }
+    _cache[cache_key] = result
+    return result
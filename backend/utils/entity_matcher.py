@@ -0,0 +1,131 @@
+# backend/utils/entity_matcher.py
+"""
+Aho-Corasick matcher for club and event names mentioned in chat questions.
+The automaton runs over word tokens rather than characters, so matches
+always fall on word boundaries and the trie stays small for large
+catalogs. One pass over the question finds every full name and alias.
+
+Aliases are the distinctive words of a name (longer than two characters,
+not a generic word like "club", and used by only one name), e.g. "IWX"
+for "IWX Club".
+"""
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.text_keys import tokenize
+
+GENERIC_WORDS = {
+    "the", "and", "for", "club", "clubs", "society", "team", "group", "event", "events",
+    "workshop", "session", "day", "meet", "night", "fest", "festival", "university", "college",
+}
+
+# Output kinds, in priority order
+FULL_NAME = 0
+ALIAS = 1
+
+
+class TokenAutomaton:
+    def __init__(self):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        # Outputs live only on terminal nodes; dict_link jumps to the next one along the fail chain
+        self.outputs: Dict[int, List[Tuple[int, int, Any]]] = {}
+        self.dict_link: List[int] = [-1]
+
+    def add(self, tokens: List[str], kind: int, value: Any):
+        node = 0
+        for token in tokens:
+            child = self.goto[node].get(token)
+            if child is None:
+                child = len(self.goto)
+                self.goto[node][token] = child
+                self.goto.append({})
+                self.fail.append(0)
+                self.dict_link.append(-1)
+            node = child
+        self.outputs.setdefault(node, []).append((len(tokens), kind, value))
+
+    def build(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self.goto[node].items():
+                fallback = self.fail[node]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(token, 0)
+                self.fail[child] = target if target != child else 0
+                link = self.fail[child]
+                self.dict_link[child] = link if link in self.outputs else self.dict_link[link]
+                queue.append(child)
+
+    def iter_matches(self, tokens: Iterable[str]) -> Iterator[Tuple[int, int, int, Any]]:
+        """Yield (start, length, kind, value) for every pattern occurrence."""
+        node = 0
+        for end, token in enumerate(tokens, start=1):
+            while node and token not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(token, 0)
+            hit = node if node in self.outputs else self.dict_link[node]
+            while hit > 0:
+                for length, kind, value in self.outputs[hit]:
+                    yield end - length, length, kind, value
+                hit = self.dict_link[hit]
+
+    @property
+    def size(self) -> int:
+        return len(self.goto)
+
+
+class EntityMatcher:
+    """Finds club and event names (or their aliases) mentioned in a question."""
+
+    def __init__(self, names: Dict[str, List[str]]):
+        self.automaton = TokenAutomaton()
+        self.names = {entity_type: list(values) for entity_type, values in names.items()}
+
+        alias_owners: Dict[str, set] = {}
+        for entity_type, values in self.names.items():
+            for name in values:
+                tokens = tokenize(name)
+                if not tokens:
+                    continue
+                self.automaton.add(tokens, FULL_NAME, (entity_type, name))
+                for token in set(tokens):
+                    if len(token) > 2 and token not in GENERIC_WORDS and len(tokens) > 1:
+                        alias_owners.setdefault(token, set()).add((entity_type, name))
+
+        for token, owners in alias_owners.items():
+            # Words shared by several names identify none of them
+            if len(owners) == 1:
+                self.automaton.add([token], ALIAS, next(iter(owners)))
+        self.automaton.build()
+
+    def match_spans(self, tokens: List[str]) -> Dict[str, Tuple[int, int, str]]:
+        """
+        Best (start, length, name) per entity type in a token list: full names
+        beat aliases, longer names beat shorter ones, earlier mentions beat
+        later ones.
+        """
+        best: Dict[str, Tuple[Tuple[int, int, int], Tuple[int, int, str]]] = {}
+        for start, length, kind, (entity_type, name) in self.automaton.iter_matches(tokens):
+            rank = (kind, -length, start)
+            current = best.get(entity_type)
+            if current is None or rank < current[0]:
+                best[entity_type] = (rank, (start, length, name))
+        return {entity_type: span for entity_type, (_, span) in best.items()}
+
+    def match(self, question: str) -> Dict[str, str]:
+        """Best matching name per entity type."""
+        return {entity_type: name for entity_type, (_, _, name) in self.match_spans(tokenize(question)).items()}
+
+    def find(self, question: str, entity_type: str) -> Optional[str]:
+        return self.match(question).get(entity_type)
+
+
+def build_entity_matcher(snapshot) -> EntityMatcher:
+    """Matcher over every club name and event title in a chat context snapshot."""
+    return EntityMatcher({
+        "club": [club["name"] for club in snapshot.clubs if club.get("name")],
+        "event": [event["title"] for event in snapshot.events if event.get("title")],
+    })
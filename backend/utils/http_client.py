@@ -0,0 +1,179 @@
+# backend/utils/http_client.py
+"""
+App-scoped outbound HTTP clients.
+One keep-alive pool per profile, a per-host connection cap, HTTP/2 when
+the `h2` package is installed, and a shared timeout/retry policy.
+
+Profiles:
+    default  - APIs (Gemini, OpenRouter/OpenAI)
+    scraper  - public websites; follows redirects, skips TLS verification
+"""
+import asyncio
+import importlib.util
+import logging
+import os
+from typing import Any, Dict, Optional
+
+import httpx
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRYABLE_STATUS = {429, 502, 503, 504}
+RETRY_WAIT = wait_exponential_jitter(initial=0.5, max=5)
+
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {"verify": True, "follow_redirects": False, "timeout": 30.0},
+    "scraper": {"verify": False, "follow_redirects": True, "timeout": 60.0},
+}
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body wrapper that frees the host slot once the body is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self.stream = stream
+        self.release = release
+
+    async def __aiter__(self):
+        try:
+            async for chunk in self.stream:
+                yield chunk
+        finally:
+            # Fully read (or abandoned) bodies give the slot back without waiting for aclose()
+            self.release()
+
+    async def aclose(self):
+        try:
+            await self.stream.aclose()
+        finally:
+            self.release()
+
+
+class HostLimitedTransport(httpx.AsyncBaseTransport):
+    """Caps concurrent requests per host on top of the pool-wide limits."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, per_host: int):
+        self.transport = transport
+        self.per_host = per_host
+        self.semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        semaphore = self.semaphores.get(host)
+        if semaphore is None:
+            semaphore = self.semaphores[host] = asyncio.Semaphore(self.per_host)
+
+        await semaphore.acquire()
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                semaphore.release()
+
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+        if hasattr(response, "_content"):
+            # Body is already in memory (e.g. MockTransport), so httpx never reads or closes the stream
+            release()
+        else:
+            # Streaming responses keep the slot until their body is read or closed
+            response.stream = _ReleasingStream(response.stream, release)
+        return response
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+class _RetryableStatus(Exception):
+    def __init__(self, response: httpx.Response):
+        self.response = response
+
+
+def _should_retry(method: str):
+    idempotent = method.upper() in IDEMPOTENT_METHODS
+
+    def predicate(error: BaseException) -> bool:
+        # The request never reached the server, so any method is safe to resend
+        if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+            return True
+        if not idempotent:
+            return False
+        return isinstance(error, (_RetryableStatus, httpx.ReadTimeout, httpx.ReadError, httpx.RemoteProtocolError))
+
+    return predicate
+
+
+class HttpClients:
+    def __init__(self):
+        self.clients: Dict[str, httpx.AsyncClient] = {}
+
+    def get(self, profile: str = "default") -> httpx.AsyncClient:
+        client = self.clients.get(profile)
+        if client is None or client.is_closed:
+            client = self.clients[profile] = self._build(profile)
+        return client
+
+    def _build(self, profile: str) -> httpx.AsyncClient:
+        options = PROFILES[profile]
+        limits = httpx.Limits(
+            max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", 100)),
+            max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE", 20)),
+            keepalive_expiry=30.0,
+        )
+        transport = HostLimitedTransport(
+            httpx.AsyncHTTPTransport(verify=options["verify"], http2=HTTP2_AVAILABLE, limits=limits),
+            per_host=int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", 10)),
+        )
+        return httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(options["timeout"], connect=10.0),
+            follow_redirects=options["follow_redirects"],
+        )
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        profile: str = "default",
+        retries: Optional[int] = None,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        Send a request with the shared retry policy. Connection failures are
+        retried for every method; read errors and 429/5xx only for idempotent
+        ones. The last response is returned as-is once retries run out.
+        """
+        client = self.get(profile)
+        attempts = 1 + (retries if retries is not None else int(os.getenv("HTTP_RETRIES", 2)))
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(attempts),
+            wait=RETRY_WAIT,
+            retry=retry_if_exception(_should_retry(method)),
+            reraise=True,
+        )
+        try:
+            async for attempt in retrying:
+                with attempt:
+                    response = await client.request(method, url, **kwargs)
+                    if response.status_code in RETRYABLE_STATUS:
+                        raise _RetryableStatus(response)
+                    return response
+        except _RetryableStatus as e:
+            return e.response
+
+    async def aclose(self):
+        for client in self.clients.values():
+            await client.aclose()
+        self.clients.clear()
+
+
+# Global outbound HTTP clients (one pool per profile)
+http_clients = HttpClients()
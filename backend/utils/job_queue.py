@@ -0,0 +1,341 @@
+# backend/utils/job_queue.py
+"""
+Durable MongoDB-backed job queue for slow side effects.
+Request handlers enqueue work and return immediately; workers running in
+every uvicorn process claim jobs, retry failures with exponential backoff,
+and move jobs that keep failing to a dead-letter collection.
+"""
+import asyncio
+import logging
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import ReturnDocument, ASCENDING
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+from config.db import db
+from utils.id_util import normalize_id
+
+logger = logging.getLogger(__name__)
+
+JOBS_COLLECTION = "jobs"
+DEAD_LETTER_COLLECTION = "jobs_dead_letter"
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+DEAD = "dead"
+
+# Upsert retries when a deduplicated job is claimed mid-enqueue
+DEDUPE_ATTEMPTS = 3
+DEDUPE_INDEX = "dedupe_key_queued_unique"
+
+# How long finished jobs stay queryable through the status endpoint
+COMPLETED_JOB_TTL_SECONDS = 7 * 24 * 3600
+
+
+def compute_backoff(attempt: int, base: float = 5, cap: float = 900) -> float:
+    """Exponential backoff with full jitter for the given (1-based) attempt."""
+    ceiling = min(cap, base * (2 ** (attempt - 1)))
+    return random.uniform(ceiling / 2, ceiling)
+
+
+class TaskSpec:
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Dict[str, Any]], Awaitable[Any]],
+        max_attempts: int,
+        visibility_timeout: float,
+        on_dead: Optional[Callable[[Dict[str, Any], str], Awaitable[Any]]] = None,
+    ):
+        self.name = name
+        self.func = func
+        self.max_attempts = max_attempts
+        self.visibility_timeout = visibility_timeout
+        self.on_dead = on_dead
+
+
+class JobQueue:
+    def __init__(self, poll_interval: float = 1.0):
+        self.tasks: Dict[str, TaskSpec] = {}
+        self.poll_interval = poll_interval
+        self.workers: List[asyncio.Task] = []
+        self.running = False
+
+    def task(self, name: str, max_attempts: int = 5, visibility_timeout: float = 120, on_dead=None):
+        """
+        Decorator registering an async handler that receives the job payload.
+        `on_dead(payload, error)` runs once the job has used up its attempts.
+        """
+        def decorator(func):
+            self.tasks[name] = TaskSpec(name, func, max_attempts, visibility_timeout, on_dead)
+            return func
+        return decorator
+
+    async def enqueue(
+        self,
+        task_name: str,
+        payload: Optional[Dict[str, Any]] = None,
+        delay: float = 0,
+        dedupe_key: Optional[str] = None,
+        owner_id: Optional[str] = None,
+    ) -> str:
+        """
+        Persist a job and return its id.
+        With a dedupe_key, a job that is still waiting in the queue is reused
+        instead of creating another one (e.g. repeated analytics recomputes).
+        The lookup and insert are one upsert, and a unique partial index on
+        queued dedupe keys stops concurrent callers from both inserting.
+        """
+        if task_name not in self.tasks:
+            raise ValueError(f"Unknown task: {task_name}")
+
+        now = datetime.utcnow()
+        job = {
+            "task": task_name,
+            "payload": payload or {},
+            "status": QUEUED,
+            "attempts": 0,
+            "max_attempts": self.tasks[task_name].max_attempts,
+            "run_at": now + timedelta(seconds=delay),
+            "visible_until": None,
+            "dedupe_key": dedupe_key,
+            "owner_id": owner_id,
+            "progress": None,
+            "last_error": None,
+            "result": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        if not dedupe_key:
+            result = await db[JOBS_COLLECTION].insert_one(job)
+            return str(result.inserted_id)
+
+        query = {"dedupe_key": dedupe_key, "status": QUEUED}
+        on_insert = {k: v for k, v in job.items() if k not in query}
+        for _ in range(DEDUPE_ATTEMPTS):
+            try:
+                existing = await db[JOBS_COLLECTION].find_one_and_update(
+                    query,
+                    {"$setOnInsert": on_insert},
+                    upsert=True,
+                    projection={"_id": 1},
+                    return_document=ReturnDocument.AFTER,
+                )
+                return str(existing["_id"])
+            except DuplicateKeyError:
+                # A concurrent enqueue inserted the same key first; reuse its job
+                existing = await db[JOBS_COLLECTION].find_one(query, {"_id": 1})
+                if existing:
+                    return str(existing["_id"])
+                # ...which a worker claimed in between, so try the upsert again
+        raise RuntimeError(f"Could not enqueue {task_name} with dedupe key {dedupe_key}")
+
+    async def set_progress(self, job_id: str, progress: Any):
+        """Record handler-reported progress (percentage, stage name, counters...)."""
+        await db[JOBS_COLLECTION].update_one(
+            {"_id": normalize_id(job_id)},
+            {"$set": {"progress": progress, "updated_at": datetime.utcnow()}}
+        )
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Look a job up in the live queue, falling back to the dead-letter collection."""
+        if not ObjectId.is_valid(job_id):
+            return None
+        job = await db[JOBS_COLLECTION].find_one({"_id": ObjectId(job_id)})
+        if not job:
+            job = await db[DEAD_LETTER_COLLECTION].find_one({"_id": ObjectId(job_id)})
+        return job
+
+    async def _claim(self) -> Optional[Dict[str, Any]]:
+        """Atomically claim the next due job, including ones whose worker went away."""
+        if not self.tasks:
+            return None
+        now = datetime.utcnow()
+        # The visibility window is set in the same atomic update as the claim;
+        # use the longest task timeout since the task is unknown until claimed
+        visibility = max(spec.visibility_timeout for spec in self.tasks.values())
+        return await db[JOBS_COLLECTION].find_one_and_update(
+            {
+                "task": {"$in": list(self.tasks.keys())},
+                "$or": [
+                    {"status": QUEUED, "run_at": {"$lte": now}},
+                    {"status": RUNNING, "visible_until": {"$lte": now}},
+                ],
+            },
+            {
+                "$set": {
+                    "status": RUNNING,
+                    "started_at": now,
+                    "visible_until": now + timedelta(seconds=visibility),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("run_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _run(self, job: Dict[str, Any]):
+        spec = self.tasks[job["task"]]
+        try:
+            # Never let a handler outlive its visibility window, or another
+            # worker would pick the same job up while it is still running
+            result = await asyncio.wait_for(spec.func(job["payload"]), timeout=spec.visibility_timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._handle_failure(job, e)
+            return
+
+        await db[JOBS_COLLECTION].update_one(
+            {"_id": job["_id"]},
+            {"$set": {
+                "status": COMPLETED,
+                "result": result if isinstance(result, (dict, list, str, int, float, bool)) else None,
+                "completed_at": datetime.utcnow(),
+                "updated_at": datetime.utcnow(),
+                "visible_until": None,
+            }}
+        )
+
+    async def _handle_failure(self, job: Dict[str, Any], error: Exception):
+        message = str(error) or error.__class__.__name__
+        now = datetime.utcnow()
+
+        if job["attempts"] >= job.get("max_attempts", 1):
+            logger.error(f"Job {job['_id']} ({job['task']}) moved to dead letter after {job['attempts']} attempts: {message}")
+            job.update({"status": DEAD, "last_error": message, "failed_at": now, "updated_at": now})
+            await db[DEAD_LETTER_COLLECTION].replace_one({"_id": job["_id"]}, job, upsert=True)
+            await db[JOBS_COLLECTION].delete_one({"_id": job["_id"]})
+            spec = self.tasks.get(job["task"])
+            if spec and spec.on_dead:
+                try:
+                    await spec.on_dead(job["payload"], message)
+                except Exception as e:
+                    logger.error(f"on_dead handler for job {job['_id']} ({job['task']}) failed: {e}")
+            return
+
+        delay = compute_backoff(job["attempts"])
+        logger.warning(f"Job {job['_id']} ({job['task']}) failed (attempt {job['attempts']}), retrying in {delay:.0f}s: {message}")
+        try:
+            await db[JOBS_COLLECTION].update_one(
+                {"_id": job["_id"]},
+                {"$set": {
+                    "status": QUEUED,
+                    "run_at": now + timedelta(seconds=delay),
+                    "visible_until": None,
+                    "last_error": message,
+                    "updated_at": now,
+                }}
+            )
+        except DuplicateKeyError:
+            # A job with the same dedupe key was queued meanwhile and will redo this work
+            await db[JOBS_COLLECTION].update_one(
+                {"_id": job["_id"]},
+                {"$set": {
+                    "status": COMPLETED,
+                    "result": {"superseded": True},
+                    "last_error": message,
+                    "completed_at": now,
+                    "updated_at": now,
+                    "visible_until": None,
+                }}
+            )
+
+    async def _worker_loop(self, index: int):
+        while self.running:
+            try:
+                job = await self._claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job worker {index} failed to claim a job: {e}")
+                job = None
+
+            if not job:
+                await asyncio.sleep(self.poll_interval)
+                continue
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Bookkeeping write failed; the job is re-delivered once visible_until passes
+                logger.error(f"Job worker {index} failed while running job {job['_id']} ({job['task']}): {e}")
+                await asyncio.sleep(self.poll_interval)
+
+    def start(self, concurrency: int = 2):
+        if self.running:
+            return
+        self.running = True
+        self.workers = [asyncio.create_task(self._worker_loop(i)) for i in range(concurrency)]
+        logger.info(f"Job queue started with {concurrency} workers for tasks: {', '.join(self.tasks)}")
+
+    async def shutdown(self):
+        self.running = False
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+
+async def _drop_duplicate_queued_jobs():
+    """Remove queued duplicates left by the old find-then-insert enqueue, keeping the oldest."""
+    duplicates = db[JOBS_COLLECTION].aggregate([
+        {"$match": {"status": QUEUED, "dedupe_key": {"$type": "string"}}},
+        {"$sort": {"created_at": 1}},
+        {"$group": {"_id": "$dedupe_key", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ])
+    async for group in duplicates:
+        await db[JOBS_COLLECTION].delete_many({"_id": {"$in": group["ids"][1:]}, "status": QUEUED})
+
+
+async def ensure_job_indexes():
+    """Create indexes used by job claiming, dedupe and cleanup."""
+    await db[JOBS_COLLECTION].create_index([("status", ASCENDING), ("run_at", ASCENDING)])
+    await db[JOBS_COLLECTION].create_index([("status", ASCENDING), ("visible_until", ASCENDING)])
+    await _drop_duplicate_queued_jobs()
+    # Only one queued job per dedupe key; finished and running jobs may share it
+    await db[JOBS_COLLECTION].create_index(
+        "dedupe_key",
+        name=DEDUPE_INDEX,
+        unique=True,
+        partialFilterExpression={"status": QUEUED, "dedupe_key": {"$type": "string"}},
+    )
+    try:
+        # Superseded by the unique partial index above
+        await db[JOBS_COLLECTION].drop_index("dedupe_key_1")
+    except OperationFailure:
+        pass
+    await db[JOBS_COLLECTION].create_index(
+        "completed_at", expireAfterSeconds=COMPLETED_JOB_TTL_SECONDS
+    )
+
+
+def serialize_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Public view of a job for the status endpoint."""
+    return {
+        "id": str(job["_id"]),
+        "task": job["task"],
+        "status": job["status"],
+        "attempts": job.get("attempts", 0),
+        "max_attempts": job.get("max_attempts"),
+        "progress": job.get("progress"),
+        "last_error": job.get("last_error"),
+        "result": job.get("result"),
+        "run_at": job.get("run_at"),
+        "created_at": job.get("created_at"),
+        "updated_at": job.get("updated_at"),
+        "completed_at": job.get("completed_at"),
+    }
+
+
+# Global job queue instance
+job_queue = JobQueue(poll_interval=float(os.getenv("JOB_POLL_INTERVAL", 1.0)))
@@ -0,0 +1,126 @@
+# backend/utils/llm_cache.py
+"""
+Persistent cache for LLM results, keyed by a content hash.
+Entries live in MongoDB (shared by every worker, expired by a TTL index)
+with a small in-process LRU in front. Each namespace has its own TTL and
+entry cap; the oldest entries are trimmed once the cap is exceeded.
+"""
+import hashlib
+import json
+import logging
+import unicodedata
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from cachetools import TTLCache
+from pymongo import ASCENDING
+
+from config.db import db
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_COLLECTION = "llm_cache"
+
+# Check the entry cap every N writes rather than on each one
+TRIM_EVERY_WRITES = 50
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Unicode-normalize and collapse whitespace so trivially different inputs share a key."""
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def content_hash(*parts: Any) -> str:
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    def __init__(self, namespace: str, ttl_seconds: int, max_entries: int, memory_entries: int = 256):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.memory: TTLCache = TTLCache(maxsize=memory_entries, ttl=min(ttl_seconds, 3600))
+        self.writes_since_trim = 0
+        self.metrics = {"hits": 0, "memory_hits": 0, "misses": 0, "writes": 0, "trimmed": 0, "errors": 0}
+
+    def make_key(self, *parts: Any) -> str:
+        return content_hash(self.namespace, *parts)
+
+    async def get(self, key: str) -> Optional[Any]:
+        if key in self.memory:
+            self.metrics["hits"] += 1
+            self.metrics["memory_hits"] += 1
+            return self.memory[key]
+        try:
+            doc = await db[LLM_CACHE_COLLECTION].find_one_and_update(
+                # The TTL monitor runs once a minute, so check expiry here too
+                {"_id": key, "expires_at": {"$gt": datetime.utcnow()}},
+                {"$inc": {"hits": 1}, "$set": {"last_hit_at": datetime.utcnow()}},
+                projection={"value": 1},
+            )
+        except Exception as e:
+            # A cache outage must never break the caller
+            self.metrics["errors"] += 1
+            logger.warning(f"LLM cache read failed ({self.namespace}): {e}")
+            doc = None
+        if doc is None:
+            self.metrics["misses"] += 1
+            return None
+        self.metrics["hits"] += 1
+        self.memory[key] = doc["value"]
+        return doc["value"]
+
+    async def set(self, key: str, value: Any):
+        now = datetime.utcnow()
+        self.memory[key] = value
+        try:
+            await db[LLM_CACHE_COLLECTION].replace_one(
+                {"_id": key},
+                {
+                    "namespace": self.namespace,
+                    "value": value,
+                    "hits": 0,
+                    "created_at": now,
+                    "expires_at": now + timedelta(seconds=self.ttl_seconds),
+                },
+                upsert=True,
+            )
+        except Exception as e:
+            self.metrics["errors"] += 1
+            logger.warning(f"LLM cache write failed ({self.namespace}): {e}")
+            return
+        self.metrics["writes"] += 1
+        self.writes_since_trim += 1
+        if self.writes_since_trim >= TRIM_EVERY_WRITES:
+            self.writes_since_trim = 0
+            await self.trim()
+
+    async def trim(self):
+        """Delete the oldest entries beyond max_entries."""
+        collection = db[LLM_CACHE_COLLECTION]
+        excess = await collection.count_documents({"namespace": self.namespace}) - self.max_entries
+        if excess <= 0:
+            return
+        oldest = await collection.find({"namespace": self.namespace}, {"_id": 1}).sort(
+            "created_at", ASCENDING
+        ).limit(excess).to_list(excess)
+        result = await collection.delete_many({"_id": {"$in": [doc["_id"] for doc in oldest]}})
+        self.metrics["trimmed"] += result.deleted_count
+
+    async def clear(self):
+        self.memory.clear()
+        await db[LLM_CACHE_COLLECTION].delete_many({"namespace": self.namespace})
+
+    def get_metrics(self) -> Dict[str, Any]:
+        lookups = self.metrics["hits"] + self.metrics["misses"]
+        return {
+            "namespace": self.namespace,
+            **self.metrics,
+            "hit_rate": round(self.metrics["hits"] / lookups, 3) if lookups else None,
+        }
+
+
+async def ensure_llm_cache_indexes():
+    """TTL index for expiry plus the index used to trim the oldest entries."""
+    await db[LLM_CACHE_COLLECTION].create_index("expires_at", expireAfterSeconds=0)
+    await db[LLM_CACHE_COLLECTION].create_index([("namespace", ASCENDING), ("created_at", ASCENDING)])
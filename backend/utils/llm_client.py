@@ -0,0 +1,264 @@
+# backend/utils/llm_client.py
+"""
+Async LLM client shared by the AI features.
+Every call runs under a deadline and a concurrency limit, and a circuit
+breaker fails fast while the provider is slow or down so callers can drop
+straight to their rule-based fallbacks.
+
+LLM_PROVIDER=auto|gemini|openai|stub|none (auto picks Gemini when
+GOOGLE_AI_API_KEY is set, then OpenAI when OPENAI_API_KEY is set).
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from openai import AsyncOpenAI
+
+from utils.http_client import http_clients
+
+logger = logging.getLogger(__name__)
+
+GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+
+_openai_clients: Dict[Tuple[str, Optional[str], int], Tuple[Any, AsyncOpenAI]] = {}
+
+
+async def gemini_generate(
+    prompt: str,
+    api_key: str,
+    model: str = "gemini-2.5-flash-lite",
+    max_tokens: Optional[int] = None,
+    temperature: Optional[float] = None,
+    timeout: float = 30.0,
+) -> str:
+    """Call Gemini generateContent over the shared HTTP pool and return the text."""
+    payload: Dict[str, Any] = {"contents": [{"parts": [{"text": prompt}]}]}
+    generation_config = {}
+    if max_tokens is not None:
+        generation_config["maxOutputTokens"] = max_tokens
+    if temperature is not None:
+        generation_config["temperature"] = temperature
+    if generation_config:
+        payload["generationConfig"] = generation_config
+
+    response = await http_clients.request(
+        "POST", GEMINI_API_URL.format(model=model), params={"key": api_key}, json=payload, timeout=timeout
+    )
+    response.raise_for_status()
+    return response.json()["candidates"][0]["content"]["parts"][0]["text"].strip()
+
+
+def get_openai_client(api_key: Optional[str], base_url: Optional[str] = None, max_retries: int = 2) -> AsyncOpenAI:
+    """AsyncOpenAI bound to the shared HTTP pool (rebuilt if the pool was closed)."""
+    http = http_clients.get()
+    key = (api_key or "", base_url, max_retries)
+    cached = _openai_clients.get(key)
+    if cached is None or cached[0] is not http:
+        cached = _openai_clients[key] = (
+            http, AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=max_retries, http_client=http)
+        )
+    return cached[1]
+
+
+class LLMError(Exception):
+    """The provider call failed or timed out."""
+
+
+class LLMTimeout(LLMError):
+    pass
+
+
+class LLMUnavailable(LLMError):
+    """No provider is configured or the circuit is open."""
+
+
+class StubProvider:
+    """Local provider with configurable latency, for tests and load runs."""
+
+    name = "stub"
+
+    def __init__(self, latency: float = 0.0, response: str = '["Review your notes weekly"]', fail: bool = False):
+        self.latency = latency
+        self.response = response
+        self.fail = fail
+        self.calls = 0
+
+    async def complete(self, prompt: str, max_tokens: int, temperature: float) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self.fail:
+            raise RuntimeError("stub provider failure")
+        return self.response
+
+
+class GeminiProvider:
+    name = "gemini"
+
+    def __init__(self, api_key: str, model: str = "gemini-pro"):
+        self.api_key = api_key
+        self.model = model
+
+    async def complete(self, prompt: str, max_tokens: int, temperature: float) -> str:
+        # The caller's deadline governs; the HTTP timeout is only a backstop
+        return await gemini_generate(prompt, self.api_key, self.model, max_tokens, temperature)
+
+
+class OpenAIProvider:
+    name = "openai"
+
+    def __init__(self, api_key: str, model: str = "gpt-3.5-turbo"):
+        self.api_key = api_key
+        self.model = model
+
+    async def complete(self, prompt: str, max_tokens: int, temperature: float) -> str:
+        # Deadlines and failure handling live in LLMClient, not in SDK retries
+        client = get_openai_client(self.api_key, max_retries=0)
+        response = await client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
+        return (response.choices[0].message.content or "").strip()
+
+
+class CircuitBreaker:
+    """
+    closed -> open after `failure_threshold` consecutive failures;
+    open -> half-open after `reset_timeout` seconds, letting one trial call
+    through; the trial's outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open" and self.clock() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+        if self.state == "half_open" and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self.trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning(f"LLM circuit opened after {self.failures} consecutive failures")
+            self.state = "open"
+            self.opened_at = self.clock()
+        self.trial_in_flight = False
+
+
+class LLMClient:
+    def __init__(
+        self,
+        provider=None,
+        timeout: float = 8.0,
+        max_concurrency: int = 4,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.provider = provider
+        self.timeout = timeout
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.breaker = breaker or CircuitBreaker()
+        self.metrics = {"calls": 0, "failures": 0, "timeouts": 0, "rejected": 0}
+
+    @property
+    def available(self) -> bool:
+        return self.provider is not None
+
+    async def complete(
+        self,
+        prompt: str,
+        timeout: Optional[float] = None,
+        max_tokens: int = 300,
+        temperature: float = 0.7,
+    ) -> str:
+        """Run one completion; the deadline covers queueing for a slot as well as the call."""
+        if self.provider is None:
+            raise LLMUnavailable("No LLM provider configured")
+        if not self.breaker.allow():
+            self.metrics["rejected"] += 1
+            raise LLMUnavailable("LLM circuit is open")
+
+        self.metrics["calls"] += 1
+        try:
+            return_value = await asyncio.wait_for(
+                self._call(prompt, max_tokens, temperature),
+                timeout=timeout or self.timeout,
+            )
+        except asyncio.TimeoutError:
+            self.metrics["timeouts"] += 1
+            self.breaker.record_failure()
+            raise LLMTimeout(f"{self.provider.name} did not answer within {timeout or self.timeout}s")
+        except asyncio.CancelledError:
+            # The caller went away; don't leave a half-open trial stuck
+            self.breaker.trial_in_flight = False
+            raise
+        except Exception as e:
+            self.metrics["failures"] += 1
+            self.breaker.record_failure()
+            raise LLMError(f"{self.provider.name} call failed: {e}") from e
+
+        self.breaker.record_success()
+        return return_value
+
+    async def _call(self, prompt: str, max_tokens: int, temperature: float) -> str:
+        async with self.semaphore:
+            return await self.provider.complete(prompt, max_tokens, temperature)
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "provider": self.provider.name if self.provider else None,
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            **self.metrics,
+        }
+
+
+def build_provider():
+    choice = os.getenv("LLM_PROVIDER", "auto").lower()
+    google_key = os.getenv("GOOGLE_AI_API_KEY")
+    openai_key = os.getenv("OPENAI_API_KEY")
+
+    if choice == "stub":
+        return StubProvider(latency=float(os.getenv("LLM_STUB_LATENCY", 0)))
+    if choice == "none":
+        return None
+    if choice in ("auto", "gemini") and google_key:
+        return GeminiProvider(google_key, os.getenv("GEMINI_MODEL", "gemini-pro"))
+    if choice in ("auto", "openai") and openai_key:
+        return OpenAIProvider(openai_key, os.getenv("OPENAI_MODEL", "gpt-3.5-turbo"))
+    return None
+
+
+def build_llm_client() -> LLMClient:
+    return LLMClient(
+        provider=build_provider(),
+        timeout=float(os.getenv("LLM_TIMEOUT_SECONDS", 8)),
+        max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", 4)),
+        breaker=CircuitBreaker(
+            failure_threshold=int(os.getenv("LLM_BREAKER_FAILURES", 5)),
+            reset_timeout=float(os.getenv("LLM_BREAKER_RESET_SECONDS", 30)),
+        ),
+    )
+
+
+# Global LLM client instance
+llm_client = build_llm_client()
@@ -4,8 +4,10 @@ Mock data generator for Student Performance & Score Tracking System
 Provides realistic sample data for demonstration purposes
 """
 import random
+import zlib
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
+from cachetools import LRUCache
 from models.performance_model import (
     PerformanceRecordOut, NotificationOut, AIPrediction, AIImprovementSuggestion,
     PerformanceLevel, NotificationType
@@ -60,7 +62,8 @@ AI_SUGGESTIONS_POOL = [
 
 def get_student_seed(student_id: str) -> int:
     """Generate a consistent seed for a student to ensure same mock data per student"""
-    return hash(student_id) % 10000
+    # crc32 rather than hash(): str hashing is randomized per process
+    return zlib.crc32(student_id.encode("utf-8")) % 10000
 
 def get_student_name(student_id: str) -> str:
     """Get a consistent student name for a student ID"""
@@ -69,40 +72,40 @@ def get_student_name(student_id: str) -> str:
 
 def generate_mock_performance_records(student_id: str, count: int = 15) -> List[Dict[str, Any]]:
     """Generate mock performance records for a student"""
-    random.seed(get_student_seed(student_id))
+    rng = random.Random(get_student_seed(student_id))
 
     records = []
     base_date = datetime.utcnow() - timedelta(days=90)
 
     for i in range(count):
         # Mix of academic and non-academic records
-        is_academic = random.choice([True, True, False])  # 2:1 ratio academic:non-academic
+        is_academic = rng.choice([True, True, False])  # 2:1 ratio academic:non-academic
 
         if is_academic:
-            category = random.choice(["subject", "exam", "activity"])
+            category = rng.choice(["subject", "exam", "activity"])
             if category == "subject":
-                subcategory = random.choice(SUBJECTS)
+                subcategory = rng.choice(SUBJECTS)
                 # Students have varying performance levels
                 base_score = 65 + (get_student_seed(student_id) % 25)  # 65-90 range
-                score = max(40, min(100, base_score + random.randint(-15, 15)))
+                score = max(40, min(100, base_score + rng.randint(-15, 15)))
             elif category == "exam":
-                subcategory = random.choice(EXAM_TYPES)
+                subcategory = rng.choice(EXAM_TYPES)
                 base_score = 70 + (get_student_seed(student_id) % 20)  # 70-90 range
-                score = max(45, min(100, base_score + random.randint(-10, 10)))
+                score = max(45, min(100, base_score + rng.randint(-10, 10)))
             else:  # activity
                 subcategory = "Class Participation"
-                score = random.randint(60, 95)
+                score = rng.randint(60, 95)
         else:
-            category = random.choice(["club_participation", "attendance", "engagement"])
+            category = rng.choice(["club_participation", "attendance", "engagement"])
             if category == "club_participation":
-                subcategory = random.choice(CLUB_ACTIVITIES)
-                score = random.randint(70, 100)
+                subcategory = rng.choice(CLUB_ACTIVITIES)
+                score = rng.randint(70, 100)
             elif category == "attendance":
                 subcategory = "Class Attendance"
-                score = random.randint(75, 100)
+                score = rng.randint(75, 100)
             else:  # engagement
-                subcategory = random.choice(ENGAGEMENT_METRICS)
-                score = random.randint(50, 95)
+                subcategory = rng.choice(ENGAGEMENT_METRICS)
+                score = rng.randint(50, 95)
 
         # Calculate performance level
         if score >= 85:
@@ -112,7 +115,7 @@ def generate_mock_performance_records(student_id: str, count: int = 15) -> List[
         else:
             level = PerformanceLevel.LOW
 
-        record_date = base_date + timedelta(days=random.randint(0, 90))
+        record_date = base_date + timedelta(days=rng.randint(0, 90))
         semester = "Fall 2024" if record_date.month < 7 else "Spring 2024"
 
         record = {
@@ -138,16 +141,16 @@ def generate_mock_performance_records(student_id: str, count: int = 15) -> List[
 
 def generate_mock_notifications(student_id: str, performance_records: List[Dict]) -> List[Dict[str, Any]]:
     """Generate mock notifications based on performance records"""
-    random.seed(get_student_seed(student_id) + 1)
+    rng = random.Random(get_student_seed(student_id) + 1)
 
     notifications = []
 
     # Generate 1-3 notifications per student
-    num_notifications = random.randint(1, 3)
+    num_notifications = rng.randint(1, 3)
 
     for i in range(num_notifications):
         # Pick a random performance record
-        record = random.choice(performance_records)
+        record = rng.choice(performance_records)
 
         # Choose notification type based on performance
         if record["calculated_level"] == PerformanceLevel.LOW:
@@ -164,8 +167,8 @@ def generate_mock_notifications(student_id: str, performance_records: List[Dict]
             "title": template["title"],
             "message": template["message"].format(category=record.get("subcategory", record["category"])),
             "priority": "high" if record["calculated_level"] == PerformanceLevel.LOW else "medium",
-            "read": random.choice([True, False, False]),  # 1/3 chance of being unread
-            "created_at": record["created_at"] + timedelta(hours=random.randint(1, 24)),
+            "read": rng.choice([True, False, False]),  # 1/3 chance of being unread
+            "created_at": record["created_at"] + timedelta(hours=rng.randint(1, 24)),
             "metadata": {
                 "category": record["category"],
                 "score": record["score"],
@@ -180,7 +183,7 @@ def generate_mock_notifications(student_id: str, performance_records: List[Dict]
 
 def generate_mock_ai_prediction(student_id: str, performance_records: List[Dict]) -> Dict[str, Any]:
     """Generate mock AI prediction for a student"""
-    random.seed(get_student_seed(student_id) + 2)
+    rng = random.Random(get_student_seed(student_id) + 2)
 
     if not performance_records:
         return {
@@ -197,7 +200,7 @@ def generate_mock_ai_prediction(student_id: str, performance_records: List[Dict]
     avg_score = sum(scores) / len(scores)
 
     # Generate prediction based on current performance
-    trend_variation = random.randint(-10, 10)
+    trend_variation = rng.randint(-10, 10)
     predicted_score = max(40, min(100, avg_score + trend_variation))
 
     # Determine trend
@@ -212,7 +215,7 @@ def generate_mock_ai_prediction(student_id: str, performance_records: List[Dict]
     confidence = min(95, 60 + len(performance_records) * 2)
 
     # Generate relevant suggestions
-    suggestions = random.sample(AI_SUGGESTIONS_POOL, min(3, len(AI_SUGGESTIONS_POOL)))
+    suggestions = rng.sample(AI_SUGGESTIONS_POOL, min(3, len(AI_SUGGESTIONS_POOL)))
 
     return {
         "student_id": student_id,
@@ -225,7 +228,7 @@ def generate_mock_ai_prediction(student_id: str, performance_records: List[Dict]
 
 def generate_mock_ai_suggestions(student_id: str, performance_records: List[Dict]) -> Dict[str, Any]:
     """Generate mock AI improvement suggestions"""
-    random.seed(get_student_seed(student_id) + 3)
+    rng = random.Random(get_student_seed(student_id) + 3)
 
     if not performance_records:
         return {
@@ -252,8 +255,8 @@ def generate_mock_ai_suggestions(student_id: str, performance_records: List[Dict
             weak_areas.append(category)
 
     # Generate 4-6 personalized suggestions
-    num_suggestions = random.randint(4, 6)
-    suggestions = random.sample(AI_SUGGESTIONS_POOL, min(num_suggestions, len(AI_SUGGESTIONS_POOL)))
+    num_suggestions = rng.randint(4, 6)
+    suggestions = rng.sample(AI_SUGGESTIONS_POOL, min(num_suggestions, len(AI_SUGGESTIONS_POOL)))
 
     return {
         "student_id": student_id,
@@ -342,9 +345,32 @@ def generate_mock_analytics(student_id: str, performance_records: List[Dict]) ->
         "last_updated": datetime.utcnow()
     }
 
+# Generated data is deterministic per student and relative to today's date,
+# so it is memoized per (student_id, date) and copied out to callers
+_mock_cache: LRUCache = LRUCache(maxsize=512)
+
+def clear_mock_cache():
+    _mock_cache.clear()
+
+def _copy_containers(value):
+    """Copy dicts/lists recursively; leaves (str, numbers, datetimes, enums) are immutable."""
+    if isinstance(value, dict):
+        return {k: _copy_containers(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_containers(v) for v in value]
+    return value
+
 # Convenience functions for API routes
 def get_mock_performance_data(student_id: str):
     """Get all mock performance data for a student"""
+    cache_key = (student_id, datetime.utcnow().date())
+    cached = _mock_cache.get(cache_key)
+    if cached is None:
+        cached = _mock_cache[cache_key] = _generate_mock_performance_data(student_id)
+    # Callers mutate the result (e.g. adding student_name), so never hand out the cached dicts
+    return _copy_containers(cached)
+
+def _generate_mock_performance_data(student_id: str):
     records = generate_mock_performance_records(student_id)
     notifications = generate_mock_notifications(student_id, records)
     ai_prediction = generate_mock_ai_prediction(student_id, records)
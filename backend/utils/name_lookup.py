@@ -0,0 +1,65 @@
+# backend/utils/name_lookup.py
+"""
+Index-backed lookup of clubs by name and events by title.
+Each document stores a folded key (see utils.text_keys.fold_text) next to
+its display name. Lookups try the exact key first, then an anchored prefix
+match on the escaped key, both of which use the key index.
+"""
+import logging
+import re
+from typing import Any, Dict, Optional
+
+from pymongo import UpdateOne
+
+from config.db import db
+from utils.text_keys import fold_text
+
+logger = logging.getLogger(__name__)
+
+# collection -> (display field, key field)
+NAME_KEY_FIELDS = {
+    "clubs": ("name", "name_key"),
+    "events": ("title", "title_key"),
+}
+
+
+def with_name_key(collection: str, doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Set the folded key on a document (or $set payload) that carries the display field."""
+    field, key_field = NAME_KEY_FIELDS[collection]
+    if field in doc:
+        doc[key_field] = fold_text(doc[field])
+    return doc
+
+
+async def find_by_name(collection: str, name: str, projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    _, key_field = NAME_KEY_FIELDS[collection]
+    key = fold_text(name)
+    if not key:
+        return None
+    doc = await db[collection].find_one({key_field: key}, projection)
+    if doc is None:
+        # Anchored and escaped, so it stays an index range scan whatever the user typed
+        doc = await db[collection].find_one(
+            {key_field: {"$regex": f"^{re.escape(key)}"}}, projection, sort=[(key_field, 1)]
+        )
+    return doc
+
+
+async def ensure_name_key_indexes(batch_size: int = 1000):
+    """Backfill missing keys on older documents and index them."""
+    for collection, (field, key_field) in NAME_KEY_FIELDS.items():
+        updates = []
+        backfilled = 0
+        cursor = db[collection].find({key_field: {"$exists": False}, field: {"$type": "string"}}, {field: 1})
+        async for doc in cursor:
+            updates.append(UpdateOne({"_id": doc["_id"]}, {"$set": {key_field: fold_text(doc[field])}}))
+            if len(updates) >= batch_size:
+                await db[collection].bulk_write(updates, ordered=False)
+                backfilled += len(updates)
+                updates = []
+        if updates:
+            await db[collection].bulk_write(updates, ordered=False)
+            backfilled += len(updates)
+        if backfilled:
+            logger.info(f"Backfilled {key_field} on {backfilled} {collection}")
+        await db[collection].create_index(key_field)
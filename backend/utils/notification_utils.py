@@ -11,6 +11,7 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
+from utils.job_queue import job_queue
 
 logger = logging.getLogger(__name__)
 
@@ -44,9 +45,9 @@ class NotificationService:
         result = await db[NOTIFICATIONS_COLLECTION].insert_one(notification)
         notification_id = str(result.inserted_id)
 
-        # Send email if configured and high priority
+        # Send email in the background if configured and high priority
         if priority == "high" and self._email_enabled():
-            await self._send_email_notification(notification)
+            await job_queue.enqueue("notification.send_email", {"notification_id": notification_id})
 
         logger.info(f"Created notification {notification_id} for student {student_id}")
         return notification_id
@@ -103,69 +104,72 @@ class NotificationService:
         return bool(os.getenv("SMTP_SERVER") and os.getenv("SMTP_PORT"))
 
     async def _send_email_notification(self, notification: Dict[str, Any]):
-        """Send email notification asynchronously."""
-        try:
-            # Get student email
-            student = await db["users"].find_one({"_id": ObjectId(notification["student_id"])})
-            if not student or not student.get("email"):
-                logger.warning(f"No email found for student {notification['student_id']}")
-                return
-
-            # Run email sending in thread pool
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                self.executor,
-                self._send_email_sync,
-                student["email"],
-                notification["title"],
-                notification["message"]
-            )
-
-        except Exception as e:
-            logger.error(f"Failed to send email notification: {e}")
+        """Send email notification asynchronously. Errors propagate so the job queue can retry."""
+        # Get student email
+        student = await db["users"].find_one({"_id": ObjectId(notification["student_id"])})
+        if not student or not student.get("email"):
+            logger.warning(f"No email found for student {notification['student_id']}")
+            return
+
+        # Run email sending in thread pool
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(
+            self.executor,
+            self._send_email_sync,
+            student["email"],
+            notification["title"],
+            notification["message"]
+        )
 
     def _send_email_sync(self, to_email: str, subject: str, message: str):
         """Send email synchronously."""
-        try:
-            smtp_server = os.getenv("SMTP_SERVER")
-            smtp_port = int(os.getenv("SMTP_PORT", 587))
-            smtp_username = os.getenv("SMTP_USERNAME")
-            smtp_password = os.getenv("SMTP_PASSWORD")
-            from_email = os.getenv("FROM_EMAIL", smtp_username)
+        smtp_server = os.getenv("SMTP_SERVER")
+        smtp_port = int(os.getenv("SMTP_PORT", 587))
+        smtp_username = os.getenv("SMTP_USERNAME")
+        smtp_password = os.getenv("SMTP_PASSWORD")
+        from_email = os.getenv("FROM_EMAIL", smtp_username)
 
-            msg = MIMEMultipart()
-            msg['From'] = from_email
-            msg['To'] = to_email
-            msg['Subject'] = f"CampusBuzz - {subject}"
+        msg = MIMEMultipart()
+        msg['From'] = from_email
+        msg['To'] = to_email
+        msg['Subject'] = f"CampusBuzz - {subject}"
 
-            body = f"""
-            Dear Student,
+        body = f"""
+        Dear Student,
 
-            {message}
+        {message}
 
-            Please log in to your CampusBuzz dashboard to view more details.
+        Please log in to your CampusBuzz dashboard to view more details.
 
-            Best regards,
-            CampusBuzz Team
-            """
+        Best regards,
+        CampusBuzz Team
+        """
 
-            msg.attach(MIMEText(body, 'plain'))
+        msg.attach(MIMEText(body, 'plain'))
 
-            server = smtplib.SMTP(smtp_server, smtp_port)
+        server = smtplib.SMTP(smtp_server, smtp_port, timeout=30)
+        try:
             server.starttls()
             server.login(smtp_username, smtp_password)
             text = msg.as_string()
             server.sendmail(from_email, to_email, text)
+        finally:
             server.quit()
 
-            logger.info(f"Email sent to {to_email}")
-
-        except Exception as e:
-            logger.error(f"Failed to send email: {e}")
+        logger.info(f"Email sent to {to_email}")
 
 # Global notification service instance
 notification_service = NotificationService()
 
+@job_queue.task("notification.send_email", max_attempts=5, visibility_timeout=90)
+async def send_email_job(payload: Dict[str, Any]):
+    """Background job: deliver the email for a stored notification."""
+    notification = await db[NOTIFICATIONS_COLLECTION].find_one({"_id": ObjectId(payload["notification_id"])})
+    if not notification:
+        logger.warning(f"Notification {payload['notification_id']} no longer exists, skipping email")
+        return
+    await notification_service._send_email_notification(notification)
+
 # Convenience functions
 async def create_performance_notification(
     student_id: str,
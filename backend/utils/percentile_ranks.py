@@ -0,0 +1,109 @@
+# backend/utils/percentile_ranks.py
+"""
+In-memory percentile ranks per cohort.
+Sorted arrays of overall_average are rebuilt periodically from
+performance_analytics; rank and percentile lookups are O(log n) bisects.
+"""
+import logging
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.db import db
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_COLLECTION = "performance_analytics"
+ALL_COHORT = "all"
+
+
+def department_cohort(department: Optional[str]) -> Optional[str]:
+    return f"department:{department}" if department else None
+
+
+class CohortRanks:
+    """Scores for one cohort, sorted ascending, with student ids in matching order."""
+
+    def __init__(self, entries: List[Tuple[float, str]]):
+        entries.sort()
+        self.scores = [score for score, _ in entries]
+        self.students = [student_id for _, student_id in entries]
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def rank(self, score: float) -> int:
+        """1-based rank, 1 being the best; ties share the best rank."""
+        return len(self.scores) - bisect_right(self.scores, score) + 1
+
+    def percentile(self, score: float) -> float:
+        """Percent of the cohort scoring below `score`, counting ties as half (mid-rank)."""
+        n = len(self.scores)
+        if n == 0:
+            return 0.0
+        below = bisect_left(self.scores, score)
+        equal = bisect_right(self.scores, score) - below
+        return round((below + 0.5 * equal) / n * 100, 1)
+
+    def top(self, n: int) -> List[Tuple[str, float]]:
+        """Highest n (student_id, score) pairs, best first."""
+        if n <= 0:
+            return []
+        return list(zip(reversed(self.students[-n:]), reversed(self.scores[-n:])))
+
+    def bottom(self, n: int) -> List[Tuple[str, float]]:
+        """Lowest n (student_id, score) pairs, worst first."""
+        return list(zip(self.students[:n], self.scores[:n]))
+
+
+class RankIndex:
+    def __init__(self):
+        self.cohorts: Dict[str, CohortRanks] = {}
+        self.built_at: Optional[datetime] = None
+
+    def load(self, rows: List[Dict[str, Any]]):
+        """Build every cohort from analytics rows and swap them in at once."""
+        grouped: Dict[str, List[Tuple[float, str]]] = {ALL_COHORT: []}
+        for row in rows:
+            entry = (float(row["overall_average"]), row["student_id"])
+            grouped[ALL_COHORT].append(entry)
+            cohort = department_cohort(row.get("department"))
+            if cohort:
+                grouped.setdefault(cohort, []).append(entry)
+        self.cohorts = {name: CohortRanks(entries) for name, entries in grouped.items()}
+        self.built_at = datetime.utcnow()
+
+    async def rebuild(self):
+        cursor = db[ANALYTICS_COLLECTION].find(
+            {"total_records": {"$gt": 0}},
+            {"_id": 0, "student_id": 1, "overall_average": 1, "department": 1}
+        )
+        rows = [row async for row in cursor if row.get("overall_average") is not None]
+        self.load(rows)
+        logger.info(f"Rebuilt percentile ranks for {len(rows)} students in {len(self.cohorts)} cohorts")
+
+    async def ensure_built(self):
+        if self.built_at is None:
+            await self.rebuild()
+
+    def get(self, cohort: str) -> Optional[CohortRanks]:
+        return self.cohorts.get(cohort)
+
+    def describe(self, score: float, department: Optional[str] = None) -> Dict[str, Any]:
+        """Rank within the student's department when known, else campus-wide."""
+        cohort = department_cohort(department)
+        if cohort not in self.cohorts:
+            cohort = ALL_COHORT
+        ranks = self.cohorts.get(cohort)
+        if not ranks:
+            return {"cohort": cohort, "rank": None, "cohort_size": 0, "percentile": None}
+        return {
+            "cohort": cohort,
+            "rank": ranks.rank(score),
+            "cohort_size": len(ranks),
+            "percentile": ranks.percentile(score),
+        }
+
+
+# Global rank index (one per worker process)
+rank_index = RankIndex()
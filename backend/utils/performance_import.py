@@ -0,0 +1,281 @@
+# backend/utils/performance_import.py
+"""
+Bulk import of performance records from CSV or NDJSON uploads.
+Rows are parsed as a stream, validated against PerformanceRecordIn and
+written in unordered insert_many batches. Analytics are recomputed once
+per affected student after the whole file has been written.
+"""
+import codecs
+import csv
+import json
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+
+from config.db import db
+from models.performance_model import PerformanceRecordIn, PerformanceThreshold
+from utils.performance_rollups import apply_records_to_rollups
+from utils.performance_utils import (
+    PERFORMANCE_COLLECTION, calculate_performance_level, get_performance_thresholds,
+    schedule_analytics_update
+)
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_FORMATS = ("csv", "ndjson")
+DEFAULT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+
+async def iter_upload_lines(upload, chunk_size: int = 64 * 1024) -> AsyncIterator[str]:
+    """Yield decoded lines from an UploadFile without reading it fully into memory."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+        try:
+            pending += decoder.decode(chunk)
+        except UnicodeDecodeError as e:
+            # Hand out the complete lines before the bad bytes, then fail on the line holding them
+            pending += e.object[:e.start].decode("utf-8")
+            if pending.startswith("\ufeff"):
+                pending = pending[1:]
+            for line in pending.split("\n")[:-1]:
+                yield line.rstrip("\r")
+            raise
+        lines = pending.split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    """Guess the upload format from its file extension or content type."""
+    name = (filename or "").lower()
+    ctype = (content_type or "").lower()
+    if name.endswith(".csv") or "csv" in ctype:
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in ctype or "jsonlines" in ctype:
+        return "ndjson"
+    return None
+
+
+class RowParser:
+    """
+    Incremental row parser; feed lines one at a time, get dict rows back.
+    CSV lines go through a single csv.reader, which is only advanced once
+    the buffered lines hold a complete record, so quoted fields may span
+    lines (e.g. multi-line remarks).
+    """
+
+    def __init__(self, fmt: str):
+        if fmt not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported format: {fmt}")
+        self.fmt = fmt
+        self.header: Optional[List[str]] = None
+        self.pending: Deque[str] = deque()
+        self.open_quotes = False
+        self.reader = csv.reader(iter(self.pending.popleft, None))
+
+    @property
+    def in_record(self) -> bool:
+        """True while a quoted CSV field is still waiting for its closing quote."""
+        return self.open_quotes
+
+    def parse(self, line: str) -> Optional[Dict[str, Any]]:
+        """Return the row for a line, or None for blank lines, the CSV header and unfinished records."""
+        if not self.open_quotes and not line.strip():
+            return None
+        if self.fmt == "ndjson":
+            row = json.loads(line)
+            if not isinstance(row, dict):
+                raise ValueError("Each NDJSON line must be a JSON object")
+            return row
+
+        self.pending.append(line + "\n")
+        # Escaped quotes come in pairs, so an odd count toggles whether a field is open
+        if line.count('"') % 2:
+            self.open_quotes = not self.open_quotes
+        if self.open_quotes:
+            return None
+        try:
+            values = next(self.reader)
+        except csv.Error as e:
+            self.pending.clear()
+            raise ValueError(f"Malformed CSV: {e}")
+        if self.header is None:
+            self.header = [h.strip() for h in values]
+            return None
+        if len(values) != len(self.header):
+            raise ValueError(f"Expected {len(self.header)} columns, got {len(values)}")
+        row = {}
+        for key, value in zip(self.header, values):
+            value = value.strip()
+            if value == "":
+                continue
+            if key == "metadata":
+                value = json.loads(value)
+            row[key] = value
+        return row
+
+    def finish(self):
+        """Raise if the input ended inside a quoted field."""
+        if self.open_quotes:
+            self.pending.clear()
+            self.open_quotes = False
+            raise ValueError("File ended inside a quoted field")
+
+
+def build_record(row: Dict[str, Any], thresholds: PerformanceThreshold, now: datetime) -> Dict[str, Any]:
+    """
+    Validate a parsed row and turn it into a performance_records document.
+    An optional ISO-8601 `created_at` column keeps historical dates intact;
+    values with an offset are converted to naive UTC like the rest of the app.
+    """
+    row = dict(row)
+    created_at = row.pop("created_at", None)
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+        if created_at.tzinfo is not None:
+            created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+    record = PerformanceRecordIn(**row)
+    record_data = record.dict()
+    record_data["calculated_level"] = calculate_performance_level(record.score, thresholds)
+    record_data["created_at"] = created_at or now
+    record_data["updated_at"] = now
+    return record_data
+
+
+def _format_error(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in error.errors()
+        )
+    return str(error)
+
+
+class ImportSummary:
+    def __init__(self):
+        self.rows = 0
+        self.inserted = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.students: Set[str] = set()
+        self.aborted = False
+
+    def add_error(self, line: int, message: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+            "students_affected": len(self.students),
+            "aborted": self.aborted,
+        }
+
+
+async def _flush(batch: List[Tuple[int, Dict[str, Any]]], summary: ImportSummary, collection: str):
+    if not batch:
+        return
+    docs = [doc for _, doc in batch]
+    try:
+        result = await db[collection].insert_many(docs, ordered=False)
+        inserted = len(result.inserted_ids)
+        failed_indexes = set()
+    except BulkWriteError as e:
+        inserted = e.details.get("nInserted", 0)
+        failed_indexes = set()
+        for write_error in e.details.get("writeErrors", []):
+            failed_indexes.add(write_error["index"])
+            summary.add_error(batch[write_error["index"]][0], write_error.get("errmsg", "write failed"))
+
+    summary.inserted += inserted
+    written = [doc for index, (_, doc) in enumerate(batch) if index not in failed_indexes]
+    for doc in written:
+        summary.students.add(doc["student_id"])
+    # Scratch collections (benchmarks) must not touch the live rollups
+    if collection == PERFORMANCE_COLLECTION:
+        await apply_records_to_rollups(written)
+    batch.clear()
+
+
+async def import_performance_records(
+    lines: AsyncIterator[str],
+    fmt: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    collection: str = PERFORMANCE_COLLECTION,
+    schedule_analytics: bool = True,
+) -> Dict[str, Any]:
+    """
+    Stream-import records and return a summary.
+    A decoding error stops the import but still returns the partial summary
+    (rows already written stay written and get their analytics refreshed).
+    Per-record low-performance notifications are intentionally not sent here;
+    the scheduled low-performance check picks bulk-loaded students up.
+    """
+    thresholds = await get_performance_thresholds()
+    now = datetime.utcnow()
+    parser = RowParser(fmt)
+    summary = ImportSummary()
+    batch: List[Tuple[int, Dict[str, Any]]] = []
+    line_no = 0
+    # First line of the current record (CSV records can span lines)
+    record_line = 0
+
+    try:
+        async for line in lines:
+            line_no += 1
+            if not parser.in_record:
+                record_line = line_no
+            try:
+                row = parser.parse(line)
+            except (ValueError, TypeError) as e:
+                summary.rows += 1
+                summary.add_error(record_line, _format_error(e))
+                continue
+            if row is None:
+                continue
+
+            summary.rows += 1
+            try:
+                batch.append((record_line, build_record(row, thresholds, now)))
+            except (ValidationError, ValueError, TypeError) as e:
+                summary.add_error(record_line, _format_error(e))
+                continue
+
+            if len(batch) >= batch_size:
+                await _flush(batch, summary, collection)
+    except UnicodeDecodeError as e:
+        # Rows before the bad bytes are already written; stop and report what got in
+        summary.aborted = True
+        summary.add_error(line_no + 1, f"File must be UTF-8 encoded ({e.reason}); import stopped here")
+    else:
+        try:
+            parser.finish()
+        except ValueError as e:
+            summary.rows += 1
+            summary.add_error(record_line, str(e))
+
+    await _flush(batch, summary, collection)
+
+    if schedule_analytics:
+        for student_id in summary.students:
+            await schedule_analytics_update(student_id)
+
+    logger.info(f"Imported {summary.inserted}/{summary.rows} performance records for {len(summary.students)} students")
+    return summary.to_dict()
@@ -0,0 +1,194 @@
+# backend/utils/performance_rollups.py
+"""
+Monthly performance rollups (student x month x type x category).
+Each rollup holds count, sum, min and max so trend charts can read a few
+dozen small documents instead of every raw record.
+
+Backfill / rebuild from raw records:
+    python -m utils.performance_rollups --backfill
+    python -m utils.performance_rollups --backfill --student <student_id>
+"""
+import argparse
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo import UpdateOne
+
+from config.db import db
+
+logger = logging.getLogger(__name__)
+
+PERFORMANCE_COLLECTION = "performance_records"
+ROLLUPS_COLLECTION = "performance_rollups"
+
+
+def month_key(dt: datetime) -> str:
+    return dt.strftime("%Y-%m")
+
+
+def _enum_value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+def rollup_id(student_id: str, month: str, record_type: str, category: str) -> str:
+    return f"{student_id}|{month}|{record_type}|{category}"
+
+
+def build_rollup_updates(records: Iterable[Dict[str, Any]]) -> List[UpdateOne]:
+    """Pre-aggregate records in memory and return one upsert per rollup bucket."""
+    buckets: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+    for record in records:
+        month = month_key(record["created_at"])
+        record_type = _enum_value(record["type"])
+        category = record.get("category") or "unknown"
+        key = rollup_id(record["student_id"], month, record_type, category)
+        score = float(record["score"])
+        bucket = buckets.get(key)
+        if bucket is None:
+            buckets[key] = {
+                "fields": {"student_id": record["student_id"], "month": month, "type": record_type, "category": category},
+                "count": 1, "sum": score, "min": score, "max": score,
+            }
+        else:
+            bucket["count"] += 1
+            bucket["sum"] += score
+            bucket["min"] = min(bucket["min"], score)
+            bucket["max"] = max(bucket["max"], score)
+
+    now = datetime.utcnow()
+    return [
+        UpdateOne(
+            {"_id": key},
+            {
+                "$setOnInsert": bucket["fields"],
+                "$inc": {"count": bucket["count"], "sum": bucket["sum"]},
+                "$min": {"min": bucket["min"]},
+                "$max": {"max": bucket["max"]},
+                "$set": {"updated_at": now},
+            },
+            upsert=True,
+        )
+        for key, bucket in buckets.items()
+    ]
+
+
+async def apply_records_to_rollups(records: List[Dict[str, Any]]):
+    """Incrementally fold newly inserted records into their rollups."""
+    updates = build_rollup_updates(records)
+    if updates:
+        await db[ROLLUPS_COLLECTION].bulk_write(updates, ordered=False)
+
+
+def _rollup_pipeline(match: Dict[str, Any]) -> List[Dict[str, Any]]:
+    month = {"$dateToString": {"format": "%Y-%m", "date": "$created_at"}}
+    category = {"$ifNull": ["$category", "unknown"]}
+    return [
+        {"$match": match},
+        {"$group": {
+            "_id": {"$concat": ["$student_id", "|", month, "|", "$type", "|", category]},
+            "student_id": {"$first": "$student_id"},
+            "month": {"$first": month},
+            "type": {"$first": "$type"},
+            "category": {"$first": category},
+            "count": {"$sum": 1},
+            "sum": {"$sum": "$score"},
+            "min": {"$min": "$score"},
+            "max": {"$max": "$score"},
+        }},
+        {"$set": {"updated_at": "$$NOW"}},
+        {"$merge": {"into": ROLLUPS_COLLECTION, "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}},
+    ]
+
+
+async def rebuild_rollups(student_id: Optional[str] = None, months: Optional[List[str]] = None):
+    """
+    Recompute rollups from raw records. Used for the backfill and after record
+    updates, since min/max cannot be maintained by decrementing.
+    """
+    match: Dict[str, Any] = {}
+    rollup_filter: Dict[str, Any] = {}
+    if student_id:
+        match["student_id"] = student_id
+        rollup_filter["student_id"] = student_id
+    if months:
+        match["$expr"] = {"$in": [{"$dateToString": {"format": "%Y-%m", "date": "$created_at"}}, months]}
+        rollup_filter["month"] = {"$in": months}
+
+    await db[ROLLUPS_COLLECTION].delete_many(rollup_filter)
+    await db[PERFORMANCE_COLLECTION].aggregate(_rollup_pipeline(match), allowDiskUse=True).to_list(None)
+
+
+async def ensure_rollup_indexes():
+    await db[ROLLUPS_COLLECTION].create_index([("student_id", 1), ("month", 1)])
+
+
+def combine_rollups(rollups: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Merge type/category rollups into one point per month, ordered by month."""
+    months: Dict[str, Dict[str, Any]] = {}
+    for rollup in rollups:
+        point = months.get(rollup["month"])
+        if point is None:
+            months[rollup["month"]] = {
+                "month": rollup["month"], "count": rollup["count"], "sum": rollup["sum"],
+                "min": rollup["min"], "max": rollup["max"],
+            }
+        else:
+            point["count"] += rollup["count"]
+            point["sum"] += rollup["sum"]
+            point["min"] = min(point["min"], rollup["min"])
+            point["max"] = max(point["max"], rollup["max"])
+
+    points = []
+    for month in sorted(months):
+        point = months[month]
+        points.append({
+            "month": month,
+            "count": point["count"],
+            "average": round(point["sum"] / point["count"], 2) if point["count"] else 0,
+            "min": point["min"],
+            "max": point["max"],
+        })
+    return points
+
+
+async def get_student_timeseries(
+    student_id: str,
+    months: int = 48,
+    record_type: Optional[str] = None,
+    category: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Monthly points for a student, read only from rollups."""
+    now = datetime.utcnow()
+    start_index = now.year * 12 + now.month - 1 - (months - 1)
+    start_month = f"{start_index // 12:04d}-{start_index % 12 + 1:02d}"
+
+    query: Dict[str, Any] = {"student_id": student_id, "month": {"$gte": start_month}}
+    if record_type:
+        query["type"] = record_type
+    if category:
+        query["category"] = category
+
+    rollups = await db[ROLLUPS_COLLECTION].find(query, {"_id": 0}).to_list(None)
+    return combine_rollups(rollups)
+
+
+async def _main():
+    parser = argparse.ArgumentParser(description="Maintain performance rollups")
+    parser.add_argument("--backfill", action="store_true", help="rebuild rollups from raw records")
+    parser.add_argument("--student", help="only rebuild rollups for this student id")
+    args = parser.parse_args()
+
+    if not args.backfill:
+        parser.print_help()
+        return
+    await ensure_rollup_indexes()
+    await rebuild_rollups(student_id=args.student)
+    total = await db[ROLLUPS_COLLECTION].count_documents({"student_id": args.student} if args.student else {})
+    print(f"Rollups rebuilt: {total} documents")
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -0,0 +1,200 @@
+# backend/utils/performance_storage.py
+"""
+Storage mode for performance_records.
+
+PERFORMANCE_STORAGE_MODE=standard    regular collection (default)
+PERFORMANCE_STORAGE_MODE=timeseries  MongoDB time-series collection with
+                                     student_id as metaField and created_at
+                                     as timeField
+
+Queries are identical in both modes. Time-series mode needs MongoDB 7.0+,
+where updates and deletes by _id are allowed on time-series collections.
+
+Migrate an existing collection. Stop the app (or otherwise block writes to
+performance_records) first: records written during the copy would be lost,
+so the migration refuses to run without --writes-stopped and aborts if the
+source count changes while copying. MongoDB cannot rename time-series
+collections, so the old collection is moved aside to a standard backup
+(renamed if standard, copied if time-series) and the new collection is
+created under the final name and filled from that backup:
+    python -m utils.performance_storage --status
+    python -m utils.performance_storage --migrate timeseries --writes-stopped
+    python -m utils.performance_storage --migrate standard --writes-stopped --drop-backup
+"""
+import argparse
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from config.db import db
+
+logger = logging.getLogger(__name__)
+
+PERFORMANCE_COLLECTION = "performance_records"
+STORAGE_MODES = ("standard", "timeseries")
+TIME_FIELD = "created_at"
+META_FIELD = "student_id"
+
+
+def get_storage_mode() -> str:
+    mode = os.getenv("PERFORMANCE_STORAGE_MODE", "standard").lower()
+    if mode not in STORAGE_MODES:
+        raise ValueError(f"Unknown PERFORMANCE_STORAGE_MODE: {mode}")
+    return mode
+
+
+def collection_options(mode: str) -> Dict[str, Any]:
+    """create_collection() options for a storage mode."""
+    if mode not in STORAGE_MODES:
+        raise ValueError(f"Unknown storage mode: {mode}")
+    if mode == "standard":
+        return {}
+    return {"timeseries": {
+        "timeField": TIME_FIELD,
+        "metaField": META_FIELD,
+        # Students log a handful of records per week, so hourly buckets fit
+        "granularity": os.getenv("PERFORMANCE_TIMESERIES_GRANULARITY", "hours"),
+    }}
+
+
+async def get_collection_mode(name: str = PERFORMANCE_COLLECTION) -> Optional[str]:
+    """Storage mode of an existing collection, or None if it does not exist."""
+    infos = await db.list_collections(filter={"name": name}).to_list(None)
+    if not infos:
+        return None
+    return "timeseries" if infos[0].get("type") == "timeseries" else "standard"
+
+
+async def create_performance_collection(name: str, mode: str):
+    """Create a records collection in the given mode with the query indexes."""
+    await db.create_collection(name, **collection_options(mode))
+    await db[name].create_index([("student_id", 1), ("created_at", 1)])
+    await db[name].create_index([("type", 1), ("created_at", 1)])
+
+
+async def ensure_performance_collection():
+    """Create performance_records in the configured mode; warn if the existing one differs."""
+    mode = get_storage_mode()
+    current = await get_collection_mode()
+    if current is None:
+        await create_performance_collection(PERFORMANCE_COLLECTION, mode)
+        logger.info(f"Created {PERFORMANCE_COLLECTION} as a {mode} collection")
+        return
+    if current != mode:
+        logger.warning(
+            f"{PERFORMANCE_COLLECTION} is a {current} collection but PERFORMANCE_STORAGE_MODE={mode}; "
+            f"stop the app and run: python -m utils.performance_storage --migrate {mode} --writes-stopped"
+        )
+    await db[PERFORMANCE_COLLECTION].create_index([("student_id", 1), ("created_at", 1)])
+
+
+async def collection_stats(name: str) -> Dict[str, Any]:
+    stats = await db.command("collStats", name)
+    return {
+        "count": stats.get("count", 0),
+        "size_bytes": stats.get("size", 0),
+        "storage_bytes": stats.get("storageSize", 0),
+        "index_bytes": stats.get("totalIndexSize", 0),
+    }
+
+
+async def _copy_records(source: str, target: str, batch_size: int) -> Dict[str, int]:
+    migrated = skipped = 0
+    batch = []
+    # Time-series buckets fill best when inserts arrive grouped by meta, in time order
+    async for record in db[source].find({}).sort([("student_id", 1), ("created_at", 1)]):
+        if not isinstance(record.get(TIME_FIELD), datetime):
+            skipped += 1
+            continue
+        batch.append(record)
+        if len(batch) >= batch_size:
+            await db[target].insert_many(batch, ordered=False)
+            migrated += len(batch)
+            batch = []
+    if batch:
+        await db[target].insert_many(batch, ordered=False)
+        migrated += len(batch)
+    return {"migrated": migrated, "skipped": skipped}
+
+
+async def _move_aside(current: str, backup: str, batch_size: int):
+    """Move performance_records to a standard backup collection."""
+    if current == "standard":
+        await db[PERFORMANCE_COLLECTION].rename(backup)
+        return
+    # Time-series collections can't be renamed: copy, verify, then drop
+    before = await db[PERFORMANCE_COLLECTION].count_documents({})
+    await create_performance_collection(backup, "standard")
+    copied = await _copy_records(PERFORMANCE_COLLECTION, backup, batch_size)
+    if copied["migrated"] + copied["skipped"] != before or await db[PERFORMANCE_COLLECTION].count_documents({}) != before:
+        await db[backup].drop()
+        raise RuntimeError(f"{PERFORMANCE_COLLECTION} changed while it was being copied; block writes and retry")
+    if copied["skipped"]:
+        # Records without a datetime created_at can't exist in a time-series collection
+        raise RuntimeError(f"{copied['skipped']} records could not be copied; {PERFORMANCE_COLLECTION} left untouched")
+    await db[PERFORMANCE_COLLECTION].drop()
+
+
+async def migrate_storage(
+    target: str,
+    batch_size: int = 5000,
+    drop_backup: bool = False,
+    writes_stopped: bool = False,
+) -> Dict[str, Any]:
+    """
+    Rebuild performance_records in the target mode, keeping the old data as a
+    backup. Only safe while nothing writes to performance_records.
+    """
+    if not writes_stopped:
+        raise RuntimeError(
+            f"Stop the app or block writes to {PERFORMANCE_COLLECTION} before migrating "
+            f"(records written during the copy would be lost), then pass writes_stopped=True"
+        )
+    if target not in STORAGE_MODES:
+        raise ValueError(f"Unknown storage mode: {target}")
+    current = await get_collection_mode()
+    if current is None:
+        raise ValueError(f"{PERFORMANCE_COLLECTION} does not exist")
+    if current == target:
+        return {"migrated": 0, "skipped": 0, "mode": target, "backup": None}
+
+    stamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    backup = f"{PERFORMANCE_COLLECTION}_{current}_backup_{stamp}"
+    await _move_aside(current, backup, batch_size)
+
+    await create_performance_collection(PERFORMANCE_COLLECTION, target)
+    result = await _copy_records(backup, PERFORMANCE_COLLECTION, batch_size)
+    if drop_backup and not result["skipped"]:
+        await db[backup].drop()
+        backup = None
+
+    logger.info(f"Migrated {result['migrated']} performance records to {target} storage ({result['skipped']} skipped)")
+    return {**result, "mode": target, "backup": backup}
+
+
+async def _main():
+    parser = argparse.ArgumentParser(description="Manage performance_records storage mode")
+    parser.add_argument("--status", action="store_true", help="show mode and storage size")
+    parser.add_argument("--migrate", choices=STORAGE_MODES, help="convert the collection to this mode")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--drop-backup", action="store_true", help="drop the old collection after the swap")
+    parser.add_argument("--writes-stopped", action="store_true",
+                        help="confirm the app is stopped or writes to performance_records are blocked")
+    args = parser.parse_args()
+
+    if args.migrate:
+        result = await migrate_storage(args.migrate, args.batch_size, args.drop_backup, args.writes_stopped)
+        print(f"Migrated {result['migrated']} records to {result['mode']} ({result['skipped']} skipped without {TIME_FIELD})")
+        if result["backup"]:
+            print(f"Previous collection kept as {result['backup']}")
+    if args.status or not args.migrate:
+        mode = await get_collection_mode()
+        print(f"{PERFORMANCE_COLLECTION}: {mode or 'missing'} (configured: {get_storage_mode()})")
+        if mode:
+            print(await collection_stats(PERFORMANCE_COLLECTION))
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -6,6 +6,9 @@ from models.performance_model import PerformanceThreshold, PerformanceLevel, Per
 import numpy as np
 from sklearn.linear_model import LinearRegression
 import logging
+from utils.job_queue import job_queue
+from utils.cohort_analytics import invalidate_cohort_cache
+from utils.id_util import normalize_id
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +16,10 @@ PERFORMANCE_COLLECTION = "performance_records"
 ANALYTICS_COLLECTION = "performance_analytics"
 THRESHOLDS_COLLECTION = "performance_thresholds"
 
+# Lower rank = higher risk; used to order the admin analytics listing
+LEVEL_RISK_RANK = {PerformanceLevel.LOW: 0, PerformanceLevel.AVERAGE: 1, PerformanceLevel.EXCELLENT: 2}
+TREND_RISK_RANK = {"declining": 0, "insufficient_data": 1, "unknown": 1, "error": 1, "stable": 2, "improving": 3}
+
 async def get_performance_thresholds() -> PerformanceThreshold:
     """Get current performance thresholds from database."""
     thresholds = await db[THRESHOLDS_COLLECTION].find_one({})
@@ -45,12 +52,31 @@ async def get_student_records(student_id: str, days: int = 365) -> List[Dict[str
         records.append(record)
     return records
 
+def calculate_risk_score(level: PerformanceLevel, trend: str, overall_average: float) -> float:
+    """
+    Single sortable risk key: level first, then trend (declining first), then
+    lowest average. Averages are 0-100, so each rank step is a 200 point band.
+    """
+    level_rank = LEVEL_RISK_RANK.get(PerformanceLevel(level), 0)
+    trend_rank = TREND_RISK_RANK.get(trend, 1)
+    return round(level_rank * 1000 + trend_rank * 200 + float(overall_average), 2)
+
+async def get_student_cohort_fields(student_id: str) -> Dict[str, Any]:
+    """Profile fields copied onto analytics so cohort queries don't need a join."""
+    profile = await db["student_profiles"].find_one(
+        {"user_id": normalize_id(student_id)}, {"_id": 0, "department": 1, "year": 1}
+    )
+    profile = profile or {}
+    return {"department": profile.get("department"), "student_year": profile.get("year")}
+
 async def calculate_student_analytics(student_id: str) -> Dict[str, Any]:
     """Calculate comprehensive analytics for a student."""
     records = await get_student_records(student_id)
+    cohort_fields = await get_student_cohort_fields(student_id)
 
     if not records:
         return {
+            **cohort_fields,
             "student_id": student_id,
             "overall_average": 0,
             "academic_average": 0,
@@ -60,6 +86,7 @@ async def calculate_student_analytics(student_id: str) -> Dict[str, Any]:
             "academic_records": 0,
             "non_academic_records": 0,
             "trend": "insufficient_data",
+            "risk_score": calculate_risk_score(PerformanceLevel.LOW, "insufficient_data", 0),
             "last_updated": datetime.utcnow()
         }
 
@@ -104,6 +131,7 @@ async def calculate_student_analytics(student_id: str) -> Dict[str, Any]:
     semester_averages = {k: np.mean(v) for k, v in semester_averages.items()}
 
     return {
+        **cohort_fields,
         "student_id": student_id,
         "overall_average": round(overall_avg, 2),
         "academic_average": round(academic_avg, 2),
@@ -115,6 +143,7 @@ async def calculate_student_analytics(student_id: str) -> Dict[str, Any]:
         "category_averages": {k: round(v, 2) for k, v in category_averages.items()},
         "semester_averages": {k: round(v, 2) for k, v in semester_averages.items()},
         "trend": trend,
+        "risk_score": calculate_risk_score(level, trend, round(overall_avg, 2)),
         "last_updated": datetime.utcnow()
     }
 
@@ -236,5 +265,55 @@ async def update_student_analytics_async(student_id: str):
         {"$set": analytics},
         upsert=True
     )
+    await invalidate_cohort_cache()
+
+    logger.info(f"Updated analytics for student {student_id}")
+
+async def schedule_analytics_update(student_id: str) -> str:
+    """Queue an analytics recompute; repeated writes for a student share one pending job."""
+    await invalidate_cohort_cache()
+    return await job_queue.enqueue(
+        "performance.update_analytics",
+        {"student_id": student_id},
+        dedupe_key=f"analytics:{student_id}"
+    )
+
+@job_queue.task("performance.update_analytics", max_attempts=5, visibility_timeout=120)
+async def update_analytics_job(payload: Dict[str, Any]):
+    """Background job: recompute analytics, then refresh AI suggestions that depend on them."""
+    await update_student_analytics_async(payload["student_id"])
+    await job_queue.enqueue(
+        "ai.refresh_suggestions",
+        {"student_id": payload["student_id"]},
+        dedupe_key=f"ai_suggestions:{payload['student_id']}"
+    )
+
+async def ensure_analytics_indexes():
+    """Indexes for the paginated analytics listing, plus a risk_score backfill for older documents."""
+    level_rank = {"$switch": {
+        "branches": [
+            {"case": {"$eq": ["$performance_level", level.value]}, "then": rank}
+            for level, rank in LEVEL_RISK_RANK.items()
+        ],
+        "default": 0,
+    }}
+    trend_rank = {"$switch": {
+        "branches": [
+            {"case": {"$eq": ["$trend", trend]}, "then": rank}
+            for trend, rank in TREND_RISK_RANK.items()
+        ],
+        "default": 1,
+    }}
+    await db[ANALYTICS_COLLECTION].update_many(
+        {"risk_score": {"$exists": False}},
+        [{"$set": {"risk_score": {"$round": [{"$add": [
+            {"$multiply": [level_rank, 1000]},
+            {"$multiply": [trend_rank, 200]},
+            {"$ifNull": ["$overall_average", 0]},
+        ]}, 2]}}}]
+    )
 
-    logger.info(f"Updated analytics for student {student_id}")
\ No newline at end of file
+    await db[ANALYTICS_COLLECTION].create_index("student_id")
+    await db[ANALYTICS_COLLECTION].create_index([("risk_score", 1), ("student_id", 1)])
+    for field in ("performance_level", "trend", "department"):
+        await db[ANALYTICS_COLLECTION].create_index([(field, 1), ("risk_score", 1), ("student_id", 1)])
@@ -0,0 +1,331 @@
+# backend/utils/scheduler.py
+"""
+Lightweight asyncio job scheduler with a MongoDB leader lease.
+Every uvicorn worker runs the scheduler loop, but a job slot only executes
+on the worker that wins the lease for it.
+"""
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from config.db import db
+
+logger = logging.getLogger(__name__)
+
+LEASES_COLLECTION = "scheduler_leases"
+
+# Unique per process so two workers on the same host never share a lease
+OWNER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def _parse_cron_field(field: str, low: int, high: int) -> Set[int]:
+    """Parse one cron field (supports *, */n, a-b, a-b/n and comma lists)."""
+    values = set()
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step_str = part.split("/", 1)
+            step = int(step_str)
+            if step < 1:
+                raise ValueError(f"Invalid cron step: {step_str}")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_str, end_str = part.split("-", 1)
+            start, end = int(start_str), int(end_str)
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end:
+            raise ValueError(f"Cron value out of range: {field}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronTrigger:
+    """Standard 5-field cron expression: minute hour day-of-month month day-of-week (UTC)."""
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: {expression}")
+        self.expression = expression
+        self.minutes = _parse_cron_field(fields[0], 0, 59)
+        self.hours = _parse_cron_field(fields[1], 0, 23)
+        self.days = _parse_cron_field(fields[2], 1, 31)
+        self.months = _parse_cron_field(fields[3], 1, 12)
+        # Cron uses 0 (and 7) for Sunday, Python uses 6
+        self.weekdays = {(d - 1) % 7 for d in _parse_cron_field(fields[4], 0, 7)}
+        self.day_restricted = fields[2] != "*"
+        self.weekday_restricted = fields[4] != "*"
+
+    def _day_matches(self, dt: datetime) -> bool:
+        day_ok = dt.day in self.days
+        weekday_ok = dt.weekday() in self.weekdays
+        # Classic cron semantics: if both are restricted either one may match
+        if self.day_restricted and self.weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_fire_time(self, after: datetime) -> datetime:
+        """Return the first matching minute strictly after `after`."""
+        dt = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + timedelta(days=366 * 5)
+        while dt < limit:
+            if dt.month not in self.months:
+                dt = (dt.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+                continue
+            if not self._day_matches(dt):
+                dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if dt.hour not in self.hours:
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+                continue
+            if dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+                continue
+            return dt
+        raise ValueError(f"Cron expression never fires: {self.expression}")
+
+    def __repr__(self) -> str:
+        return f"cron[{self.expression}]"
+
+
+class IntervalTrigger:
+    """Fixed interval aligned to the epoch so every node computes the same slots."""
+
+    def __init__(self, seconds: float):
+        if seconds <= 0:
+            raise ValueError("Interval must be positive")
+        self.seconds = seconds
+
+    def next_fire_time(self, after: datetime) -> datetime:
+        epoch = datetime(1970, 1, 1)
+        elapsed = (after - epoch).total_seconds()
+        slots = int(elapsed // self.seconds) + 1
+        return epoch + timedelta(seconds=slots * self.seconds)
+
+    def __repr__(self) -> str:
+        return f"interval[{self.seconds}s]"
+
+
+class ScheduledJob:
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        trigger,
+        jitter: float = 0,
+        misfire_grace_time: float = 300,
+        lease_seconds: float = 3600,
+        exclusive: bool = True,
+    ):
+        self.name = name
+        self.func = func
+        self.trigger = trigger
+        self.jitter = jitter
+        self.misfire_grace_time = misfire_grace_time
+        self.lease_seconds = lease_seconds
+        self.exclusive = exclusive
+        self.task: Optional[asyncio.Task] = None
+        self.metrics: Dict[str, Any] = {
+            "name": name,
+            "trigger": repr(trigger),
+            "exclusive": exclusive,
+            "next_run_at": None,
+            "last_run_at": None,
+            "last_duration_ms": None,
+            "last_status": None,
+            "last_error": None,
+            "run_count": 0,
+            "failure_count": 0,
+            "misfire_count": 0,
+            "skipped_count": 0,
+            "error_count": 0,
+        }
+
+
+class Scheduler:
+    """Runs registered jobs on cron/interval triggers inside the event loop."""
+
+    def __init__(self):
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self.running = False
+
+    def add_job(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        cron: Optional[str] = None,
+        interval: Optional[float] = None,
+        jitter: float = 0,
+        misfire_grace_time: float = 300,
+        lease_seconds: float = 3600,
+        exclusive: bool = True,
+    ) -> ScheduledJob:
+        """
+        Register a job. Exactly one of `cron` or `interval` (seconds) is required.
+        Non-exclusive jobs skip the leader lease and run on every worker, which
+        is what per-process caches need.
+        """
+        if (cron is None) == (interval is None):
+            raise ValueError("Specify exactly one of cron or interval")
+        if name in self.jobs:
+            raise ValueError(f"Job already registered: {name}")
+        trigger = CronTrigger(cron) if cron else IntervalTrigger(interval)
+        job = ScheduledJob(name, func, trigger, jitter, misfire_grace_time, lease_seconds, exclusive)
+        self.jobs[name] = job
+        if self.running:
+            job.task = asyncio.create_task(self._run_job_loop(job))
+        return job
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        for job in self.jobs.values():
+            job.task = asyncio.create_task(self._run_job_loop(job))
+        logger.info(f"Scheduler started with {len(self.jobs)} jobs (owner {OWNER_ID})")
+
+    async def shutdown(self):
+        self.running = False
+        tasks = [job.task for job in self.jobs.values() if job.task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in self.jobs.values():
+            job.task = None
+
+    async def run_job_now(self, name: str) -> bool:
+        """Run a job immediately (still subject to the leader lease)."""
+        job = self.jobs[name]
+        return await self._execute(job, datetime.utcnow())
+
+    async def _run_job_loop(self, job: ScheduledJob):
+        scheduled = job.trigger.next_fire_time(datetime.utcnow())
+        while self.running:
+            job.metrics["next_run_at"] = scheduled
+            # Jitter spreads load but the slot identity stays the pre-jitter time
+            fire_at = scheduled + timedelta(seconds=random.uniform(0, job.jitter))
+            delay = (fire_at - datetime.utcnow()).total_seconds()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            lateness = (datetime.utcnow() - fire_at).total_seconds()
+            if lateness > job.misfire_grace_time:
+                job.metrics["misfire_count"] += 1
+                logger.warning(f"Job {job.name} misfired by {lateness:.0f}s; skipping slot {scheduled.isoformat()}")
+            else:
+                try:
+                    await self._execute(job, scheduled)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # e.g. Mongo unavailable while taking the lease; keep the job scheduled
+                    job.metrics["error_count"] += 1
+                    job.metrics["last_error"] = str(e)
+                    logger.error(f"Scheduler could not run {job.name} for slot {scheduled.isoformat()}: {e}")
+
+            # Coalesce: any slots missed while we were busy collapse into the next one
+            scheduled = job.trigger.next_fire_time(max(scheduled, datetime.utcnow()))
+
+    async def _execute(self, job: ScheduledJob, slot: datetime) -> bool:
+        if job.exclusive and not await acquire_lease(job.name, slot, job.lease_seconds):
+            job.metrics["skipped_count"] += 1
+            return False
+
+        started_at = datetime.utcnow()
+        start = time.perf_counter()
+        status, error = "success", None
+        try:
+            await job.func()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            status, error = "failed", str(e)
+            job.metrics["failure_count"] += 1
+            logger.error(f"Scheduled job {job.name} failed: {e}")
+        duration_ms = round((time.perf_counter() - start) * 1000, 1)
+
+        job.metrics.update({
+            "last_run_at": started_at,
+            "last_duration_ms": duration_ms,
+            "last_status": status,
+            "last_error": error,
+        })
+        job.metrics["run_count"] += 1
+
+        if job.exclusive:
+            try:
+                await release_lease(job.name, started_at, duration_ms, status, error)
+            except Exception as e:
+                logger.error(f"Failed to release lease for {job.name}: {e}")
+        return True
+
+    def get_metrics(self) -> List[Dict[str, Any]]:
+        return [dict(job.metrics) for job in self.jobs.values()]
+
+
+async def acquire_lease(job_name: str, slot: datetime, lease_seconds: float) -> bool:
+    """
+    Try to become leader for one slot of a job.
+    The lease document is keyed by job name; a worker can take it if it is free
+    (expired) and nobody has already run this slot. Losing the race surfaces
+    as a duplicate key error on the upsert.
+    """
+    now = datetime.utcnow()
+    try:
+        await db[LEASES_COLLECTION].find_one_and_update(
+            {
+                "_id": job_name,
+                "expires_at": {"$lte": now},
+                "slot": {"$ne": slot},
+            },
+            {"$set": {
+                "owner": OWNER_ID,
+                "slot": slot,
+                "acquired_at": now,
+                "expires_at": now + timedelta(seconds=lease_seconds),
+            }},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return True
+    except DuplicateKeyError:
+        return False
+
+
+async def release_lease(job_name: str, last_run_at: datetime, duration_ms: float, status: str, error: Optional[str]):
+    """Expire our lease and record cluster-visible run metrics."""
+    await db[LEASES_COLLECTION].update_one(
+        {"_id": job_name, "owner": OWNER_ID},
+        {"$set": {
+            "expires_at": datetime.utcnow(),
+            "last_run_at": last_run_at,
+            "last_duration_ms": duration_ms,
+            "last_status": status,
+            "last_error": error,
+        }},
+    )
+
+
+async def get_lease_status() -> List[Dict[str, Any]]:
+    """Cluster-wide view of every job's lease and last run."""
+    leases = []
+    async for lease in db[LEASES_COLLECTION].find({}):
+        lease["job"] = lease.pop("_id")
+        leases.append(lease)
+    return leases
+
+
+# Global scheduler instance
+scheduler = Scheduler()
@@ -0,0 +1,198 @@
+# backend/utils/search_index.py
+"""
+Incremental TF-IDF index over club and event text.
+Term counts are hashed into a fixed feature space, so a document's vector
+never depends on the others: when the chat context is reloaded after a
+write, only new or changed documents are vectorized and document
+frequencies are adjusted by the difference. IDF weighting (smoothed,
+sublinear tf, L2-normalized like sklearn's TfidfVectorizer) is reapplied
+to the stacked rows after each sync.
+
+KeywordIndex is a plain inverted index (folded token -> item positions)
+for profile keyword matching: a keyword hits an item when every one of its
+tokens occurs in the item's text.
+"""
+import heapq
+import json
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from utils.llm_cache import content_hash
+from utils.text_keys import tokenize
+
+N_FEATURES = 2 ** 18
+
+# Rough size of a prompt token, used to keep prompt context within a budget
+CHARS_PER_TOKEN = 4
+
+
+def club_text(club: dict) -> str:
+    return " ".join(str(club.get(field) or "") for field in ("name", "description", "faculty_incharge"))
+
+
+def event_text(event: dict) -> str:
+    parts = [str(event.get(field) or "") for field in ("title", "description", "venue", "clubName")]
+    return " ".join(parts + [str(tag) for tag in event.get("tags") or []])
+
+
+class TextIndex:
+    def __init__(self, n_features: int = N_FEATURES):
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features, analyzer=tokenize, alternate_sign=False, norm=None
+        )
+        # key -> (text hash, term count row)
+        self.entries: Dict[str, Tuple[str, sparse.csr_matrix]] = {}
+        self.df = np.zeros(n_features, dtype=np.int64)
+        self.keys: List[str] = []
+        self.items: List[dict] = []
+        self.idf: Optional[np.ndarray] = None
+        self.matrix: Optional[sparse.csr_matrix] = None
+        self.metrics = {"syncs": 0, "vectorized": 0, "removed": 0}
+
+    def sync(self, docs: Iterable[Tuple[str, str, dict]]):
+        """Make the index hold exactly `docs` ((key, text, item) triples), vectorizing only what changed."""
+        items: Dict[str, dict] = {}
+        changed: List[Tuple[str, str, str]] = []
+        for key, text, item in docs:
+            if key in items:
+                # Duplicate names still get their own row
+                key = f"{key}\x00{len(items)}"
+            items[key] = item
+            text_hash = content_hash(text)
+            entry = self.entries.get(key)
+            if entry and entry[0] == text_hash:
+                continue
+            if entry:
+                self.df[entry[1].indices] -= 1
+            changed.append((key, text, text_hash))
+
+        removed = [key for key in self.entries if key not in items]
+        for key in removed:
+            self.df[self.entries.pop(key)[1].indices] -= 1
+
+        if changed:
+            counts = self.vectorizer.transform([text for _, text, _ in changed]).tocsr()
+            for row, (key, _, text_hash) in enumerate(changed):
+                vector = counts[row]
+                self.entries[key] = (text_hash, vector)
+                self.df[vector.indices] += 1
+
+        self.keys = list(items)
+        self.items = list(items.values())
+        self.metrics["syncs"] += 1
+        self.metrics["vectorized"] += len(changed)
+        self.metrics["removed"] += len(removed)
+        if changed or removed or self.matrix is None:
+            self._reweight()
+
+    def _reweight(self):
+        n = len(self.keys)
+        self.idf = np.log((1 + n) / (1 + self.df)) + 1
+        if not n:
+            self.matrix = None
+            return
+        counts = sparse.vstack([self.entries[key][1] for key in self.keys]).tocsr()
+        self.matrix = self._weigh(counts)
+
+    def _weigh(self, counts: sparse.csr_matrix) -> sparse.csr_matrix:
+        weights = counts.astype(np.float64)
+        # Scale each stored value by its column's idf without touching the empty columns
+        weights.data = (1 + np.log(weights.data)) * self.idf[weights.indices]
+        return normalize(weights, copy=False)
+
+    def scores(self, query: str) -> np.ndarray:
+        """Cosine similarity of every item to `query`, aligned with `items`."""
+        if self.matrix is None:
+            return np.zeros(0)
+        vector = self._weigh(self.vectorizer.transform([query]).tocsr())
+        if not vector.nnz:
+            return np.zeros(len(self.items))
+        return (self.matrix @ vector.T).toarray().ravel()
+
+    def search(self, query: str, k: int, where: Optional[Callable[[dict], bool]] = None) -> List[Tuple[float, dict]]:
+        """Top-k items by similarity to `query` that pass `where`; items sharing no term with it are left out."""
+        if k <= 0:
+            return []
+        scores = self.scores(query)
+        candidates = np.flatnonzero(scores > 0)
+        if where is not None:
+            candidates = candidates[[where(self.items[i]) for i in candidates]] if len(candidates) else candidates
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(float(scores[i]), self.items[i]) for i in ranked]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {"documents": len(self.keys), **self.metrics}
+
+
+class KeywordIndex:
+    def __init__(self, items: List[dict], text: Callable[[dict], str]):
+        self.items = items
+        self.postings: Dict[str, Set[int]] = {}
+        for position, item in enumerate(items):
+            for token in set(tokenize(text(item))):
+                self.postings.setdefault(token, set()).add(position)
+
+    def matching(self, keyword: str) -> Set[int]:
+        """Positions of items containing every token of `keyword`."""
+        postings = [self.postings.get(token, set()) for token in set(tokenize(keyword))]
+        if not postings:
+            return set()
+        # Intersect starting from the rarest token
+        postings.sort(key=len)
+        return postings[0].intersection(*postings[1:])
+
+    def top_k(self, keywords: Iterable[str], k: int) -> List[dict]:
+        """The k items matching the most keywords; ties keep catalog order."""
+        scores: Counter = Counter()
+        for keyword in set(keywords):
+            scores.update(self.matching(keyword))
+        best = heapq.nlargest(k, scores.items(), key=lambda entry: (entry[1], -entry[0]))
+        return [self.items[position] for position, _ in best]
+
+
+def recommendation_club_text(club: dict) -> str:
+    return f"{club.get('name') or ''} {club.get('description') or ''}"
+
+
+def recommendation_event_text(event: dict) -> str:
+    return " ".join([event.get("title") or "", event.get("description") or ""] + [str(tag) for tag in event.get("tags") or []])
+
+
+def build_keyword_indexes(snapshot) -> Dict[str, KeywordIndex]:
+    """Inverted indexes over a chat context snapshot's clubs and events."""
+    return {
+        "club": KeywordIndex(snapshot.clubs, recommendation_club_text),
+        "event": KeywordIndex(snapshot.events, recommendation_event_text),
+    }
+
+
+def take_within_budget(items: Iterable[Any], max_tokens: int, render: Callable[[Any], str] = json.dumps) -> List[Any]:
+    """Leading items whose rendered size fits in `max_tokens`."""
+    selected = []
+    used = 0
+    for item in items:
+        cost = len(render(item)) // CHARS_PER_TOKEN + 1
+        if used + cost > max_tokens:
+            break
+        selected.append(item)
+        used += cost
+    return selected
+
+
+def build_search_indexes(snapshot) -> Dict[str, TextIndex]:
+    """Sync the shared club/event indexes with a chat context snapshot."""
+    club_index.sync((club.get("name") or "", club_text(club), club) for club in snapshot.clubs)
+    event_index.sync((event.get("title") or "", event_text(event), event) for event in snapshot.events)
+    return {"club": club_index, "event": event_index}
+
+
+# Global club/event indexes (one per worker process, carried across snapshots)
+club_index = TextIndex()
+event_index = TextIndex()
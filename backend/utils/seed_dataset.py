@@ -0,0 +1,337 @@
+# backend/utils/seed_dataset.py
+"""
+Synthetic dataset generator for load tests and benchmarks.
+
+Bulk-inserts reproducible users, student profiles, clubs (with members and
+join requests), events, registrations and performance records into the
+database configured by MONGODB_URI / DB_NAME:
+
+    python -m utils.seed_dataset --drop
+    python -m utils.seed_dataset --scale 0.01 --workers 4 --drop
+    python -m utils.seed_dataset --only performance_records --records 1000000
+
+Ids are derived from row indexes, so references between collections need no
+lookups and the same --seed always produces the same data. Every seeded user
+logs in with SEED_PASSWORD. Use a scratch database; --drop clears the target
+collections first.
+"""
+import argparse
+import os
+import random
+import time
+import zlib
+from datetime import datetime, timedelta
+from multiprocessing import Pool
+from typing import Any, Dict, Iterator, List, Tuple
+
+from bson import ObjectId
+from passlib.context import CryptContext
+from pymongo import MongoClient
+
+from models.performance_model import PerformanceThreshold
+from utils.mock_performance_data import (
+    CLUB_ACTIVITIES, ENGAGEMENT_METRICS, EXAM_TYPES, STUDENT_NAMES, SUBJECTS
+)
+from utils.performance_utils import calculate_performance_level
+from utils.text_keys import fold_text
+
+SEED_PASSWORD = "password123"
+
+DEFAULT_COUNTS = {
+    "users": 100_000,
+    "clubs": 2_000,
+    "events": 20_000,
+    "registrations": 1_000_000,
+    "performance_records": 5_000_000,
+}
+
+# Insert order matters only for readability; ids never need lookups
+COLLECTIONS = ["users", "clubs", "events", "registrations", "performance_records"]
+
+# One byte per id space so ObjectIds never collide across collections
+ID_TAGS = {"users": 1, "student_profiles": 2, "clubs": 3, "club_users": 4, "events": 5, "registrations": 6,
+           "performance_records": 7}
+ID_EPOCH = int(datetime(2024, 1, 1).timestamp())
+BASE_DATE = datetime(2024, 1, 1)
+
+DEPARTMENTS = ["CSE", "ECE", "EEE", "MECH", "CIVIL", "ISE", "AIML", "BIOTECH"]
+YEARS = ["1", "2", "3", "4"]
+SKILLS = ["Python", "Java", "React", "Public Speaking", "Design", "Robotics", "Photography", "Writing", "ML", "Music"]
+CLUB_TYPES = ["Technical", "Cultural", "Sports", "Literary", "Social", "General"]
+VENUES = ["Auditorium Hall", "Seminar Hall 1", "Seminar Hall 2", "Open Air Theatre", "Lab Complex", "Library Hall"]
+EVENT_TAGS = ["workshop", "hackathon", "talk", "competition", "cultural", "sports", "seminar", "networking"]
+RECORD_CATEGORIES = {
+    "academic": [("subject", SUBJECTS), ("exam", EXAM_TYPES), ("activity", SUBJECTS)],
+    "non_academic": [("club_participation", CLUB_ACTIVITIES), ("attendance", ["Class Attendance"]),
+                     ("engagement", ENGAGEMENT_METRICS)],
+}
+
+# Per-process Mongo handle, created by the pool initializer
+_db = None
+
+
+def seeded_id(kind: str, index: int) -> ObjectId:
+    """Deterministic ObjectId for row `index` of an id space."""
+    return ObjectId(f"{ID_EPOCH:08x}{ID_TAGS[kind]:02x}{index:014x}")
+
+
+def _rng(seed: int, kind: str, start: int) -> random.Random:
+    return random.Random(f"{seed}:{kind}:{start}")
+
+
+def _student_ability(index: int) -> int:
+    """Stable per-student baseline score, so records of one student look consistent."""
+    return 50 + zlib.crc32(index.to_bytes(8, "little")) % 45
+
+
+def _email(kind: str, index: int) -> str:
+    return f"{kind}{index}@seed.campusbuzz.edu"
+
+
+def generate_users(start: int, end: int, counts: Dict[str, int], seed: int, password_hash: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Student accounts plus one student profile each."""
+    rng = _rng(seed, "users", start)
+    for i in range(start, end):
+        name = f"{STUDENT_NAMES[i % len(STUDENT_NAMES)]} {i}"
+        created_at = BASE_DATE + timedelta(minutes=rng.randrange(365 * 24 * 60))
+        user_id = seeded_id("users", i)
+        yield "users", {
+            "_id": user_id,
+            "name": name,
+            "email": _email("student", i),
+            "password_hash": password_hash,
+            "role": "student",
+            "created_at": created_at,
+        }
+        yield "student_profiles", {
+            "_id": seeded_id("student_profiles", i),
+            "user_id": user_id,
+            "name": name,
+            "email": _email("student", i),
+            "mobile": f"9{i:09d}",
+            "USN_id": f"1SD{i:07d}",
+            "department": DEPARTMENTS[i % len(DEPARTMENTS)],
+            "year": rng.choice(YEARS),
+            "skills": rng.sample(SKILLS, rng.randint(1, 4)),
+            "interests": rng.sample(EVENT_TAGS, rng.randint(1, 3)),
+            "achievements": [],
+            "description": None,
+        }
+
+
+def generate_clubs(start: int, end: int, counts: Dict[str, int], seed: int, password_hash: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Approved clubs, their club login accounts, members and pending join requests."""
+    rng = _rng(seed, "clubs", start)
+    users = counts["users"]
+    for i in range(start, end):
+        club_user_id = seeded_id("club_users", i)
+        # Heavy-tailed club sizes: most clubs are small, a few are very large
+        size = min(users, int(rng.paretovariate(1.5) * 10))
+        members = [seeded_id("users", u) for u in rng.sample(range(users), size)] if users else []
+        requests = [seeded_id("users", rng.randrange(users)) for _ in range(rng.randint(0, 8))] if users else []
+        leader = members[0] if members else None
+        created_at = BASE_DATE + timedelta(days=rng.randrange(365))
+        yield "users", {
+            "_id": club_user_id,
+            "name": f"Club {i}",
+            "email": _email("club", i),
+            "password_hash": password_hash,
+            "role": "club",
+            "created_at": created_at,
+        }
+        yield "clubs", {
+            "_id": seeded_id("clubs", i),
+            "name": f"Club {i}",
+            "name_key": fold_text(f"Club {i}"),
+            "email": _email("club", i),
+            "description": f"Seeded {CLUB_TYPES[i % len(CLUB_TYPES)].lower()} club number {i}",
+            "purpose": "Synthetic club for load testing",
+            "type": CLUB_TYPES[i % len(CLUB_TYPES)],
+            "leader": {"user_id": leader} if leader else {},
+            "created_at": created_at,
+            "approved": rng.random() > 0.05,
+            "members": members,
+            "created_by": club_user_id,
+            "requests": [r for r in requests if r not in members],
+        }
+
+
+def generate_events(start: int, end: int, counts: Dict[str, int], seed: int, password_hash: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    rng = _rng(seed, "events", start)
+    clubs = counts["clubs"]
+    for i in range(start, end):
+        club_index = rng.randrange(clubs) if clubs else None
+        date = BASE_DATE + timedelta(days=rng.randrange(730), hours=rng.choice([9, 10, 14, 16, 18]))
+        title = f"{rng.choice(EVENT_TAGS).title()} #{i}"
+        yield "events", {
+            "_id": seeded_id("events", i),
+            "title": title,
+            "title_key": fold_text(title),
+            "description": f"Seeded event {i}",
+            "date": date,
+            "venue": rng.choice(VENUES),
+            "tags": rng.sample(EVENT_TAGS, rng.randint(1, 3)),
+            "poster": None,
+            "isPaid": rng.random() < 0.2,
+            "clubId": seeded_id("clubs", club_index) if club_index is not None else None,
+            "clubName": f"Club {club_index}" if club_index is not None else None,
+            "created_by": seeded_id("club_users", club_index) if club_index is not None else None,
+            "created_at": date - timedelta(days=rng.randint(7, 60)),
+        }
+
+
+def registration_pair(index: int, events: int, users: int) -> Tuple[int, int]:
+    """(event, user) for registration `index`; distinct per event while index < events * users."""
+    event = index % events
+    attendee = index // events
+    # 104729 is prime and coprime to typical user counts, so attendees of one event never repeat
+    return event, (event * 7919 + attendee * 104729) % users
+
+
+def generate_registrations(start: int, end: int, counts: Dict[str, int], seed: int, password_hash: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    rng = _rng(seed, "registrations", start)
+    events, users = counts["events"], counts["users"]
+    for i in range(start, end):
+        event, user = registration_pair(i, events, users)
+        registered_at = BASE_DATE + timedelta(minutes=rng.randrange(730 * 24 * 60))
+        checked_in = rng.random() < 0.6
+        yield "registrations", {
+            "_id": seeded_id("registrations", i),
+            "event_id": seeded_id("events", event),
+            "user_id": seeded_id("users", user),
+            # Real registrations carry a QR PNG; a short token keeps seeded sizes sane
+            "qr_code_data": f"seed:{event}:{user}",
+            "checked_in": checked_in,
+            "registered_at": registered_at,
+            "checked_in_at": registered_at + timedelta(days=rng.randint(0, 14)) if checked_in else None,
+        }
+
+
+def generate_performance_records(start: int, end: int, counts: Dict[str, int], seed: int, password_hash: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    rng = _rng(seed, "performance_records", start)
+    users = counts["users"]
+    thresholds = PerformanceThreshold()
+    span_minutes = 730 * 24 * 60
+    for i in range(start, end):
+        student = i % users
+        record_type = "academic" if rng.random() < 0.67 else "non_academic"
+        category, pool = rng.choice(RECORD_CATEGORIES[record_type])
+        offset = rng.randrange(span_minutes)
+        # Small per-student drift over time so trends are not flat
+        drift = ((student % 7) - 3) * offset / span_minutes * 4
+        score = round(max(0.0, min(100.0, _student_ability(student) + drift + rng.gauss(0, 8))), 1)
+        created_at = BASE_DATE + timedelta(minutes=offset)
+        yield "performance_records", {
+            "_id": seeded_id("performance_records", i),
+            "student_id": str(seeded_id("users", student)),
+            "type": record_type,
+            "category": category,
+            "subcategory": rng.choice(pool),
+            "score": score,
+            "max_score": 100.0,
+            "semester": "Fall" if created_at.month >= 7 else "Spring",
+            "year": str(created_at.year),
+            "description": None,
+            "calculated_level": calculate_performance_level(score, thresholds).value,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+
+GENERATORS = {
+    "users": generate_users,
+    "clubs": generate_clubs,
+    "events": generate_events,
+    "registrations": generate_registrations,
+    "performance_records": generate_performance_records,
+}
+
+
+def _init_worker(uri: str, db_name: str):
+    global _db
+    _db = MongoClient(uri)[db_name]
+
+
+def _seed_chunk(task: Tuple[str, int, int, Dict[str, int], int, str, int]) -> Dict[str, int]:
+    """Generate rows [start, end) of one collection and insert them in batches."""
+    kind, start, end, counts, seed, password_hash, batch_size = task
+    batches: Dict[str, List[Dict[str, Any]]] = {}
+    inserted: Dict[str, int] = {}
+    for collection, doc in GENERATORS[kind](start, end, counts, seed, password_hash):
+        batch = batches.setdefault(collection, [])
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            _db[collection].insert_many(batch, ordered=False)
+            inserted[collection] = inserted.get(collection, 0) + len(batch)
+            batch.clear()
+    for collection, batch in batches.items():
+        if batch:
+            _db[collection].insert_many(batch, ordered=False)
+            inserted[collection] = inserted.get(collection, 0) + len(batch)
+    return inserted
+
+
+def plan_chunks(total: int, chunk_size: int) -> List[Tuple[int, int]]:
+    return [(start, min(start + chunk_size, total)) for start in range(0, total, chunk_size)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uri", default=os.getenv("MONGODB_URI", "mongodb://localhost:27017"))
+    parser.add_argument("--db", default=os.getenv("DB_NAME"), help="target database (defaults to DB_NAME)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every default count")
+    for kind, count in DEFAULT_COUNTS.items():
+        flag = "--records" if kind == "performance_records" else f"--{kind}"
+        parser.add_argument(flag, dest=kind, type=int, help=f"row count (default {count:,} x scale)")
+    parser.add_argument("--only", help="comma-separated subset of: " + ", ".join(COLLECTIONS))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="rows per worker task")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--drop", action="store_true", help="drop target collections before seeding")
+    args = parser.parse_args()
+
+    if not args.db:
+        parser.error("set DB_NAME or pass --db")
+    counts = {
+        kind: getattr(args, kind) if getattr(args, kind) is not None else max(1, int(count * args.scale))
+        for kind, count in DEFAULT_COUNTS.items()
+    }
+    kinds = args.only.split(",") if args.only else COLLECTIONS
+    unknown = set(kinds) - set(COLLECTIONS)
+    if unknown:
+        parser.error(f"unknown collections: {', '.join(sorted(unknown))}")
+
+    if args.drop:
+        db = MongoClient(args.uri)[args.db]
+        targets = {c for kind in kinds for c in ([kind, "student_profiles"] if kind == "users" else [kind])}
+        for collection in sorted(targets):
+            db[collection].drop()
+        if "clubs" in kinds:
+            db["users"].delete_many({"role": "club", "email": {"$regex": r"@seed\.campusbuzz\.edu$"}})
+
+    # bcrypt is deliberately slow, so every seeded account shares one hash
+    password_hash = CryptContext(schemes=["bcrypt"], deprecated="auto").hash(SEED_PASSWORD)
+
+    print(f"Seeding {args.db} with {args.workers} workers: " + ", ".join(f"{k}={counts[k]:,}" for k in kinds))
+    with Pool(args.workers, initializer=_init_worker, initargs=(args.uri, args.db)) as pool:
+        for kind in kinds:
+            tasks = [
+                (kind, start, end, counts, args.seed, password_hash, args.batch_size)
+                for start, end in plan_chunks(counts[kind], args.chunk_size)
+            ]
+            started = time.perf_counter()
+            totals: Dict[str, int] = {}
+            for inserted in pool.imap_unordered(_seed_chunk, tasks):
+                for collection, n in inserted.items():
+                    totals[collection] = totals.get(collection, 0) + n
+            elapsed = time.perf_counter() - started
+            rows = sum(totals.values())
+            detail = ", ".join(f"{c}={n:,}" for c, n in sorted(totals.items()))
+            print(f"  {kind}: {detail} in {elapsed:.1f}s ({rows / elapsed:,.0f} docs/s)")
+
+    print("Done. Run `python -m utils.performance_rollups --backfill` to build rollups for the seeded records.")
+
+
+if __name__ == "__main__":
+    main()
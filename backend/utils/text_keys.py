@@ -0,0 +1,22 @@
+# backend/utils/text_keys.py
+"""
+Text folding shared by name lookups and entity matching.
+Folded text is accent-stripped, case-folded and whitespace-collapsed, so
+"Café  Coders" and "cafe coders" compare equal.
+"""
+import re
+import unicodedata
+from typing import List, Optional
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def fold_text(text: Optional[str]) -> str:
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.casefold().split())
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Folded word tokens."""
+    return TOKEN_RE.findall(fold_text(text))
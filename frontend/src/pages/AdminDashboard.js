@@ -71,8 +71,17 @@ export default function AdminDashboard() {
   // ------------------- PERFORMANCE ANALYTICS -------------------
   async function loadPerformanceAnalytics() {
     try {
-      const res = await API.get("/performance/analytics");
-      setPerformanceAnalytics(res.data);
+      // The API pages results; follow X-Next-Cursor until the last page
+      let all = [];
+      let cursor = null;
+      do {
+        const res = await API.get("/performance/analytics", {
+          params: cursor ? { limit: 500, cursor } : { limit: 500 },
+        });
+        all = all.concat(res.data);
+        cursor = res.headers["x-next-cursor"];
+      } while (cursor);
+      setPerformanceAnalytics(all);
     } catch (error) {
       console.error("Error loading performance analytics:", error);
     }